@@ -4,3 +4,5 @@ PII_MAPPER = PIIMapper()
 DEFAULT_LANG = "en"
 DEFAULT_ANALYSIS_MODE = "POPULATION"
 DEFAULT_TOKEN_REPLACEMENT_VALUE = "<REDACTED>"
+DEFAULT_BATCH_SIZE = 128
+DEFAULT_SPACY_MODEL = "en_core_web_lg"
@@ -1,19 +1,29 @@
-# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-instance-attributes,too-many-arguments,too-many-positional-arguments
 from __future__ import annotations
 
+import statistics
+from array import array
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Counter, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from pii_codex.models.common import RiskLevel, RiskLevelDefinition
+import numpy as np
+
+from pii_codex.models.common import (
+    ResultDetailLevel,
+    RiskLevel,
+    RiskLevelDefinition,
+)
 
 
 # PII detection, risk assessment, and analysis models
 
 
-@dataclass
+@dataclass(frozen=True)
 class RiskAssessment:
     """
-    Singular risk assessment for a string token
+    Singular risk assessment for a string token. Assessments are immutable, as the assessment of a PII type is
+    shared by every detection of that type.
     """
 
     pii_type_detected: Optional[str] = None
@@ -71,8 +81,8 @@ class AnalysisResultItem:
 
     def to_dict(self):
         return {
-            "riskAssessment": self.risk_assessment.__dict__,
-            "detection": self.detection.__dict__,
+            "riskAssessment": self.risk_assessment.__dict__.copy(),
+            "detection": self.detection.__dict__.copy(),
         }
 
     def to_flattened_dict(self):
@@ -88,12 +98,56 @@ class AnalysisResultItem:
 class AnalysisResult:
     """
     The analysis results associated with several detections within a single string (e.g. Social Media Post, SMS, etc.)
+    The sanitized string is either given or rebuilt on access from the source text and the detections (see
+    _get_sanitized_text), so equality, repr, asdict, and dataclasses.replace all use the sanitized string.
     """
 
     analysis: List[AnalysisResultItem]
     index: int = 0
     risk_score_mean: float = 0.0
-    sanitized_text: str = ""
+    # Rebuilt from text on access when not given
+    sanitized_text: Optional[str] = None
+    # Source string the detections were found in
+    text: Optional[str] = field(default=None, repr=False, compare=False)
+    # Function sanitizing the source text given its detections (e.g. sanitizer_util.sanitize_text with a
+    # replacement token), used to rebuild the sanitized string
+    sanitizer: Optional[Callable[[str, List[DetectionResultItem]], str]] = field(
+        default=None, repr=False, compare=False
+    )
+    # When True (default), the rebuilt sanitized string is kept after the first access. When False, it is rebuilt
+    # on every access and never held.
+    cache_sanitized_text: bool = field(default=True, repr=False, compare=False)
+    # Sanitized string behind the sanitized_text field, kept out of the dataclass fields
+    _sanitized_text = None  # type: Optional[str]
+
+    def _get_sanitized_text(self) -> str:
+        if self._sanitized_text is not None:
+            return self._sanitized_text
+
+        if self.text is None or self.sanitizer is None:
+            return ""
+
+        sanitized_text = self.sanitizer(
+            self.text, [pii.detection for pii in self.analysis if pii.detection]
+        )
+        if self.cache_sanitized_text:
+            self._sanitized_text = sanitized_text
+
+        return sanitized_text
+
+    def _set_sanitized_text(self, sanitized_text: Optional[str]):
+        # None (the default) leaves the sanitized string to be rebuilt lazily
+        self._sanitized_text = sanitized_text
+
+    def drop_text(self, keep_sanitized_text: bool = True) -> None:
+        """
+        Drops the reference to the source text
+        @param keep_sanitized_text: bool - when True (default), the sanitized string is built (if it wasn't already)
+        and kept before the source text is dropped. When False, the sanitized string is dropped as well.
+        @return: None
+        """
+        self._sanitized_text = self.sanitized_text if keep_sanitized_text else None
+        self.text = None
 
     def to_dict(self):
         return {
@@ -107,6 +161,251 @@ class AnalysisResult:
         return [pii.detection.entity_type for pii in self.analysis if pii.detection]
 
 
+# Set once the dataclass is built, so the sanitized_text field is read and written through the lazy accessors
+# pylint: disable=protected-access
+AnalysisResult.sanitized_text = property(  # type: ignore
+    AnalysisResult._get_sanitized_text, AnalysisResult._set_sanitized_text
+)
+# pylint: enable=protected-access
+
+
+@dataclass(slots=True)
+class CompactAnalysisResult:
+    """
+    Compact counterpart of AnalysisResult keeping the detected types, offsets, and scores of a single string and
+    its mean risk score, without analysis items, risk assessments, or texts
+    """
+
+    index: int = 0
+    risk_score_mean: float = 0.0
+    detections: Tuple[
+        Tuple[str, int, int, float], ...
+    ] = ()  # (entity_type, start, end, score)
+
+    @classmethod
+    def from_analysis_result(
+        cls, analysis_result: AnalysisResult
+    ) -> CompactAnalysisResult:
+        """
+        Keeps the detected types, offsets, and scores of an analysis result
+        @param analysis_result: AnalysisResult
+        @return: CompactAnalysisResult
+        """
+        return cls(
+            index=analysis_result.index,
+            risk_score_mean=analysis_result.risk_score_mean,
+            detections=tuple(
+                (
+                    pii.detection.entity_type,
+                    pii.detection.start,
+                    pii.detection.end,
+                    pii.detection.score,
+                )
+                for pii in analysis_result.analysis
+                if pii.detection
+            ),
+        )
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "risk_score_mean": self.risk_score_mean,
+            "detections": [list(detection) for detection in self.detections],
+        }
+
+    def get_detected_types(self) -> List[str]:
+        return [detection[0] for detection in self.detections]
+
+
+@dataclass
+class ColumnarAnalysisResults:
+    """
+    Columnar counterpart of a list of AnalysisResults. The detections of every string are held in parallel NumPy
+    arrays (one row per detection) and the strings themselves in per-document arrays, where the detections of
+    the i-th document are rows offsets[i]:offsets[i + 1]. Entity types and their risk assessments are stored
+    once per type and referenced by code. AnalysisResults are only materialized on access, one document at a time.
+    """
+
+    entity_types: List[str]  # Entity type of each code
+    risk_assessments: List[RiskAssessment]  # Risk assessment of each code
+    indices: np.ndarray  # Per document: index of the string within its collection
+    risk_score_means: np.ndarray  # Per document: mean risk score
+    offsets: np.ndarray  # Per document (plus one): first detection row of the document
+    document_indices: np.ndarray  # Per detection: index of the string it was found in
+    entity_type_codes: np.ndarray  # Per detection: code of its entity type
+    scores: np.ndarray  # Per detection
+    starts: np.ndarray  # Per detection
+    ends: np.ndarray  # Per detection
+    risk_levels: np.ndarray  # Per detection
+    texts: Optional[List[Optional[str]]] = field(default=None, repr=False)
+    sanitized_texts: Optional[List[str]] = field(default=None, repr=False)
+    sanitizer: Optional[Callable[[str, List[DetectionResultItem]], str]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_analysis_results(
+        cls, analysis_results: Iterable[AnalysisResult]
+    ) -> ColumnarAnalysisResults:
+        """
+        Converts analysis results to columns as they come in, so the analysis results themselves are never all
+        held at once
+        @param analysis_results: Iterable[AnalysisResult]
+        @return: ColumnarAnalysisResults
+        """
+        entity_type_codes: Dict[str, int] = {}
+        risk_assessments: List[RiskAssessment] = []
+        texts: List[Optional[str]] = []
+        sanitizer = None
+
+        # Typed buffers grown per document, viewed as NumPy arrays (without a copy) once every result is converted
+        columns: Dict[str, array[Any]] = {
+            "indices": array("q"),
+            "risk_score_means": array("d"),
+            "offsets": array("q", [0]),
+            "document_indices": array("q"),
+            "entity_type_codes": array("i"),
+            "scores": array("d"),
+            "starts": array("q"),
+            "ends": array("q"),
+            "risk_levels": array("b"),
+        }
+
+        for analysis_result in analysis_results:
+            for pii in analysis_result.analysis:
+                if not pii.detection:
+                    continue
+
+                entity_type_code = entity_type_codes.setdefault(
+                    pii.detection.entity_type, len(entity_type_codes)
+                )
+                if entity_type_code == len(risk_assessments):
+                    risk_assessments.append(pii.risk_assessment)
+
+                columns["document_indices"].append(analysis_result.index)
+                columns["entity_type_codes"].append(entity_type_code)
+                columns["scores"].append(pii.detection.score)
+                columns["starts"].append(pii.detection.start)
+                columns["ends"].append(pii.detection.end)
+                columns["risk_levels"].append(pii.risk_assessment.risk_level)
+
+            columns["indices"].append(analysis_result.index)
+            columns["risk_score_means"].append(analysis_result.risk_score_mean)
+            columns["offsets"].append(len(columns["scores"]))
+            texts.append(analysis_result.text)
+            sanitizer = sanitizer or analysis_result.sanitizer
+
+        arrays: Dict[str, Any] = {
+            name: np.frombuffer(column, dtype=column.typecode)
+            for name, column in columns.items()
+        }
+
+        return cls(
+            entity_types=list(entity_type_codes),
+            risk_assessments=risk_assessments,
+            texts=texts if any(text is not None for text in texts) else None,
+            sanitizer=sanitizer,
+            **arrays,
+        )
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, position: int) -> AnalysisResult:
+        return self.get_analysis(position)
+
+    def __iter__(self) -> Iterator[AnalysisResult]:
+        for position in range(len(self)):
+            yield self.get_analysis(position)
+
+    def get_analysis(self, position: int) -> AnalysisResult:
+        """
+        Materializes the AnalysisResult of a single document
+        @param position: int - position of the document within the columns (not its index in the collection)
+        @return: AnalysisResult
+        """
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        analysis = [
+            AnalysisResultItem(
+                detection=DetectionResultItem(
+                    entity_type=self.entity_types[entity_type_code],
+                    score=score,
+                    start=detection_start,
+                    end=detection_end,
+                ),
+                risk_assessment=self.risk_assessments[entity_type_code],
+            )
+            for entity_type_code, score, detection_start, detection_end in zip(
+                self.entity_type_codes[start:end].tolist(),
+                self.scores[start:end].tolist(),
+                self.starts[start:end].tolist(),
+                self.ends[start:end].tolist(),
+            )
+        ]
+
+        return AnalysisResult(
+            analysis=analysis
+            or [AnalysisResultItem(detection=None, risk_assessment=RiskAssessment())],
+            index=int(self.indices[position]),
+            risk_score_mean=float(self.risk_score_means[position]),
+            sanitized_text=self.sanitized_texts[position]
+            if self.sanitized_texts is not None
+            else None,
+            text=self.texts[position] if self.texts is not None else None,
+            sanitizer=self.sanitizer,
+            cache_sanitized_text=False,
+        )
+
+    def get_detected_type_frequencies(self) -> Counter:
+        """
+        Detection count of each entity type, in the order the types were first detected
+        @return: Counter
+        """
+        frequencies = np.bincount(
+            self.entity_type_codes, minlength=len(self.entity_types)
+        )
+
+        return Counter(dict(zip(self.entity_types, frequencies.tolist())))
+
+    def get_risk_score_median(self) -> float:
+        """
+        Median of the per-document mean risk scores
+        @return: float
+        """
+        if self.risk_score_means.size == 0:
+            raise statistics.StatisticsError("no median for empty data")
+
+        return float(np.median(self.risk_score_means))
+
+    def get_risk_score_mode(self) -> float:
+        """
+        Most common per-document mean risk score. Ties go to the first risk score seen, as with statistics.mode.
+        @return: float
+        """
+        if self.risk_score_means.size == 0:
+            raise statistics.StatisticsError("no mode for empty data")
+
+        risk_scores, first_positions, counts = np.unique(
+            self.risk_score_means, return_index=True, return_counts=True
+        )
+        most_common = np.flatnonzero(counts == counts.max())
+
+        return float(risk_scores[most_common[np.argmin(first_positions[most_common])]])
+
+    def drop_texts(self, keep_sanitized_text: bool = True) -> None:
+        """
+        Drops the references to the source texts (see AnalysisResult.drop_text)
+        @param keep_sanitized_text: bool - when True (default), sanitized strings are built and kept first
+        @return: None
+        """
+        self.sanitized_texts = (
+            [analysis.sanitized_text or "" for analysis in self]
+            if keep_sanitized_text
+            else None
+        )
+        self.texts = None
+
+
 @dataclass
 class AnalysisResultSet:
     """
@@ -128,12 +427,19 @@ class AnalysisResultSet:
         str
     ] = None  # Optional ability for analysts to name a set (see analysis storage step in notebooks)
     collection_type: str = "POPULATION"  # Other option is SAMPLE
+    compact_analyses: List[CompactAnalysisResult] = field(default_factory=list)
+    detail: str = (
+        ResultDetailLevel.FULL.value
+    )  # Detail kept per string/document, see ResultDetailLevel
+    columns: Optional[ColumnarAnalysisResults] = None
 
     def to_dict(self):
         return {
             "collection_name": self.collection_name,
             "collection_type": self.collection_type,
-            "analyses": [item.to_dict() for item in self.analyses],
+            "analyses": [item.to_dict() for item in self.analyses]
+            or [item.to_dict() for item in self.compact_analyses]
+            or [item.to_dict() for item in self.columns or []],
             "detection_count": self.detection_count,
             "risk_scores": self.risk_scores,
             "risk_score_mean": self.risk_score_mean,
@@ -144,3 +450,15 @@ class AnalysisResultSet:
             "detected_pii_types": self.detected_pii_types,
             "detected_pii_type_frequencies": dict(self.detected_pii_type_frequencies),
         }
+
+    def drop_texts(self, keep_sanitized_text: bool = True) -> None:
+        """
+        Drops the references to the source texts of every analysis (see AnalysisResult.drop_text)
+        @param keep_sanitized_text: bool - when True (default), sanitized strings are built and kept first
+        @return: None
+        """
+        for analysis in self.analyses:
+            analysis.drop_text(keep_sanitized_text=keep_sanitized_text)
+
+        if self.columns is not None:
+            self.columns.drop_texts(keep_sanitized_text=keep_sanitized_text)
@@ -14,6 +14,20 @@ class AnalysisProviderType(Enum):
     AZURE = "AZURE"
     AWS = "AWS"
     PRESIDIO = "PRESIDIO"
+    PATTERN = "PATTERN"  # Regex and checksum detection of structured identifiers, no NLP model
+
+
+class ResultDetailLevel(Enum):
+    """
+    Detail kept by an analysis result set for each analyzed string/document
+    """
+
+    FULL = (
+        "full"  # Every AnalysisResult with its AnalysisResultItems and RiskAssessments
+    )
+    COMPACT = "compact"  # Detected types, offsets, and scores only (see CompactAnalysisResult)
+    AGGREGATES = "aggregates"  # Set-level statistics and frequencies only, no per-document results
+    COLUMNAR = "columnar"  # Detections held in parallel NumPy arrays (see ColumnarAnalysisResults)
 
 
 class RiskLevel(Enum):
@@ -0,0 +1,208 @@
+# pylint: disable=protected-access,too-many-arguments,too-many-positional-arguments
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from ..config import DEFAULT_ANALYSIS_MODE
+from ..models.analysis import (
+    AnalysisResult,
+    AnalysisResultSet,
+    ColumnarAnalysisResults,
+    CompactAnalysisResult,
+)
+from ..models.common import ResultDetailLevel
+from ..utils.statistics_util import (
+    QuantileSketch,
+    RunningStatistics,
+    get_median,
+    validate_collection_type,
+)
+
+
+class PIIAnalysisAggregator:
+    """
+    Incrementally aggregates the set-level statistics of analysis results. Every metric is updated per
+    AnalysisResult without retaining the analyses themselves, and aggregators built over separate shards
+    of a collection can be merged.
+    """
+
+    def __init__(self, max_median_bins: int = 256):
+        """
+        PIIAnalysisAggregator constructor.
+        @param max_median_bins: int - max number of centroids held by the median sketch
+        """
+        self.detection_count = 0
+        self._risk_score_statistics = RunningStatistics()
+        self._risk_score_sketch = QuantileSketch(max_bins=max_median_bins)
+        self._risk_score_counts: Counter = Counter()
+        self._detected_type_frequencies: Counter = Counter()
+
+    @property
+    def analysis_count(self) -> int:
+        return self._risk_score_statistics.count
+
+    def update(self, analysis: AnalysisResult) -> None:
+        """
+        Adds a single analysis result to the aggregate statistics
+        @param analysis: AnalysisResult
+        @return: None
+        """
+        risk_score = analysis.risk_score_mean
+        self._risk_score_statistics.update(risk_score)
+        self._risk_score_sketch.update(risk_score)
+        self._risk_score_counts[risk_score] += 1
+
+        detected_types = analysis.get_detected_types()
+        if detected_types:
+            self.detection_count += len(analysis.analysis)
+            self._detected_type_frequencies.update(detected_types)
+
+    @classmethod
+    def from_columns(
+        cls, columns: ColumnarAnalysisResults, max_median_bins: int = 256
+    ) -> PIIAnalysisAggregator:
+        """
+        Builds the aggregate statistics of columnar analysis results directly from their arrays, without
+        materializing any AnalysisResult. The median sketch and risk score counts are only filled so the
+        aggregator can be merged; result sets built with the columns take their median and mode from the arrays.
+        @param columns: ColumnarAnalysisResults
+        @param max_median_bins: int - max number of centroids held by the median sketch
+        @return: PIIAnalysisAggregator
+        """
+        aggregator = cls(max_median_bins=max_median_bins)
+        aggregator.detection_count = len(columns.entity_type_codes)
+        aggregator._risk_score_statistics = RunningStatistics.from_values(
+            columns.risk_score_means
+        )
+        aggregator._detected_type_frequencies = columns.get_detected_type_frequencies()
+
+        risk_scores, first_positions, counts = np.unique(
+            columns.risk_score_means, return_index=True, return_counts=True
+        )
+        for risk_score, count in zip(risk_scores.tolist(), counts.tolist()):
+            aggregator._risk_score_sketch.update(risk_score, count)
+
+        # Counted in the order risk scores were first seen, so mode ties go to the first one as with update
+        for position in np.argsort(first_positions, kind="stable").tolist():
+            aggregator._risk_score_counts[float(risk_scores[position])] = int(
+                counts[position]
+            )
+
+        return aggregator
+
+    def update_all(self, analyses: Iterable[AnalysisResult]) -> PIIAnalysisAggregator:
+        """
+        Adds every analysis result of an iterable to the aggregate statistics
+        @param analyses: Iterable[AnalysisResult]
+        @return: PIIAnalysisAggregator (self)
+        """
+        for analysis in analyses:
+            self.update(analysis)
+
+        return self
+
+    def merge(self, other: PIIAnalysisAggregator) -> PIIAnalysisAggregator:
+        """
+        Merges the aggregate statistics of another shard into this aggregator
+        @param other: PIIAnalysisAggregator
+        @return: PIIAnalysisAggregator (self)
+        """
+        self.detection_count += other.detection_count
+        self._risk_score_statistics.merge(other._risk_score_statistics)
+        self._risk_score_sketch.merge(other._risk_score_sketch)
+        self._risk_score_counts.update(other._risk_score_counts)
+        self._detected_type_frequencies.update(other._detected_type_frequencies)
+
+        return self
+
+    def to_analysis_result_set(
+        self,
+        collection_name: str = "",
+        collection_type: str = DEFAULT_ANALYSIS_MODE,
+        analyses: Optional[List[AnalysisResult]] = None,
+        compact_analyses: Optional[List[CompactAnalysisResult]] = None,
+        detail: str = ResultDetailLevel.FULL.value,
+        columns: Optional[ColumnarAnalysisResults] = None,
+    ) -> AnalysisResultSet:
+        """
+        Builds an AnalysisResultSet from the aggregate statistics. The analyses (and their risk scores) are
+        only included when supplied, in which case the median is computed exactly from the retained risk scores
+        rather than taken from the sketch. Columnar analyses also take their median and mode directly from
+        their arrays.
+
+        @param collection_name: str - name of collection
+        @param collection_type: str - population(default) or sample
+        @param analyses: List[AnalysisResult] - (Optional) analyses the statistics were aggregated from
+        @param compact_analyses: List[CompactAnalysisResult] - (Optional) compact analyses the statistics were
+        aggregated from, in place of the analyses
+        @param detail: str - detail level of the supplied analyses (see ResultDetailLevel)
+        @param columns: ColumnarAnalysisResults - (Optional) columnar analyses the statistics were aggregated from,
+        in place of the analyses
+        @return: AnalysisResultSet
+        """
+        validate_collection_type(collection_type)
+        risk_scores = (
+            columns.risk_score_means.tolist()
+            if columns is not None
+            else [
+                analysis.risk_score_mean
+                for analysis in analyses or compact_analyses or []
+            ]
+        )
+
+        return AnalysisResultSet(
+            collection_name=collection_name,
+            collection_type=collection_type,
+            analyses=analyses or [],
+            compact_analyses=compact_analyses or [],
+            detail=detail,
+            columns=columns,
+            risk_score_mean=self._risk_score_statistics.get_mean(),
+            risk_scores=risk_scores,
+            risk_score_standard_deviation=self._risk_score_statistics.get_standard_deviation(
+                collection_type
+            ),
+            risk_score_variance=self._risk_score_statistics.get_variance(
+                collection_type
+            ),
+            risk_score_mode=columns.get_risk_score_mode()
+            if columns is not None
+            else self._get_risk_score_mode(),
+            risk_score_median=self._get_risk_score_median(
+                risk_scores, analyses or compact_analyses, columns
+            ),
+            detection_count=self.detection_count,
+            detected_pii_type_frequencies=Counter(self._detected_type_frequencies),
+            detected_pii_types=set(self._detected_type_frequencies),
+        )
+
+    def _get_risk_score_median(
+        self,
+        risk_scores: List[float],
+        analyses: Optional[list] = None,
+        columns: Optional[ColumnarAnalysisResults] = None,
+    ) -> float:
+        """
+        Median risk score, computed exactly when the analyses were retained and taken from the sketch otherwise
+        @param risk_scores: List[float] - risk scores of the retained analyses
+        @param analyses: list - (Optional) retained analyses (full or compact)
+        @param columns: ColumnarAnalysisResults - (Optional) retained columnar analyses
+        @return: float
+        """
+        if columns is not None:
+            return columns.get_risk_score_median()
+
+        if analyses:
+            return get_median(risk_scores)
+
+        return self._risk_score_sketch.get_median()
+
+    def _get_risk_score_mode(self) -> float:
+        """
+        Most common risk score. Ties go to the first risk score seen, as with statistics.mode.
+        @return: float
+        """
+        return self._risk_score_counts.most_common(1)[0][0]
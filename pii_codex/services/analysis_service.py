@@ -1,10 +1,26 @@
-# pylint: disable=too-many-arguments, too-many-positional-arguments
-from typing import List, Optional, Tuple
+# pylint: disable=too-many-arguments, too-many-positional-arguments, too-many-instance-attributes, too-many-lines, too-many-locals
+import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import repeat
+from threading import Lock
+from weakref import WeakKeyDictionary
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Union
 import pandas as pd
 
-from ..config import PII_MAPPER, DEFAULT_ANALYSIS_MODE, DEFAULT_TOKEN_REPLACEMENT_VALUE
+from ..config import (
+    PII_MAPPER,
+    DEFAULT_ANALYSIS_MODE,
+    DEFAULT_TOKEN_REPLACEMENT_VALUE,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_SPACY_MODEL,
+)
 from ..models.common import (
     AnalysisProviderType,
+    ResultDetailLevel,
     RiskLevel,
 )
 from ..models.analysis import (
@@ -12,47 +28,128 @@ from ..models.analysis import (
     AnalysisResultItem,
     AnalysisResult,
     AnalysisResultSet,
+    ColumnarAnalysisResults,
+    CompactAnalysisResult,
     DetectionResult,
     RiskAssessment,
 )
-from ..models.microsoft_presidio_pii import MSFTPresidioPIIType
+from ..services.analyzers.pattern_analysis import PatternPIIAnalyzer
 from ..services.analyzers.presidio_analysis import (
     PresidioPIIAnalyzer,
 )
+from ..services.analysis_aggregator import PIIAnalysisAggregator
+from ..services.analysis_workers import (
+    CollectionRecord,
+    analyze_shard,
+    frozen_for_fork,
+    get_shard_size,
+    init_analysis_worker,
+    init_forked_analysis_worker,
+    shard_records,
+)
 from ..services.assessment_service import PIIAssessmentService
-from ..utils.statistics_util import (
-    get_mean,
-    get_standard_deviation,
-    get_variance,
-    get_mode,
-    get_median,
+from ..utils.cache_util import BaseDetectionCache
+from ..utils.entity_profile_util import (
+    ALL_PRESIDIO_ENTITIES,
+    EntityProfile,
+    get_entity_profile,
 )
+from ..utils.prefilter_util import TextPrefilter
+from ..utils.sanitizer_util import sanitize_text
+from ..utils.statistics_util import get_mean
 
 
 class PIIAnalysisService:
     """
-    Class for PII analysis of singular text strings or collections thereof.
+    Class for PII analysis of singular text strings or collections thereof. Analyses keep no per-call state
+    on the service, so a single service can be shared across threads (e.g. by a web tier).
     """
 
     def __init__(
         self,
         pii_token_replacement_value: str = DEFAULT_TOKEN_REPLACEMENT_VALUE,
         analysis_provider: str = AnalysisProviderType.PRESIDIO.name,
+        detection_cache: Optional[BaseDetectionCache] = None,
+        max_async_concurrency: int = 4,
+        prefilter: Optional[TextPrefilter] = None,
+        combined_patterns: bool = False,
+        entity_profile: Optional[Union[str, EntityProfile]] = None,
+        model_name: str = DEFAULT_SPACY_MODEL,
+        install_missing_model: bool = True,
+        shared_vectors: bool = False,
+        fork_workers: bool = False,
+        snapshot_path: Optional[str] = None,
+        detect_only: bool = False,
+        cache_sanitized_text: bool = True,
     ):
         """
         PIIAnalysisService constructor.
         @param pii_token_replacement_value: PII Token replacement string (default is <REDACTED>)
-        @param analysis_provider: Default provider is PRESIDIO, pass in another analysis provider
-        when using the adapters.
+        @param analysis_provider: Default provider is PRESIDIO, pass in PATTERN for the lightweight analyzer
+        of structured identifiers (no spaCy model), or another analysis provider when using the adapters.
+        @param detection_cache: DetectionCache or SQLiteDetectionCache - (Optional) cache to reuse the detections
+        of repeated texts. Worker processes each hold their own in-process cache or SQLite connection.
+        @param max_async_concurrency: int - max number of analyses the async methods run at once (default is 4)
+        @param prefilter: TextPrefilter - (Optional) lexical triage skipping the Presidio analysis of texts without
+        any sign of PII (digits, '@', URL markers, or capitalized tokens)
+        @param combined_patterns: bool - when True, Presidio pattern recognizers are replaced by a single combined
+        pattern scan per text gating which recognizers run. Detections are unchanged.
+        @param entity_profile: str or EntityProfile - (Optional) entity profile (e.g. "us-core", "eu-gdpr",
+        "contact-only") restricting detection to its entities. Only the Presidio recognizers of those entities are
+        loaded. Defaults to every MSFTPresidioPIIType entity.
+        @param model_name: str - spaCy model package (e.g. en_core_web_sm, en_core_web_trf) or path to a model
+        directory loaded by the Presidio analyzer. Default is en_core_web_lg.
+        @param install_missing_model: bool - when False, a missing model package raises an exception instead of
+        being downloaded and installed (e.g. on air-gapped workers)
+        @param shared_vectors: bool - when True, the spaCy model's word vectors are memory-mapped read-only from the
+        model's files, so this process and every worker process share one copy instead of each holding its own
+        @param fork_workers: bool - when True, worker processes are forked from this process and reuse its warmed
+        analyzer (sharing memory pages copy-on-write) instead of each loading their own. Requires the "fork"
+        start method (Linux, macOS).
+        @param snapshot_path: str - (Optional) directory of a Presidio engine snapshot (see
+        PresidioPIIAnalyzer.save_snapshot) restored instead of building the engine. The snapshot's model and
+        recognizers take the place of model_name, entity_profile recognizers, and combined_patterns.
+        @param detect_only: bool - when True, texts are only analyzed for detections and risk scores. Sanitization
+        is skipped and sanitized_text is left empty. See sanitize_item/sanitize_collection for the reverse.
+        @param cache_sanitized_text: bool - analysis results build their sanitized text from the source text on first
+        access. When True (default), it is kept afterwards. When False, it is rebuilt on every access, so results
+        only hold a reference to the source text.
         """
+        if not isinstance(max_async_concurrency, int) or max_async_concurrency < 1:
+            raise Exception("'max_async_concurrency' param must be a positive integer.")
+
+        if fork_workers and "fork" not in multiprocessing.get_all_start_methods():
+            raise Exception(
+                "'fork_workers' param requires the 'fork' start method, which this platform doesn't support."
+            )
+
         self._analysis_provider = analysis_provider
-        self._language_code = "en"
-        self._pii_assessment_service = PIIAssessmentService()
-        self._analyzer = (
-            PresidioPIIAnalyzer(pii_token_replacement_value=pii_token_replacement_value)
-            if analysis_provider == AnalysisProviderType.PRESIDIO.name
-            else None
+        self._pii_token_replacement_value = pii_token_replacement_value
+        self._detection_cache = detection_cache
+        self._prefilter = prefilter
+        self._combined_patterns = combined_patterns
+        self._model_name = model_name
+        self._install_missing_model = install_missing_model
+        self._shared_vectors = shared_vectors
+        self._fork_workers = fork_workers
+        self._snapshot_path = snapshot_path
+        self._detect_only = detect_only
+        self._cache_sanitized_text = cache_sanitized_text
+        self._entity_profile = (
+            get_entity_profile(entity_profile) if entity_profile is not None else None
         )
+        self._entities = list(
+            self._entity_profile.entities
+            if self._entity_profile is not None
+            else ALL_PRESIDIO_ENTITIES
+        )
+        self._pii_assessment_service = PIIAssessmentService()
+        self._analyzer = self._get_analyzer()
+        self._max_async_concurrency = max_async_concurrency
+        self._async_executor: Optional[ThreadPoolExecutor] = None
+        self._async_executor_lock = Lock()
+        # Semaphores are bound to the event loop they are awaited on, so every loop gets its own
+        self._async_semaphores: WeakKeyDictionary = WeakKeyDictionary()
 
     def analyze_item(
         self,
@@ -72,9 +169,7 @@ class PIIAnalysisService:
         @return: AnalysisResult
         """
 
-        analysis, sanitized_text = self._perform_text_analysis(
-            text=text, language_code=language_code
-        )
+        analysis = self._perform_text_analysis(text=text, language_code=language_code)
 
         if metadata is not None:
             # Retrieve analyses for metadata entries
@@ -83,12 +178,148 @@ class PIIAnalysisService:
         return AnalysisResult(
             index=0,
             analysis=analysis,
-            sanitized_text=sanitized_text,
             risk_score_mean=get_mean(
                 [item.risk_assessment.risk_level for item in analysis]
             ),
+            **self._get_sanitization_args(text),
+        )
+
+    async def analyze_item_async(
+        self,
+        text: str,
+        metadata: dict = None,
+        language_code: str = "en",
+    ) -> AnalysisResult:
+        """
+        Async counterpart of analyze_item. The analysis runs on the service's managed thread pool so the event
+        loop stays free, and waits for a slot when max_async_concurrency analyses are already in flight.
+
+        @param text: input text to analyze
+        @param metadata: dict - {
+                                    "location": True
+                                }
+        @param language_code: "en" is default value
+        @return: AnalysisResult
+        """
+        return await self._run_async(
+            partial(
+                self.analyze_item,
+                text=text,
+                metadata=metadata,
+                language_code=language_code,
+            )
         )
 
+    async def analyze_collection_async(
+        self,
+        texts: Optional[List[str]] = None,
+        data: Optional[pd.DataFrame] = None,
+        language_code: str = "en",
+        collection_name: str = "",
+        collection_type: str = "population",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        entity_profile: Optional[Union[str, EntityProfile]] = None,
+        drop_texts: bool = False,
+        detail: str = ResultDetailLevel.FULL.value,
+    ) -> AnalysisResultSet:
+        """
+        Async counterpart of analyze_collection. The collection's batches run on the service's managed thread
+        pool, at most max_async_concurrency at a time, and the results keep the original index order.
+
+        @param texts: List[str] - input texts to analyze
+        @param data: dataframe - dataframe of text and metadata where text is a string and metadata is a dict
+        @param language_code: str - "en" is default value
+        @param collection_name: str - name of population or collection
+        @param collection_type: str - population or sample
+        @param batch_size: int - number of texts analyzed per batch
+        @param entity_profile: str or EntityProfile - (Optional) entity profile restricting the detections of this
+        call, within the entities of the service's own profile. Defaults to the service's entities.
+        @param drop_texts: bool - when True, analyses drop their reference to the source text once the collection is
+        aggregated, keeping the sanitized text only (see AnalysisResultSet.drop_texts)
+        @param detail: str - detail kept per text: "full" (default), "compact", "aggregates", or "columnar" (see
+        analyze_collection and ResultDetailLevel)
+        @return: AnalysisResultSet
+        """
+        self._validate_data(texts, data)
+        self._validate_detail(detail)
+
+        entities = (
+            list(get_entity_profile(entity_profile).entities)
+            if entity_profile is not None
+            else None
+        )
+
+        batch_analyses = await asyncio.gather(
+            *[
+                self._run_async(
+                    partial(
+                        self._analyze_collection_records,
+                        records=record_batch,
+                        language_code=language_code,
+                        batch_size=batch_size,
+                        entities=entities,
+                    )
+                )
+                for record_batch in shard_records(
+                    self._get_collection_records(texts, data), batch_size
+                )
+            ]
+        )
+
+        analysis_result_set = self._build_analysis_result_set(
+            collection_name=collection_name,
+            collection_type=collection_type,
+            analysis_set=(
+                analysis for analyses in batch_analyses for analysis in analyses
+            ),
+            detail=detail,
+        )
+        if drop_texts:
+            analysis_result_set.drop_texts()
+
+        return analysis_result_set
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shuts down the managed thread pool of the async methods. It is recreated if they are used again.
+        @param wait: bool - whether to wait for in-flight analyses to finish
+        @return: None
+        """
+        with self._async_executor_lock:
+            if self._async_executor is not None:
+                self._async_executor.shutdown(wait=wait)
+                self._async_executor = None
+
+    async def _run_async(self, func):
+        """
+        Runs a blocking analysis on the managed thread pool once an in-flight slot is free
+        @param func: callable without arguments
+        @return: result of func
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores[loop] = asyncio.Semaphore(
+                self._max_async_concurrency
+            )
+
+        async with semaphore:
+            return await loop.run_in_executor(self._get_async_executor(), func)
+
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        """
+        Lazily creates the managed thread pool of the async methods
+        @return: ThreadPoolExecutor
+        """
+        with self._async_executor_lock:
+            if self._async_executor is None:
+                self._async_executor = ThreadPoolExecutor(
+                    max_workers=self._max_async_concurrency,
+                    thread_name_prefix="pii-codex-analysis",
+                )
+
+            return self._async_executor
+
     def analyze_collection(
         self,
         texts: Optional[List[str]] = None,
@@ -96,6 +327,13 @@ class PIIAnalysisService:
         language_code: str = "en",
         collection_name: str = "",
         collection_type: str = "population",
+        workers: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        executor: Optional[Executor] = None,
+        entity_profile: Optional[Union[str, EntityProfile]] = None,
+        drop_texts: bool = False,
+        detail: str = ResultDetailLevel.FULL.value,
     ) -> AnalysisResultSet:
         """
         Runs an analysis given an analysis provider, text, and language code. This method defaults
@@ -106,79 +344,392 @@ class PIIAnalysisService:
         @param language_code: str - "en" is default value
         @param collection_name: str - name of population or collection
         @param collection_type: str - population or sample
+        @param workers: int - number of worker processes to shard the collection across (default is 1, serial)
+        @param batch_size: int - number of texts spaCy processes per batch
+        @param n_process: int - number of processes spaCy uses for batching when not sharding across workers
+        @param executor: Executor - (Optional) thread pool (e.g. ThreadPoolExecutor) the collection's batches are
+        analyzed on with this service. Cannot be combined with workers.
+        @param entity_profile: str or EntityProfile - (Optional) entity profile restricting the detections of this
+        call, within the entities of the service's own profile. Defaults to the service's entities.
+        @param drop_texts: bool - when True, analyses drop their reference to the source text once the collection is
+        aggregated, keeping the sanitized text only (see AnalysisResultSet.drop_texts)
+        @param detail: str - detail kept per text (see ResultDetailLevel): "full" (default) keeps every
+        AnalysisResult, "compact" keeps the detected types, offsets, and scores only (compact_analyses), and
+        "aggregates" keeps the set-level statistics and frequencies only, and "columnar" keeps the detections in
+        parallel NumPy arrays (columns, see ColumnarAnalysisResults)
         @return: AnalysisResultList
         """
 
         # Will raise exceptions or invalid input
         self._validate_data(texts, data)
-        self._language_code = language_code
+        self._validate_workers(workers, n_process)
+        self._validate_executor(executor, workers)
+        self._validate_detail(detail)
 
-        analysis_set: List[AnalysisResult] = []
-
-        if data is not None:
-            data = data.reset_index()
-
-            analysis_set = [
-                self._analyze_data_collection_row(idx, collection_entry)
-                for idx, collection_entry in data.iterrows()
-            ]
+        records = self._get_collection_records(texts, data)
+        entities = (
+            list(get_entity_profile(entity_profile).entities)
+            if entity_profile is not None
+            else None
+        )
 
-        if texts:
-            analysis_set = [
-                self._analyze_text_collection_item(idx, collection_entry)
-                for idx, collection_entry in enumerate(texts)
-            ]
+        analysis_set: Iterable[AnalysisResult]
+        if executor is not None:
+            analysis_set = self._analyze_collection_in_executor(
+                records=records,
+                executor=executor,
+                language_code=language_code,
+                batch_size=batch_size,
+                n_process=n_process,
+                entities=entities,
+            )
+        elif workers > 1:
+            analysis_set = self._analyze_collection_in_pool(
+                records=records,
+                record_count=len(data) if data is not None else len(texts or []),
+                language_code=language_code,
+                workers=workers,
+                batch_size=batch_size,
+                entities=entities,
+            )
+        else:
+            analysis_set = self._iter_collection_record_analyses(
+                records=records,
+                language_code=language_code,
+                batch_size=batch_size,
+                n_process=n_process,
+                entities=entities,
+            )
 
-        return self._build_analysis_result_set(
+        analysis_result_set = self._build_analysis_result_set(
             collection_name=collection_name,
             collection_type=collection_type,
             analysis_set=analysis_set,
+            detail=detail,
         )
+        if drop_texts:
+            analysis_result_set.drop_texts()
 
-    def _analyze_data_collection_row(self, idx, collection_row):
+        return analysis_result_set
+
+    def iter_analyze(
+        self,
+        iterable: Iterable[Any],
+        language_code: str = "en",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int = 1,
+    ) -> Iterator[AnalysisResult]:
         """
-        Parallelized task to process dataframe
-        @param idx:
-        @param collection_row:
-        @return:
+        Lazily analyzes texts pulled from any iterable (file lines, generators, queues, etc.) and yields an
+        AnalysisResult per text, in order, as soon as its batch finishes. Only a bounded number of batches
+        is held in memory at a time, so the source can be arbitrarily large. No AnalysisResultSet is built.
+
+        @param iterable: Iterable of str texts or dicts with a "text" entry and an optional "metadata" entry
+        @param language_code: str - "en" is default value
+        @param batch_size: int - number of texts pulled from the iterable and analyzed per batch
+        @param workers: int - number of worker processes to shard the batches across (default is 1, serial)
+        @return: Iterator[AnalysisResult]
         """
-        analysis, sanitized_text = self._perform_text_analysis(
-            language_code=self._language_code,
-            text=collection_row["text"],
+        self._validate_workers(workers)
+        self._validate_text_analysis_provider()
+
+        if workers > 1:
+            yield from self._iter_analysis_in_pool(
+                record_batches=shard_records(
+                    self._iter_collection_records(iterable), batch_size
+                ),
+                language_code=language_code,
+                workers=workers,
+                batch_size=batch_size,
+            )
+            return
+
+        yield from self._iter_collection_record_analyses(
+            records=self._iter_collection_records(iterable),
+            language_code=language_code,
+            batch_size=batch_size,
         )
 
-        if collection_row["metadata"] is not None:
-            # Perform analyses for metadata entries
-            analysis.extend(self.analyze_metadata(metadata=collection_row["metadata"]))
+    def _analyze_collection_in_pool(
+        self,
+        records: Iterable[CollectionRecord],
+        record_count: int,
+        language_code: str,
+        workers: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        entities: Optional[List[str]] = None,
+    ) -> Iterator[AnalysisResult]:
+        """
+        Shards collection records across a process pool. Every worker warms its own analyzer once
+        and the results are yielded in the original index order.
+
+        @param records: Iterable[Tuple[int, str, Optional[dict]]] - records of index, text, and metadata
+        @param record_count: int - number of records in the collection
+        @param language_code: str - "en" is default value
+        @param workers: int - number of worker processes
+        @param batch_size: int - number of texts spaCy processes per batch within a worker
+        @param entities: List[str] - (Optional) entities to detect, defaults to the service's entities
+        @return: Iterator[AnalysisResult]
+        """
+        if not record_count:
+            return
 
-        return self._format_result_set_item(
-            analysis_items=analysis, sanitized_text=sanitized_text, index=idx
+        yield from self._iter_analysis_in_pool(
+            record_batches=shard_records(
+                records, get_shard_size(record_count, workers)
+            ),
+            language_code=language_code,
+            workers=min(workers, record_count),
+            batch_size=batch_size,
+            entities=entities,
         )
 
-    def _analyze_text_collection_item(self, idx, text):
+    def _analyze_collection_in_executor(
+        self,
+        records: Iterable[CollectionRecord],
+        executor: Executor,
+        language_code: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        entities: Optional[List[str]] = None,
+    ) -> List[AnalysisResult]:
         """
-        Parallelized task to text array
-        @param idx:
-        @param text:
-        @return:
+        Submits every batch of collection records to an executor and reassembles the results in the original
+        index order. The batches are analyzed by this service, so the executor must run them in this process.
+
+        @param records: Iterable[Tuple[int, str, Optional[dict]]] - records of index, text, and metadata
+        @param executor: Executor - thread pool to analyze the batches on
+        @param language_code: str - "en" is default value
+        @param batch_size: int - number of texts per submitted batch
+        @param n_process: int - number of processes spaCy uses for batching
+        @param entities: List[str] - (Optional) entities to detect, defaults to the service's entities
+        @return: List[AnalysisResult]
+        """
+        futures: List[Future] = [
+            executor.submit(
+                self._analyze_collection_records,
+                records=record_batch,
+                language_code=language_code,
+                batch_size=batch_size,
+                n_process=n_process,
+                entities=entities,
+            )
+            for record_batch in shard_records(records, batch_size)
+        ]
+
+        return [analysis for future in futures for analysis in future.result()]
+
+    def _iter_analysis_in_pool(
+        self,
+        record_batches: Iterable[List[CollectionRecord]],
+        language_code: str,
+        workers: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        entities: Optional[List[str]] = None,
+    ) -> Iterator[AnalysisResult]:
         """
+        Submits record shards to a process pool of warmed workers and yields their results in submission
+        order. At most two shards per worker are in flight, bounding memory for unbounded inputs.
 
-        analysis, sanitized_text = self._perform_text_analysis(
-            language_code=self._language_code,
-            text=text,
+        @param record_batches: Iterable of record shards
+        @param language_code: str - "en" is default value
+        @param workers: int - number of worker processes
+        @param batch_size: int - number of texts spaCy processes per batch within a worker
+        @param entities: List[str] - (Optional) entities to detect, defaults to the service's entities
+        @return: Iterator[AnalysisResult]
+        """
+        if self._fork_workers:
+            self._warm_up_analyzer()
+
+        with frozen_for_fork() if self._fork_workers else nullcontext(), (
+            self._get_process_pool(workers)
+        ) as executor:
+            pending: Deque[Future] = deque()
+
+            for record_batch in record_batches:
+                pending.append(
+                    executor.submit(
+                        analyze_shard,
+                        record_batch,
+                        language_code=language_code,
+                        batch_size=batch_size,
+                        entities=entities,
+                    )
+                )
+
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def _get_worker_config(self) -> dict:
+        """
+        Constructor arguments used to rebuild this service within worker processes
+        @return: dict
+        """
+        return {
+            "pii_token_replacement_value": self._pii_token_replacement_value,
+            "analysis_provider": self._analysis_provider,
+            "detection_cache": self._detection_cache,
+            "prefilter": self._prefilter,
+            "combined_patterns": self._combined_patterns,
+            "entity_profile": self._entity_profile,
+            "model_name": self._model_name,
+            "install_missing_model": self._install_missing_model,
+            "shared_vectors": self._shared_vectors,
+            "snapshot_path": self._snapshot_path,
+            "detect_only": self._detect_only,
+            "cache_sanitized_text": self._cache_sanitized_text,
+        }
+
+    def _warm_up_analyzer(self) -> None:
+        """
+        Runs the Presidio engine over a sample text so state it initializes lazily (e.g. the regexes pattern
+        recognizers compile on first use) is set up once, in this process, before workers are forked from it
+        @return: None
+        """
+        if isinstance(self._analyzer, PresidioPIIAnalyzer):
+            self._analyzer.warmup()
+
+    def _get_process_pool(self, workers: int) -> ProcessPoolExecutor:
+        """
+        Builds the process pool of collection analyses. Workers either build their own service from the
+        worker config or, with fork_workers, are forked from this process and adopt this (warmed) service.
+        @param workers: int - number of worker processes
+        @return: ProcessPoolExecutor
+        """
+        if not self._fork_workers:
+            return ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_analysis_worker,
+                initargs=(type(self), self._get_worker_config()),
+            )
+
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=init_forked_analysis_worker,
+            initargs=(self,),
         )
 
-        return self._format_result_set_item(
-            analysis_items=analysis,
-            sanitized_text=sanitized_text,
-            index=idx,
+    @staticmethod
+    def _get_collection_records(
+        texts: Optional[List[str]], data: Optional[pd.DataFrame]
+    ) -> Iterator[CollectionRecord]:
+        """
+        Lazily flattens the texts or dataframe input of a collection analysis to index, text, and metadata
+        records. Dataframe columns are read as arrays (no per-row Series or frame copy) and records are
+        indexed by row position, so results line up with the frame's row order whatever its index.
+
+        @param texts:
+        @param data:
+        @return: Iterator[Tuple[int, str, Optional[dict]]]
+        """
+        if data is not None:
+            metadata_column = (
+                data["metadata"].to_numpy() if "metadata" in data else repeat(None)
+            )
+            return zip(range(len(data)), data["text"].to_numpy(), metadata_column)
+
+        return ((idx, text, None) for idx, text in enumerate(texts or []))
+
+    @staticmethod
+    def _iter_collection_records(iterable: Iterable[Any]) -> Iterator[CollectionRecord]:
+        """
+        Lazily converts streamed items to index, text, and metadata records
+        @param iterable: Iterable of str texts or dicts with "text" and (optional) "metadata" entries
+        @return: Iterator[Tuple[int, str, Optional[dict]]]
+        """
+        for idx, item in enumerate(iterable):
+            if isinstance(item, str):
+                yield idx, item, None
+            elif isinstance(item, dict) and "text" in item:
+                yield idx, item["text"], item.get("metadata")
+            else:
+                raise Exception(
+                    "Streamed items must be strings or dicts with a 'text' entry."
+                )
+
+    def _analyze_collection_records(
+        self,
+        records: Iterable[CollectionRecord],
+        language_code: str = "en",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        entities: Optional[List[str]] = None,
+    ) -> List[AnalysisResult]:
+        """
+        Parallelized task to process collection records. Texts are batched through the analyzer and the
+        metadata of every record is analyzed alongside its text.
+
+        @param records: Iterable[Tuple[int, str, Optional[dict]]] - records of index, text, and metadata
+        @param language_code: str - "en" is default value
+        @param batch_size: int - number of texts spaCy processes per batch
+        @param n_process: int - number of processes spaCy uses for batching
+        @param entities: List[str] - (Optional) entities to detect, defaults to the service's entities
+        @return: List[AnalysisResult]
+        """
+        return list(
+            self._iter_collection_record_analyses(
+                records=records,
+                language_code=language_code,
+                batch_size=batch_size,
+                n_process=n_process,
+                entities=entities,
+            )
         )
 
+    def _iter_collection_record_analyses(
+        self,
+        records: Iterable[CollectionRecord],
+        language_code: str = "en",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        entities: Optional[List[str]] = None,
+    ) -> Iterator[AnalysisResult]:
+        """
+        Lazily streams the texts of collection records through the analyzer in batches and yields an
+        AnalysisResult per record, in order. Only the index and metadata of records whose texts are
+        in flight are held back.
+
+        @param records: Iterable[Tuple[int, str, Optional[dict]]] - records of index, text, and metadata
+        @param language_code: str - "en" is default value
+        @param batch_size: int - number of texts spaCy processes per batch
+        @param n_process: int - number of processes spaCy uses for batching
+        @param entities: List[str] - (Optional) entities to detect, defaults to the service's entities
+        @return: Iterator[AnalysisResult]
+        """
+        pending_records: Deque[CollectionRecord] = deque()
+
+        def iter_texts() -> Iterator[str]:
+            for record in records:
+                pending_records.append(record)
+                yield record[1]
+
+        for analysis in self._iter_batch_text_analysis(
+            texts=iter_texts(),
+            language_code=language_code,
+            batch_size=batch_size,
+            n_process=n_process,
+            entities=entities,
+        ):
+            idx, text, metadata = pending_records.popleft()
+            if metadata is not None:
+                # Perform analyses for metadata entries
+                analysis.extend(self.analyze_metadata(metadata=metadata))
+
+            yield self._format_result_set_item(
+                analysis_items=analysis, text=text, index=idx
+            )
+
     def analyze_detection_collection(
         self,
         detection_collection: List[DetectionResult],
         collection_name: str = "",
         collection_type: str = "population",
+        texts: Optional[List[str]] = None,
+        detail: str = ResultDetailLevel.FULL.value,
     ) -> AnalysisResultSet:
         """
         Transforms a set of Detection Results to an AnalysisResultSet with RiskAssessments for all detections
@@ -188,25 +739,35 @@ class PIIAnalysisService:
         @param detection_collection: List[DetectionResult] - Set of detection results
         @param collection_name: str - name of collection
         @param collection_type: str - population(default) or sample
+        @param texts: List[str] - (Optional) strings the detections were found in, in the same order. When given,
+        each analysis result includes the sanitized string.
+        @param detail: str - detail kept per detection result: "full" (default), "compact", "aggregates", or
+        "columnar" (see ResultDetailLevel)
         @return: AnalysisResultList
         """
-
-        analysis_set: List[AnalysisResult] = []
-        for i, detection_result in enumerate(detection_collection):
-            analysis_set.append(
-                self.analyze_detection_result(
-                    detection_result=detection_result, index=i
-                )
-            )
+        if texts is not None and len(texts) != len(detection_collection):
+            raise Exception("'texts' param must have one string per detection result.")
+        self._validate_detail(detail)
 
         return self._build_analysis_result_set(
             collection_name=collection_name,
             collection_type=collection_type,
-            analysis_set=analysis_set,
+            analysis_set=(
+                self.analyze_detection_result(
+                    detection_result=detection_result,
+                    index=i,
+                    text=texts[i] if texts is not None else None,
+                )
+                for i, detection_result in enumerate(detection_collection)
+            ),
+            detail=detail,
         )
 
     def analyze_detection_result(
-        self, detection_result: DetectionResult, index: int = 0
+        self,
+        detection_result: DetectionResult,
+        index: int = 0,
+        text: Optional[str] = None,
     ) -> AnalysisResult:
         """
         Transforms a Detection Result to an AnalysisResult with RiskAssessments for all detections
@@ -214,6 +775,8 @@ class PIIAnalysisService:
 
         @param detection_result:
         @param index: (Optional) the current index of the detection result to transform
+        @param text: str - (Optional) string the detections were found in, sanitized with the service's
+        replacement token on access when given (unless the service is detect only)
         @return: AnalysisResult
         """
         detection_analyses = [
@@ -226,8 +789,42 @@ class PIIAnalysisService:
             risk_score_mean=get_mean(
                 [analysis.risk_assessment.risk_level for analysis in detection_analyses]
             ),
+            **self._get_sanitization_args(text),
+        )
+
+    def sanitize_item(self, text: str, detections: List[DetectionResultItem]) -> str:
+        """
+        Sanitize-only counterpart of analyze_item: redacts precomputed detections of a text (e.g. ones stored by a
+        detect only service, or converted by a detection adapter) without analyzing it again
+
+        @param text: str - text the detections were found in
+        @param detections: List[DetectionResultItem]
+        @return: str
+        """
+        return sanitize_text(
+            text=text,
+            analysis_items=detections,
+            pii_token_replacement_value=self._pii_token_replacement_value,
         )
 
+    def sanitize_collection(
+        self, texts: List[str], detection_collection: List[DetectionResult]
+    ) -> List[str]:
+        """
+        Sanitize-only counterpart of analyze_collection: redacts the precomputed detections of every text
+
+        @param texts: List[str] - texts the detections were found in
+        @param detection_collection: List[DetectionResult] - detections of each text, in the same order
+        @return: List[str]
+        """
+        if len(texts) != len(detection_collection):
+            raise Exception("'texts' param must have one string per detection result.")
+
+        return [
+            self.sanitize_item(text=text, detections=detection_result.detections)
+            for text, detection_result in zip(texts, detection_collection)
+        ]
+
     def analyze_detection_result_item(
         self,
         detection_result_item: DetectionResultItem,
@@ -248,46 +845,132 @@ class PIIAnalysisService:
 
     def _perform_text_analysis(
         self, text: str, language_code: str = "en"
-    ) -> Tuple[List[AnalysisResultItem], str]:
+    ) -> List[AnalysisResultItem]:
         """
-        Transforms detections into AnalysisResult objects
+        Transforms detections into AnalysisResult objects. Sanitization is left to the AnalysisResult (see
+        _get_sanitization_args).
 
         @param text: input text to analyze
         @param language_code: "en" is default value
-        @return: Tuple[List[AnalysisResult], str]
+        @return: List[AnalysisResultItem]
         """
+        self._validate_text_analysis_provider()
 
-        if self._analysis_provider.upper() == AnalysisProviderType.PRESIDIO.name:
-            detections, sanitized_text = self._analyzer.analyze_item(  # type: ignore
-                entities=[pii_type.value for pii_type in MSFTPresidioPIIType],
-                text=text,
-                language_code=language_code,
+        detections, _ = self._analyzer.analyze_item(  # type: ignore
+            entities=self._entities,
+            text=text,
+            language_code=language_code,
+            sanitize=False,
+        )
+
+        return self._assess_detections(detections)
+
+    def _iter_batch_text_analysis(
+        self,
+        texts: Iterable[str],
+        language_code: str = "en",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        entities: Optional[List[str]] = None,
+    ) -> Iterator[List[AnalysisResultItem]]:
+        """
+        Lazily transforms the batched detections of several texts into AnalysisResultItem lists. Sanitization is
+        left to the AnalysisResult (see _get_sanitization_args).
+
+        @param texts: input texts to analyze
+        @param language_code: "en" is default value
+        @param batch_size: int - number of texts spaCy processes per batch
+        @param n_process: int - number of processes spaCy uses for batching
+        @param entities: List[str] - (Optional) entities to detect, defaults to the service's entities
+        @return: Iterator[List[AnalysisResultItem]]
+        """
+        self._validate_text_analysis_provider()
+
+        for detections, _ in self._analyzer.iter_analyze_items(  # type: ignore
+            texts=texts,
+            entities=entities or self._entities,
+            language_code=language_code,
+            batch_size=batch_size,
+            n_process=n_process,
+            sanitize=False,
+        ):
+            yield self._assess_detections(detections)
+
+    def _assess_detections(
+        self, detections: List[DetectionResultItem]
+    ) -> List[AnalysisResultItem]:
+        """
+        Pairs every detection of a text with its risk assessment. Texts without detections are given a
+        single non-identifiable analysis item.
+
+        @param detections: List[DetectionResultItem]
+        @return: List[AnalysisResultItem]
+        """
+        if not detections:
+            return [
+                AnalysisResultItem(detection=None, risk_assessment=RiskAssessment())
+            ]
+
+        risk_assessments = self._pii_assessment_service.assess_pii_type_list(
+            detected_pii_types=[
+                detection.entity_type.upper() for detection in detections
+            ]
+        )
+
+        return [
+            AnalysisResultItem(detection=detection, risk_assessment=risk_assessment)
+            for detection, risk_assessment in zip(detections, risk_assessments)
+        ]
+
+    def _get_analyzer(self) -> Optional[Union[PresidioPIIAnalyzer, PatternPIIAnalyzer]]:
+        """
+        Builds the text analyzer of the analysis provider
+        @return: PresidioPIIAnalyzer, PatternPIIAnalyzer, or None for providers without text analyses
+        """
+        if self._analysis_provider == AnalysisProviderType.PRESIDIO.name:
+            return PresidioPIIAnalyzer(
+                pii_token_replacement_value=self._pii_token_replacement_value,
+                detection_cache=self._detection_cache,
+                prefilter=self._prefilter,
+                combined_patterns=self._combined_patterns,
+                recognizer_names=self._entity_profile.recognizer_names
+                if self._entity_profile is not None
+                else None,
+                model_name=self._model_name,
+                install_missing_model=self._install_missing_model,
+                shared_vectors=self._shared_vectors,
+                snapshot_path=self._snapshot_path,
             )
-        elif (
+
+        if self._analysis_provider == AnalysisProviderType.PATTERN.name:
+            return PatternPIIAnalyzer(
+                pii_token_replacement_value=self._pii_token_replacement_value
+            )
+
+        return None
+
+    def _validate_text_analysis_provider(self):
+        """
+        Validates that the analysis provider supports text analyses
+        @return:
+        """
+        if self._analysis_provider.upper() in (
+            AnalysisProviderType.PRESIDIO.name,
+            AnalysisProviderType.PATTERN.name,
+        ):
+            return
+
+        if (
             self._analysis_provider.upper() == AnalysisProviderType.AZURE.name
             or self._analysis_provider.upper() == AnalysisProviderType.AWS.name
         ):
             raise Exception(
                 "Unsupported operation. Use detection converters followed by analyze_detection_result()."
             )
-        else:
-            raise Exception(
-                "Unsupported operation. Only the Presidio analyzer is supported at this time."
-            )
 
-        return (
-            [
-                AnalysisResultItem(
-                    detection=detection,
-                    risk_assessment=self._pii_assessment_service.assess_pii_type(
-                        detected_pii_type=detection.entity_type.upper()
-                    ),
-                )
-                for detection in detections
-            ]
-            if detections
-            else [AnalysisResultItem(detection=None, risk_assessment=RiskAssessment())]
-        ), sanitized_text
+        raise Exception(
+            "Unsupported operation. Only the Presidio and pattern analyzers are supported at this time."
+        )
 
     def analyze_metadata(self, metadata: dict):
         """
@@ -337,64 +1020,123 @@ class PIIAnalysisService:
             ),
         )
 
+    @staticmethod
+    def summarize_analysis_results(
+        analyses: Iterable[AnalysisResult],
+        collection_name: str = "",
+        collection_type: str = DEFAULT_ANALYSIS_MODE,
+    ) -> AnalysisResultSet:
+        """
+        Aggregates the set-level statistics of analysis results (e.g. those yielded by iter_analyze) into an
+        AnalysisResultSet without retaining the analyses. The returned set holds no analyses or risk scores.
+
+        @param analyses: Iterable[AnalysisResult]
+        @param collection_name: str - name of collection
+        @param collection_type: str - population(default) or sample
+        @return: AnalysisResultSet
+        """
+        return (
+            PIIAnalysisAggregator()
+            .update_all(analyses)
+            .to_analysis_result_set(
+                collection_name=collection_name,
+                collection_type=collection_type,
+                detail=ResultDetailLevel.AGGREGATES.value,
+            )
+        )
+
     def _build_analysis_result_set(
         self,
-        analysis_set: List[AnalysisResult],
+        analysis_set: Iterable[AnalysisResult],
         collection_name: str = "",
         collection_type: str = DEFAULT_ANALYSIS_MODE,
+        detail: str = ResultDetailLevel.FULL.value,
     ):
-        (
-            detected_types,
-            detected_type_frequencies,
-        ) = self._pii_assessment_service.get_detected_pii_types(analysis_set)
+        """
+        Aggregates analysis results as they come in and keeps each one at the requested detail level, so
+        results dropped or compacted are never all held at once
+        @param analysis_set: Iterable[AnalysisResult]
+        @param collection_name: str - name of collection
+        @param collection_type: str - population(default) or sample
+        @param detail: str - "full", "compact", "aggregates", or "columnar" (see ResultDetailLevel). Columnar
+        statistics are computed from the columns' arrays once every result is converted.
+        @return: AnalysisResultSet
+        """
+        if detail == ResultDetailLevel.COLUMNAR.value:
+            columns = ColumnarAnalysisResults.from_analysis_results(analysis_set)
 
-        collection_risk_score_means = [
-            analysis.risk_score_mean for analysis in analysis_set
-        ]
+            return PIIAnalysisAggregator.from_columns(columns).to_analysis_result_set(
+                collection_name=collection_name,
+                collection_type=collection_type,
+                detail=detail,
+                columns=columns,
+            )
+
+        aggregator = PIIAnalysisAggregator()
+        analyses: List[AnalysisResult] = []
+        compact_analyses: List[CompactAnalysisResult] = []
+
+        for analysis in analysis_set:
+            aggregator.update(analysis)
+            if detail == ResultDetailLevel.FULL.value:
+                analyses.append(analysis)
+            elif detail == ResultDetailLevel.COMPACT.value:
+                compact_analyses.append(
+                    CompactAnalysisResult.from_analysis_result(analysis)
+                )
 
-        return AnalysisResultSet(
+        return aggregator.to_analysis_result_set(
             collection_name=collection_name,
-            analyses=analysis_set,
-            risk_score_mean=get_mean(collection_risk_score_means),
-            risk_scores=collection_risk_score_means,
-            risk_score_standard_deviation=get_standard_deviation(
-                collection_risk_score_means, collection_type
-            ),
-            risk_score_variance=get_variance(
-                collection_risk_score_means, collection_type
-            ),
-            risk_score_mode=get_mode(collection_risk_score_means),
-            risk_score_median=get_median(collection_risk_score_means),
-            detection_count=self._pii_assessment_service.get_detected_pii_count(
-                analysis_set
-            ),
-            detected_pii_type_frequencies=detected_type_frequencies,
-            detected_pii_types=detected_types,
+            collection_type=collection_type,
+            analyses=analyses,
+            compact_analyses=compact_analyses,
+            detail=detail,
         )
 
-    @staticmethod
     def _format_result_set_item(
+        self,
         analysis_items: List[AnalysisResultItem],
-        sanitized_text: str = "",
+        text: Optional[str] = None,
         index: int = 0,
     ) -> AnalysisResult:
         """
         Formats the analysis items for a single row in a collection to an AnalysisResult object
         @param analysis_items:
+        @param text: str - (Optional) source text, sanitized lazily by the AnalysisResult
         @param index:
         @return:
         """
         return AnalysisResult(
             index=index,
             analysis=analysis_items,
-            sanitized_text=sanitized_text,
             risk_score_mean=get_mean(
                 [analysis.risk_assessment.risk_level for analysis in analysis_items]
             )
             if analysis_items
             else float(RiskLevel.LEVEL_ONE.value),
+            **self._get_sanitization_args(text),
         )
 
+    def _get_sanitization_args(self, text: Optional[str]) -> dict:
+        """
+        AnalysisResult arguments sanitizing a text lazily: the result keeps a reference to the source text and
+        only builds the sanitized string (with the service's replacement token) when it is accessed. Detect only
+        services keep no text, so the sanitized string is empty.
+        @param text: str - (Optional) source text
+        @return: dict
+        """
+        if text is None or self._detect_only:
+            return {}
+
+        return {
+            "text": text,
+            "sanitizer": partial(
+                sanitize_text,
+                pii_token_replacement_value=self._pii_token_replacement_value,
+            ),
+            "cache_sanitized_text": self._cache_sanitized_text,
+        }
+
     @staticmethod
     def _validate_data(texts, data):
         """
@@ -417,3 +1159,56 @@ class PIIAnalysisService:
 
         if data is not None and not isinstance(data, pd.DataFrame):
             raise Exception("Data param must be a dataframe.")
+
+    @staticmethod
+    def _validate_detail(detail):
+        """
+        Validates the detail level of collection analyses
+        @param detail: str
+        @return:
+        """
+        detail_levels = [detail_level.value for detail_level in ResultDetailLevel]
+        if detail not in detail_levels:
+            raise Exception(
+                f"'detail' param must be one of: {', '.join(detail_levels)}."
+            )
+
+    @staticmethod
+    def _validate_executor(executor, workers=1):
+        """
+        Validates the executor supplied for collection analyses
+        @param executor:
+        @param workers:
+        @return:
+        """
+        if executor is None:
+            return
+
+        if not isinstance(executor, Executor):
+            raise Exception("'executor' param must be a concurrent.futures Executor.")
+
+        # Batches are analyzed with this service, which can't be sent to another process
+        if isinstance(executor, ProcessPoolExecutor):
+            raise Exception(
+                "'executor' param must be a thread pool (e.g. ThreadPoolExecutor). Use the 'workers' param to "
+                "analyze on worker processes."
+            )
+
+        if workers > 1:
+            raise Exception("Cannot supply both 'workers' and 'executor' params.")
+
+    @staticmethod
+    def _validate_workers(workers, n_process=1):
+        """
+        Validates the number of worker processes requested for collection analyses
+        @param workers:
+        @param n_process:
+        @return:
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise Exception("'workers' param must be a positive integer.")
+
+        if workers > 1 and n_process != 1:
+            raise Exception(
+                "Cannot supply both 'workers' and 'n_process' params. Worker processes cannot spawn spaCy processes."
+            )
@@ -0,0 +1,132 @@
+# pylint: disable=global-statement, protected-access
+import gc
+from contextlib import contextmanager
+from itertools import islice
+from threading import Lock
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from ..config import DEFAULT_BATCH_SIZE
+from ..models.analysis import AnalysisResult
+
+# A collection record is the row index along with its text and (optional) metadata
+CollectionRecord = Tuple[int, str, Optional[dict]]
+
+# Process-local analysis service. Each worker in the pool builds its own service (and
+# therefore its own Presidio analyzer) once, in the pool initializer, and reuses it for
+# every shard it is handed.
+_WORKER_SERVICE = None
+
+# Number of forked pools currently relying on the parent's objects being frozen
+_FROZEN_POOL_COUNT = 0
+_FROZEN_POOL_LOCK = Lock()
+
+
+def init_analysis_worker(service_class: Type, service_config: dict) -> None:
+    """
+    Process pool initializer. Warms a single analysis service for the worker process.
+
+    @param service_class: PIIAnalysisService (or subclass) to construct within the worker
+    @param service_config: dict - keyword arguments for the service constructor
+    @return: None
+    """
+    global _WORKER_SERVICE
+
+    _WORKER_SERVICE = service_class(**service_config)
+
+
+def init_forked_analysis_worker(service: Any) -> None:
+    """
+    Process pool initializer for workers forked from a warmed parent. The worker adopts the parent's service
+    (and its loaded analyzer engine) as inherited, sharing its memory pages copy-on-write, rather than building
+    its own. The service must be handed over with a "fork" pool context, so it is never pickled.
+
+    @param service: PIIAnalysisService - warmed service of the parent process
+    @return: None
+    """
+    global _WORKER_SERVICE
+
+    _WORKER_SERVICE = service
+
+
+@contextmanager
+def frozen_for_fork() -> Iterator[None]:
+    """
+    Moves every object of the parent process into the garbage collector's permanent generation (gc.freeze) while
+    workers are forked. Collections in the workers then never traverse the inherited objects, as writing to
+    their GC headers would copy the memory pages holding them. Objects are unfrozen once the last forked pool
+    is closed.
+
+    @return: Iterator[None]
+    """
+    global _FROZEN_POOL_COUNT
+
+    with _FROZEN_POOL_LOCK:
+        if not _FROZEN_POOL_COUNT:
+            # Garbage is collected first so it isn't frozen along with the live objects
+            gc.collect()
+            gc.freeze()
+        _FROZEN_POOL_COUNT += 1
+
+    try:
+        yield
+    finally:
+        with _FROZEN_POOL_LOCK:
+            _FROZEN_POOL_COUNT -= 1
+            if not _FROZEN_POOL_COUNT:
+                gc.unfreeze()
+
+
+def analyze_shard(
+    shard: Sequence[CollectionRecord],
+    language_code: str = "en",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    entities: Optional[List[str]] = None,
+) -> List[AnalysisResult]:
+    """
+    Analyzes a shard of collection records with the worker's warmed analysis service.
+
+    @param shard: List[Tuple[int, str, Optional[dict]]] - records of index, text, and metadata
+    @param language_code: str - "en" is default value
+    @param batch_size: int - number of texts spaCy processes per batch
+    @param entities: List[str] - (Optional) entities to detect, defaults to the service's entities
+    @return: List[AnalysisResult]
+    """
+    if _WORKER_SERVICE is None:
+        raise Exception(
+            "Analysis worker has not been initialized. Use init_analysis_worker as the pool initializer."
+        )
+
+    return _WORKER_SERVICE._analyze_collection_records(
+        records=shard,
+        language_code=language_code,
+        batch_size=batch_size,
+        entities=entities,
+    )
+
+
+def shard_records(
+    records: Iterable[CollectionRecord], shard_size: int
+) -> Iterator[List[CollectionRecord]]:
+    """
+    Lazily splits collection records into contiguous shards. Only one shard is pulled from the
+    records at a time, so unbounded iterators can be sharded.
+
+    @param records: Iterable[Tuple[int, str, Optional[dict]]]
+    @param shard_size: int - max number of records per shard
+    @return: Iterator of record shards
+    """
+    records = iter(records)
+    while shard := list(islice(records, shard_size)):
+        yield shard
+
+
+def get_shard_size(record_count: int, workers: int, shards_per_worker: int = 4) -> int:
+    """
+    Determines a shard size that hands every worker a few shards to balance uneven text lengths
+
+    @param record_count: int - number of records in the collection
+    @param workers: int - number of worker processes
+    @param shards_per_worker: int - target number of shards per worker
+    @return: int
+    """
+    return max(1, -(-record_count // (workers * shards_per_worker)))
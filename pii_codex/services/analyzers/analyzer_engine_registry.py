@@ -0,0 +1,325 @@
+# pylint: disable=import-outside-toplevel,too-many-arguments,too-many-positional-arguments
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from ...config import DEFAULT_LANG, DEFAULT_SPACY_MODEL
+from ...utils.entity_profile_util import NLP_RECOGNIZER_NAME
+from ...utils.package_installer_util import install_spacy_package
+
+# An engine is identified by its language, spaCy model, (optional) names of the recognizers it keeps,
+# whether its pattern recognizers are gated by a combined single-pass scan, and whether its word vectors are
+# memory-mapped
+AnalyzerEngineKey = Tuple[str, str, Optional[Tuple[str, ...]], bool, bool]
+
+# Process-wide Presidio analyzer engines. Loading an engine loads its spaCy model, so every analyzer
+# (and therefore every analysis service) in the process shares one engine per configuration.
+_ANALYZER_ENGINES: Dict[AnalyzerEngineKey, Any] = {}
+_ANALYZER_ENGINES_LOCK = Lock()
+
+# Engines restored from snapshot directories, keyed by resolved path and whether vectors are memory-mapped
+_SNAPSHOT_ENGINES: Dict[Tuple[str, bool], Any] = {}
+
+
+def get_analyzer_engine(
+    language_code: str = DEFAULT_LANG,
+    model_name: str = DEFAULT_SPACY_MODEL,
+    recognizer_names: Optional[Iterable[str]] = None,
+    combined_patterns: bool = False,
+    install_missing_model: bool = True,
+    shared_vectors: bool = False,
+):
+    """
+    Retrieves the shared Presidio AnalyzerEngine of a configuration, loading it on first use. Engines hold
+    no replacement token (operator) configuration, so they are safe to share between services.
+
+    @param language_code: str - "en" is default
+    @param model_name: str - spaCy model package or path to a model directory loaded by the engine
+    @param recognizer_names: Iterable[str] - (Optional) names of the predefined recognizers to keep,
+    defaults to all of them
+    @param combined_patterns: bool - when True, the patterns of every pattern recognizer are scanned in a single
+    pass and only the recognizers with a match run (see CombinedPatternScanner)
+    @param install_missing_model: bool - when False, a missing model package raises an exception instead of
+    being downloaded and installed
+    @param shared_vectors: bool - when True, the model's word vectors are memory-mapped read-only from its vectors
+    file, so every process loading the model this way shares one copy (see SharedVectorsSpacyNlpEngine)
+    @return: AnalyzerEngine
+    """
+    engine_key: AnalyzerEngineKey = (
+        language_code,
+        model_name,
+        tuple(sorted(set(recognizer_names))) if recognizer_names is not None else None,
+        combined_patterns,
+        shared_vectors,
+    )
+
+    # Engines are loaded under the lock so concurrent callers never load the same model twice
+    with _ANALYZER_ENGINES_LOCK:
+        if engine_key not in _ANALYZER_ENGINES:
+            _ANALYZER_ENGINES[engine_key] = _load_analyzer_engine(
+                *engine_key, install_missing_model=install_missing_model
+            )
+
+        return _ANALYZER_ENGINES[engine_key]
+
+
+def get_snapshot_analyzer_engine(
+    snapshot_path: Union[str, Path], shared_vectors: bool = False
+):
+    """
+    Retrieves the shared Presidio AnalyzerEngine restored from a snapshot directory (see save_engine_snapshot),
+    restoring it on first use
+    @param snapshot_path: str or Path - snapshot directory
+    @param shared_vectors: bool - when True, the model's word vectors are memory-mapped read-only from the
+    snapshot (see SharedVectorsSpacyNlpEngine)
+    @return: AnalyzerEngine
+    """
+    from .engine_snapshot import load_engine_snapshot
+
+    snapshot_key = (str(Path(snapshot_path).resolve()), shared_vectors)
+
+    with _ANALYZER_ENGINES_LOCK:
+        if snapshot_key not in _SNAPSHOT_ENGINES:
+            _SNAPSHOT_ENGINES[snapshot_key] = load_engine_snapshot(
+                snapshot_path, shared_vectors=shared_vectors
+            )
+
+        return _SNAPSHOT_ENGINES[snapshot_key]
+
+
+def get_loaded_analyzer_engine_keys() -> Tuple[AnalyzerEngineKey, ...]:
+    """
+    Lists the configurations of the engines loaded in this process
+    @return: Tuple[Tuple[str, str, Optional[Tuple[str, ...]], bool, bool], ...]
+    """
+    with _ANALYZER_ENGINES_LOCK:
+        return tuple(_ANALYZER_ENGINES)
+
+
+def clear_analyzer_engines() -> None:
+    """
+    Drops every shared engine (and the reference to its spaCy model) held by the registry
+    @return: None
+    """
+    with _ANALYZER_ENGINES_LOCK:
+        _ANALYZER_ENGINES.clear()
+        _SNAPSHOT_ENGINES.clear()
+
+
+def _load_analyzer_engine(
+    language_code: str,
+    model_name: str,
+    recognizer_names: Optional[Tuple[str, ...]],
+    combined_patterns: bool,
+    shared_vectors: bool,
+    install_missing_model: bool = True,
+):
+    """
+    Loads a Presidio AnalyzerEngine with Presidio's default NLP engine configuration for the given model
+    @param language_code: str
+    @param model_name: str - spaCy model package or path to a model directory
+    @param recognizer_names: Tuple[str, ...] or None for all predefined recognizers
+    @param combined_patterns: bool
+    @param shared_vectors: bool
+    @param install_missing_model: bool
+    @return: AnalyzerEngine
+    """
+    import spacy
+    from presidio_analyzer import AnalyzerEngine
+    from presidio_analyzer.nlp_engine import NlpEngineProvider
+
+    if not spacy.util.is_package(model_name) and not Path(model_name).is_dir():
+        if not install_missing_model:
+            raise Exception(
+                f"spaCy model '{model_name}' is not installed and install_missing_model is disabled. Install "
+                f"the model package (python -m spacy download {model_name}) or pass the path to a model directory."
+            )
+
+        # Last resort. Will install the model package if end-user hadn't already.
+        install_spacy_package(model_name)
+
+    if shared_vectors:
+        from .shared_vectors import SharedVectorsSpacyNlpEngine
+
+        # Takes the place of Presidio's spaCy engine, with the same NER configuration
+        nlp_engine_provider = NlpEngineProvider(
+            nlp_engines=(SharedVectorsSpacyNlpEngine,)
+        )
+    else:
+        nlp_engine_provider = NlpEngineProvider()
+
+    nlp_engine_provider.nlp_configuration = {
+        **nlp_engine_provider.nlp_configuration,
+        "models": [{"lang_code": language_code, "model_name": model_name}],
+    }
+
+    nlp_engine = nlp_engine_provider.create_engine()
+    analyzer_engine = AnalyzerEngine(
+        registry=_load_recognizer_registry(language_code, nlp_engine, recognizer_names),
+        nlp_engine=nlp_engine,
+        supported_languages=[language_code],
+    )
+
+    if combined_patterns:
+        from .combined_pattern_recognizer import get_combined_pattern_recognizers
+
+        analyzer_engine.registry.recognizers = get_combined_pattern_recognizers(
+            analyzer_engine.registry.recognizers
+        )
+
+    return analyzer_engine
+
+
+def _load_recognizer_registry(
+    language_code: str,
+    nlp_engine: Any,
+    recognizer_names: Optional[Tuple[str, ...]],
+):
+    """
+    Loads a registry of Presidio's predefined recognizers. When recognizer names are given, only those
+    recognizers are instantiated (including ones Presidio disables by default, e.g. UkNinoRecognizer).
+    @param language_code: str
+    @param nlp_engine: NlpEngine - engine the NLP (spaCy NER) recognizer is built around
+    @param recognizer_names: Tuple[str, ...] or None for all predefined recognizers
+    @return: RecognizerRegistry
+    """
+    from presidio_analyzer import RecognizerRegistry
+    from presidio_analyzer.recognizer_registry.recognizers_loader_utils import (
+        RecognizerConfigurationLoader,
+        RecognizerListLoader,
+    )
+
+    registry = RecognizerRegistry(supported_languages=[language_code])
+    if recognizer_names is None:
+        registry.load_predefined_recognizers(
+            languages=[language_code], nlp_engine=nlp_engine
+        )
+        return registry
+
+    configuration = RecognizerConfigurationLoader.get(
+        registry_configuration={
+            "supported_languages": [language_code],
+            "global_regex_flags": registry.global_regex_flags,
+        }
+    )
+    recognizer_configurations = {
+        recognizer_configuration["name"]: recognizer_configuration
+        for recognizer_configuration in configuration["recognizers"]
+        if recognizer_configuration["name"] in recognizer_names
+        and _supports_language(recognizer_configuration, language_code)
+        and _accepts_parameter(recognizer_configuration["name"], "name")
+    }
+
+    # Recognizers Presidio configures for the language keep their configuration (e.g. context words per
+    # language). The others, and the ones whose constructor takes no name Presidio's loader could pass (e.g.
+    # UsMbiRecognizer), are built from their class for the language.
+    configuration["recognizers"] = [
+        {**recognizer_configurations[recognizer_name], "enabled": True}
+        for recognizer_name in recognizer_names
+        if recognizer_name in recognizer_configurations
+    ]
+    for recognizer in RecognizerListLoader.get(**configuration):
+        registry.add_recognizer(recognizer)
+
+    for recognizer_name in recognizer_names:
+        if (
+            recognizer_name not in recognizer_configurations
+            and recognizer_name != NLP_RECOGNIZER_NAME
+        ):
+            registry.add_recognizer(
+                _load_predefined_recognizer(
+                    recognizer_name, language_code, registry.global_regex_flags
+                )
+            )
+
+    if NLP_RECOGNIZER_NAME in recognizer_names:
+        registry.add_nlp_recognizer(nlp_engine=nlp_engine)
+
+    loaded_recognizer_names = {recognizer.name for recognizer in registry.recognizers}
+    missing_recognizer_names = [
+        recognizer_name
+        for recognizer_name in recognizer_names
+        if recognizer_name not in loaded_recognizer_names
+    ]
+    if missing_recognizer_names:
+        raise Exception(
+            f"Presidio recognizers {', '.join(missing_recognizer_names)} could not be loaded for language "
+            f"'{language_code}'."
+        )
+
+    return registry
+
+
+def _supports_language(recognizer_configuration: dict, language_code: str) -> bool:
+    """
+    Checks whether a recognizer configuration of Presidio's lists a language
+    @param recognizer_configuration: dict - recognizer entry of Presidio's recognizer configuration
+    @param language_code: str
+    @return: bool
+    """
+    return any(
+        supported_language == language_code
+        or (
+            isinstance(supported_language, dict)
+            and supported_language.get("language") == language_code
+        )
+        for supported_language in recognizer_configuration.get(
+            "supported_languages", []
+        )
+    )
+
+
+def _load_predefined_recognizer(
+    recognizer_name: str, language_code: str, global_regex_flags: Optional[int]
+):
+    """
+    Builds a predefined Presidio recognizer from its class, for the given language
+    @param recognizer_name: str - name of the recognizer class (e.g. "EsNifRecognizer")
+    @param language_code: str
+    @param global_regex_flags: int - (Optional) regex flags of the registry
+    @return: EntityRecognizer
+    """
+    if not _accepts_parameter(recognizer_name, "supported_language"):
+        raise Exception(
+            f"Presidio recognizer '{recognizer_name}' cannot be loaded for language '{language_code}'."
+        )
+
+    recognizer = _get_predefined_recognizer_class(recognizer_name)(
+        supported_language=language_code
+    )
+    if global_regex_flags is not None and hasattr(recognizer, "global_regex_flags"):
+        recognizer.global_regex_flags = global_regex_flags
+
+    return recognizer
+
+
+def _accepts_parameter(recognizer_name: str, parameter_name: str) -> bool:
+    """
+    Checks whether the constructor of a predefined Presidio recognizer takes a parameter
+    @param recognizer_name: str - name of the recognizer class
+    @param parameter_name: str
+    @return: bool
+    """
+    import inspect
+
+    return (
+        parameter_name
+        in inspect.signature(
+            _get_predefined_recognizer_class(recognizer_name)
+        ).parameters
+    )
+
+
+def _get_predefined_recognizer_class(recognizer_name: str):
+    """
+    Looks up the class of a predefined Presidio recognizer
+    @param recognizer_name: str - name of the recognizer class (e.g. "EsNifRecognizer")
+    @return: type
+    """
+    from presidio_analyzer import predefined_recognizers
+
+    recognizer_class = getattr(predefined_recognizers, recognizer_name, None)
+    if recognizer_class is None:
+        raise Exception(f"Unknown Presidio recognizer '{recognizer_name}'.")
+
+    return recognizer_class
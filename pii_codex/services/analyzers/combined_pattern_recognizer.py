@@ -0,0 +1,294 @@
+# pylint: disable=no-member,deprecated-module,too-many-arguments,too-many-positional-arguments,too-many-return-statements
+import re
+from threading import local
+from typing import Any, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from presidio_analyzer import EntityRecognizer, PatternRecognizer, RecognizerResult
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse  # type: ignore
+except ImportError:  # Python 3.10
+    import sre_constants
+    import sre_parse
+
+# Stands for "any decimal digit" among the characters a pattern requires
+DIGIT_REQUIREMENT = r"\d"
+
+# Flags that change how a pattern is parsed
+_PARSE_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+_DIGITS = re.compile(r"\d")
+
+_REPEATS = (
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT),
+)
+
+
+class CombinedPatternScanner:
+    """
+    Single-pass scanner gating the pattern recognizers of an analyzer engine. Every pattern is compiled down
+    to the characters any of its matches must contain (digits and ASCII symbols such as '@', ':' or '-'),
+    all of which go into one lookup table. Each text is then read once to collect its characters, and only the
+    recognizers with a pattern whose required characters all show up are left to run.
+    """
+
+    def __init__(self, recognizers: List[Any]):
+        """
+        CombinedPatternScanner constructor.
+        @param recognizers: List[PatternRecognizer] - recognizers whose patterns are scanned
+        """
+        self._last_scans = local()
+        self._requirements: Dict[str, List[FrozenSet[str]]] = {}
+
+        for recognizer in recognizers:
+            self._requirements[recognizer.id] = [
+                get_pattern_requirements(pattern.regex, recognizer.global_regex_flags)
+                for pattern in recognizer.patterns
+            ]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickles the pattern requirements only. Last scans are per thread and can't be pickled.
+        @return: Dict[str, Any]
+        """
+        return {"_requirements": self._requirements}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restores the pattern requirements with no last scans
+        @param state: Dict[str, Any]
+        @return: None
+        """
+        self._requirements = state["_requirements"]
+        self._last_scans = local()
+
+    def get_matching_recognizer_ids(self, text: str) -> FrozenSet[str]:
+        """
+        Finds the recognizers that may match the text. The last text scanned by each thread is remembered, so
+        every recognizer gated by this scanner shares one scan.
+        @param text: str
+        @return: FrozenSet[str] of recognizer ids
+        """
+        last_scan = getattr(self._last_scans, "scan", None)
+        if last_scan is not None and last_scan[0] is text:
+            return last_scan[1]
+
+        recognizer_ids = self._scan(text)
+        self._last_scans.scan = (text, recognizer_ids)
+
+        return recognizer_ids
+
+    def _scan(self, text: str) -> FrozenSet[str]:
+        """
+        Collects the characters of the text and checks them against the requirements of every pattern
+        @param text: str
+        @return: FrozenSet[str] of recognizer ids
+        """
+        characters = set(text)
+        if _DIGITS.search(text):
+            characters.add(DIGIT_REQUIREMENT)
+
+        return frozenset(
+            recognizer_id
+            for recognizer_id, requirements in self._requirements.items()
+            if any(
+                pattern_requirements.issubset(characters)
+                for pattern_requirements in requirements
+            )
+        )
+
+
+class GatedPatternRecognizer(EntityRecognizer):
+    """
+    Pattern recognizer that only runs when the shared scanner found that one of its patterns may match the
+    text. The wrapped recognizer produces the results, so scores, validators, and context words are unchanged.
+    """
+
+    def __init__(self, recognizer: Any, scanner: CombinedPatternScanner):
+        """
+        GatedPatternRecognizer constructor.
+        @param recognizer: PatternRecognizer - wrapped recognizer
+        @param scanner: CombinedPatternScanner - scanner shared by the gated recognizers of an engine
+        """
+        self.recognizer = recognizer
+        self.scanner = scanner
+        super().__init__(
+            supported_entities=recognizer.supported_entities,
+            name=recognizer.name,
+            supported_language=recognizer.supported_language,
+            version=recognizer.version,
+            context=recognizer.context,
+            country_code=recognizer.country_code(),
+        )
+        self.score_thresholds = recognizer.score_thresholds
+
+    def load(self) -> None:
+        pass
+
+    def analyze(self, text, entities, nlp_artifacts=None):
+        if self.recognizer.id not in self.scanner.get_matching_recognizer_ids(text):
+            return []
+
+        results = self.recognizer.analyze(text, entities, nlp_artifacts)
+        for result in results:
+            # Results are tied to this recognizer, which carries the context words of the wrapped one
+            result.recognition_metadata[
+                RecognizerResult.RECOGNIZER_IDENTIFIER_KEY
+            ] = self.id
+
+        return results
+
+    def enhance_using_context(
+        self,
+        text,
+        raw_recognizer_results,
+        other_raw_recognizer_results,
+        nlp_artifacts,
+        context=None,
+    ):
+        return self.recognizer.enhance_using_context(
+            text,
+            raw_recognizer_results,
+            other_raw_recognizer_results,
+            nlp_artifacts,
+            context,
+        )
+
+
+def get_combined_pattern_recognizers(recognizers: Iterable[Any]) -> List[Any]:
+    """
+    Replaces the pattern recognizers of a list with ones gated by a shared CombinedPatternScanner. Recognizers
+    with their own analysis logic (e.g. the IBAN recognizer) or without patterns are kept as they are.
+    @param recognizers: Iterable[EntityRecognizer]
+    @return: List[EntityRecognizer]
+    """
+    recognizers = list(recognizers)
+    pattern_recognizers = [
+        recognizer
+        for recognizer in recognizers
+        if isinstance(recognizer, PatternRecognizer)
+        and type(recognizer).analyze is PatternRecognizer.analyze
+        and recognizer.patterns
+    ]
+    if not pattern_recognizers:
+        return recognizers
+
+    scanner = CombinedPatternScanner(pattern_recognizers)
+    gated_recognizers: Dict[int, Any] = {
+        id(recognizer): GatedPatternRecognizer(recognizer, scanner)
+        for recognizer in pattern_recognizers
+    }
+
+    return [
+        gated_recognizers.get(id(recognizer), recognizer) for recognizer in recognizers
+    ]
+
+
+def get_pattern_requirements(pattern: str, flags: int = 0) -> FrozenSet[str]:
+    """
+    Lists characters that every match of a pattern contains. Only digits (as DIGIT_REQUIREMENT) and ASCII
+    symbols are listed, as they match the same way regardless of case. Patterns the standard library cannot
+    parse require nothing, so they are never gated out.
+    @param pattern: str - regular expression
+    @param flags: int - regex flags the pattern is compiled with
+    @return: FrozenSet[str]
+    """
+    try:
+        parsed_pattern = sre_parse.parse(pattern, flags & _PARSE_FLAGS)
+    except (re.error, OverflowError, RecursionError):
+        return frozenset()
+
+    return frozenset(_get_sequence_requirements(parsed_pattern))
+
+
+def _get_sequence_requirements(sequence: Any) -> Set[str]:
+    """
+    Requirements of a parsed sequence, i.e. the union of the requirements of its items
+    @param sequence: SubPattern or list of parsed items
+    @return: Set[str]
+    """
+    requirements: Set[str] = set()
+    for opcode, argument in sequence:
+        requirements.update(_get_item_requirements(opcode, argument))
+
+    return requirements
+
+
+def _get_item_requirements(opcode: Any, argument: Any) -> Set[str]:
+    """
+    Requirements of a single parsed item. Anything not listed below (lookarounds, anchors, backreferences,
+    negated sets) requires nothing.
+    @param opcode: parsed opcode
+    @param argument: parsed opcode argument
+    @return: Set[str]
+    """
+    if opcode is sre_constants.LITERAL:
+        return _get_character_requirements(argument)
+
+    if opcode is sre_constants.IN:
+        return _get_set_requirements(argument)
+
+    if opcode is sre_constants.SUBPATTERN:
+        return _get_sequence_requirements(argument[-1])
+
+    if opcode is getattr(sre_constants, "ATOMIC_GROUP", None):
+        return _get_sequence_requirements(argument)
+
+    if opcode in _REPEATS:
+        minimum, _, repeated_sequence = argument
+        return _get_sequence_requirements(repeated_sequence) if minimum else set()
+
+    if opcode is sre_constants.BRANCH:
+        # Only what every branch requires
+        branch_requirements = [
+            _get_sequence_requirements(branch) for branch in argument[1]
+        ]
+        return set.intersection(*branch_requirements) if branch_requirements else set()
+
+    return set()
+
+
+def _get_character_requirements(code: int) -> Set[str]:
+    """
+    Requirement of a literal character
+    @param code: int - code point
+    @return: Set[str]
+    """
+    character = chr(code)
+    if character.isdecimal():
+        return {DIGIT_REQUIREMENT}
+
+    if character.isascii() and not character.isalpha():
+        return {character}
+
+    return set()
+
+
+def _get_set_requirements(items: List[Tuple[Any, Any]]) -> Set[str]:
+    """
+    Requirement of a character set, i.e. "a digit" when every member is a digit or the single character a set
+    of one holds
+    @param items: List of parsed set members
+    @return: Set[str]
+    """
+    if len(items) == 1 and items[0][0] is sre_constants.LITERAL:
+        return _get_character_requirements(items[0][1])
+
+    for opcode, argument in items:
+        if opcode is sre_constants.LITERAL and chr(argument).isdecimal():
+            continue
+        if opcode is sre_constants.RANGE and all(
+            chr(code).isdecimal() for code in range(argument[0], argument[1] + 1)
+        ):
+            continue
+        if (
+            opcode is sre_constants.CATEGORY
+            and argument is sre_constants.CATEGORY_DIGIT
+        ):
+            continue
+
+        return set()
+
+    return {DIGIT_REQUIREMENT}
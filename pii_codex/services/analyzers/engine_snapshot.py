@@ -0,0 +1,135 @@
+import json
+import pickle
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import spacy
+from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+from presidio_analyzer.nlp_engine import SpacyNlpEngine
+
+from ...config import DEFAULT_LANG, DEFAULT_TOKEN_REPLACEMENT_VALUE
+from .shared_vectors import load_shared_vectors_model
+
+SNAPSHOT_MODEL_DIRECTORY = "model"
+SNAPSHOT_ENGINE_FILE = "engine.pkl"
+SNAPSHOT_METADATA_FILE = "snapshot.json"
+
+
+def get_snapshot_versions() -> Dict[str, str]:
+    """
+    Versions of the packages a snapshot's pickled recognizers and serialized model depend on
+    @return: Dict[str, str]
+    """
+    return {
+        "presidio_analyzer_version": version("presidio-analyzer"),
+        "spacy_version": spacy.__version__,
+    }
+
+
+def save_engine_snapshot(
+    analyzer_engine: Any,
+    path: Union[str, Path],
+    language_code: str = DEFAULT_LANG,
+    pii_token_replacement_value: str = DEFAULT_TOKEN_REPLACEMENT_VALUE,
+) -> None:
+    """
+    Saves a configured Presidio AnalyzerEngine to a directory: the spaCy model of the language (including its
+    vectors file), the recognizers of the registry as built (e.g. profile filtered or pattern gated), the NER
+    model configuration, and the replacement token of the operators.
+    @param analyzer_engine: AnalyzerEngine
+    @param path: str or Path - directory to save the snapshot to, created if missing
+    @param language_code: str - "en" is default
+    @param pii_token_replacement_value: str - replacement token of the analyzer's operators
+    @return: None
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    analyzer_engine.nlp_engine.nlp[language_code].to_disk(
+        path / SNAPSHOT_MODEL_DIRECTORY
+    )
+
+    with open(path / SNAPSHOT_ENGINE_FILE, "wb") as engine_file:
+        pickle.dump(
+            {
+                "recognizers": analyzer_engine.registry.get_recognizers(
+                    language=language_code, all_fields=True
+                ),
+                "global_regex_flags": analyzer_engine.registry.global_regex_flags,
+                "ner_model_configuration": analyzer_engine.nlp_engine.ner_model_configuration,
+                "default_score_threshold": analyzer_engine.default_score_threshold,
+            },
+            engine_file,
+        )
+
+    with open(path / SNAPSHOT_METADATA_FILE, "w", encoding="utf-8") as metadata_file:
+        json.dump(
+            {
+                "language_code": language_code,
+                "pii_token_replacement_value": pii_token_replacement_value,
+                **get_snapshot_versions(),
+            },
+            metadata_file,
+        )
+
+
+def read_snapshot_metadata(path: Union[str, Path]) -> Dict[str, str]:
+    """
+    Reads the metadata of a snapshot, making sure it was saved with the installed Presidio and spaCy versions
+    @param path: str or Path - snapshot directory
+    @return: Dict[str, str]
+    """
+    metadata_path = Path(path) / SNAPSHOT_METADATA_FILE
+    if not metadata_path.exists():
+        raise Exception(f"No engine snapshot found at '{path}'.")
+
+    with open(metadata_path, encoding="utf-8") as metadata_file:
+        metadata = json.load(metadata_file)
+
+    for package, package_version in get_snapshot_versions().items():
+        if metadata.get(package) != package_version:
+            raise Exception(
+                f"Engine snapshot at '{path}' was saved with {package} {metadata.get(package)} but "
+                f"{package_version} is installed. Save the snapshot again."
+            )
+
+    return metadata
+
+
+def load_engine_snapshot(path: Union[str, Path], shared_vectors: bool = False) -> Any:
+    """
+    Restores a Presidio AnalyzerEngine saved with save_engine_snapshot. The recognizers are unpickled as they
+    were built rather than rebuilt from Presidio's configuration, so only load snapshots you saved yourself.
+    @param path: str or Path - snapshot directory
+    @param shared_vectors: bool - when True, the model's word vectors are memory-mapped read-only from the
+    snapshot rather than read into memory (see SharedVectorsSpacyNlpEngine)
+    @return: AnalyzerEngine
+    """
+    path = Path(path)
+    language_code = read_snapshot_metadata(path)["language_code"]
+    model_path = str(path / SNAPSHOT_MODEL_DIRECTORY)
+
+    with open(path / SNAPSHOT_ENGINE_FILE, "rb") as engine_file:
+        engine_state = pickle.load(engine_file)
+
+    nlp_engine = SpacyNlpEngine(
+        models=[{"lang_code": language_code, "model_name": model_path}],
+        ner_model_configuration=engine_state["ner_model_configuration"],
+    )
+    nlp_engine.nlp = {  # type: ignore
+        language_code: load_shared_vectors_model(model_path)
+        if shared_vectors
+        else spacy.load(model_path)
+    }
+
+    return AnalyzerEngine(
+        registry=RecognizerRegistry(
+            recognizers=engine_state["recognizers"],
+            global_regex_flags=engine_state["global_regex_flags"],
+            supported_languages=[language_code],
+        ),
+        nlp_engine=nlp_engine,
+        supported_languages=[language_code],
+        default_score_threshold=engine_state["default_score_threshold"],
+    )
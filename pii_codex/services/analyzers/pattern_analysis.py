@@ -0,0 +1,309 @@
+# pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments,too-many-boolean-expressions
+import ipaddress
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ...config import (
+    PII_MAPPER,
+    DEFAULT_LANG,
+    DEFAULT_TOKEN_REPLACEMENT_VALUE,
+    DEFAULT_BATCH_SIZE,
+)
+from ...models.analysis import DetectionResultItem
+from ...models.microsoft_presidio_pii import MSFTPresidioPIIType
+from ...utils.sanitizer_util import sanitize_text
+
+# Validators return the score of a candidate match, or None to discard it
+PatternValidator = Callable[[str], Optional[float]]
+
+_EMAIL_PATTERN = re.compile(
+    r"\b((([!#$%&'*+\-/=?^_`{|}~\w])|([!#$%&'*+\-/=?^_`{|}~\w][!#$%&'*+\-/=?^_`{|}~\.\w]{0,}"
+    r"[!#$%&'*+\-/=?^_`{|}~\w]))[@]\w+(?:-+\w+)*(?:\.\w+(?:-+\w+)*)+)\b"
+)
+_PHONE_PATTERN = re.compile(
+    r"(?<![\w+])(?<!\d:)(?:\+\d{1,3}[ .-]?)?(?:\(\d{1,4}\)|\d{1,4})(?:[ .-]?\d{2,4}){2,4}(?!\w|:\d)"
+)
+# Dates (YYYY-MM-DD, DD-MM-YYYY, or MM-DD-YYYY with '-', '.', or '/') a phone number candidate can't start or end with
+_DATE = (
+    r"(?:(?:19|20)\d{2}([-./])(?:0?[1-9]|1[0-2])\1(?:0?[1-9]|[12]\d|3[01])"
+    r"|(?:0?[1-9]|[12]\d|3[01])([-./])(?:0?[1-9]|[12]\d|3[01])\2(?:19|20)\d{2})"
+)
+_DATE_SHAPED_PHONE_PATTERN = re.compile(rf"^{_DATE}(?!\d)|(?<!\d){_DATE}$")
+_SSN_PATTERN = re.compile(r"\b([0-9]{3})[- .]([0-9]{2})[- .]([0-9]{4})\b")
+_CREDIT_CARD_PATTERN = re.compile(
+    r"\b(?!1\d{12}(?!\d))((4\d{3})|(5[0-5]\d{2})|(6\d{3})|(1\d{3})|(3\d{3}))[- ]?(\d{3,4})[- ]?(\d{3,4})"
+    r"[- ]?(\d{3,5})\b"
+)
+_IBAN_PATTERN = re.compile(
+    r"(?<![A-Z0-9])([A-Z]{2}[0-9]{2}(?:[ -]?[A-Z0-9]{4}){2,6})((?:[ -]?[A-Z0-9]{4})?)"
+    r"((?:[ -]?[A-Z0-9]{1,3})?)(?![A-Z0-9])"
+)
+_IPV4_PATTERN = re.compile(
+    r"\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)"
+    r"(?:/(?:[0-2]?\d|3[0-2]))?\b"
+)
+_IPV6_PATTERN = re.compile(
+    r"(?<![\w:])(?:[0-9A-Fa-f]{0,4}:){2,7}(?:[0-9A-Fa-f]{1,4}|(?:\d{1,3}\.){3}\d{1,3})?(?:%\w+)?"
+    r"(?:/\d{1,3})?(?![\w:])"
+)
+
+
+def _validate_email(candidate: str) -> Optional[float]:
+    top_level_domain = candidate.rsplit(".", 1)[-1]
+    # A purely alphabetic top level domain is as good a sign as Presidio's domain validation
+    return 1.0 if top_level_domain.isalpha() and len(top_level_domain) > 1 else 0.5
+
+
+def _validate_phone(candidate: str) -> Optional[float]:
+    digit_count = sum(character.isdigit() for character in candidate)
+    if not 10 <= digit_count <= 15:
+        return None
+
+    # Timestamps (e.g. "2022-01-02 12:30:45") aren't phone numbers. Digits next to a time's ':' are already
+    # left out by the pattern.
+    if _DATE_SHAPED_PHONE_PATTERN.search(candidate):
+        return None
+
+    # Only numbers written as phone numbers count: with a country code, an area code in parentheses, or digit
+    # groups split by separators (not a bare run of digits like an order ID)
+    separator_count = sum(character in " .-" for character in candidate)
+    if candidate.startswith("+") or "(" in candidate or separator_count >= 2:
+        return 0.4
+
+    return None
+
+
+def _validate_ssn(candidate: str) -> Optional[float]:
+    delimiters = {character for character in candidate if not character.isdigit()}
+    digits = "".join(character for character in candidate if character.isdigit())
+
+    if (
+        len(delimiters) > 1
+        or len(set(digits)) == 1
+        or digits[3:5] == "00"
+        or digits[5:] == "0000"
+        or digits[:3] in ("000", "666")
+        or digits in ("123456789", "987654320", "078051120")
+    ):
+        return None
+
+    return 0.5
+
+
+def _validate_credit_card(candidate: str) -> Optional[float]:
+    digits = [int(character) for character in candidate if character.isdigit()]
+    checksum = sum(digits[-1::-2]) + sum(
+        sum(divmod(digit * 2, 10)) for digit in digits[-2::-2]
+    )
+
+    return 1.0 if checksum % 10 == 0 else None
+
+
+def _validate_iban(candidate: str) -> Optional[float]:
+    iban = "".join(character for character in candidate if character.isalnum())
+    rearranged_iban = iban[4:] + iban[:4]
+    numeric_iban = "".join(str(int(character, 36)) for character in rearranged_iban)
+
+    return 1.0 if int(numeric_iban) % 97 == 1 else None
+
+
+def _validate_ip_address(candidate: str) -> Optional[float]:
+    address = candidate.split("/", 1)[0].split("%", 1)[0]
+    if address == "::":
+        return None
+
+    try:
+        ipaddress.ip_address(address)
+    except ValueError:
+        return None
+
+    return 0.6
+
+
+# Entity type (MSFTPresidioPIIType value) -> patterns and the validator scoring their matches
+PATTERN_RECOGNIZERS: Dict[str, List[Tuple[re.Pattern, PatternValidator]]] = {
+    MSFTPresidioPIIType.EMAIL_ADDRESS.value: [(_EMAIL_PATTERN, _validate_email)],
+    MSFTPresidioPIIType.PHONE_NUMBER.value: [(_PHONE_PATTERN, _validate_phone)],
+    MSFTPresidioPIIType.US_SOCIAL_SECURITY_NUMBER.value: [
+        (_SSN_PATTERN, _validate_ssn)
+    ],
+    MSFTPresidioPIIType.CREDIT_CARD_NUMBER.value: [
+        (_CREDIT_CARD_PATTERN, _validate_credit_card)
+    ],
+    MSFTPresidioPIIType.INTERNATIONAL_BANKING_ACCOUNT_NUMBER.value: [
+        (_IBAN_PATTERN, _validate_iban)
+    ],
+    MSFTPresidioPIIType.IP_ADDRESS.value: [
+        (_IPV4_PATTERN, _validate_ip_address),
+        (_IPV6_PATTERN, _validate_ip_address),
+    ],
+}
+
+
+class PatternPIIAnalyzer:
+    """
+    Pattern PII Analyzer - a lightweight analyzer detecting structured identifiers (emails, phone numbers,
+    SSNs, credit cards, IBANs, and IP addresses) with regular expressions and checksums. Neither Presidio nor
+    spaCy is imported, so it runs on the base PII-Codex install and starts in milliseconds.
+    """
+
+    def __init__(
+        self,
+        pii_token_replacement_value: str = DEFAULT_TOKEN_REPLACEMENT_VALUE,
+    ):
+        """
+        PatternPIIAnalyzer constructor.
+        @param pii_token_replacement_value: str to replace detected pii token with (e.g. <REDACTED>)
+        """
+        self.pii_token_replacement_value = pii_token_replacement_value
+
+    @staticmethod
+    def get_supported_entities(language_code: str = DEFAULT_LANG) -> List[str]:
+        """
+        Retrieves the list of entities detected by the analyzer. Patterns are language independent.
+
+        @param language_code: str - defaults to "en"
+        @return: List[str]
+        """
+        return list(PATTERN_RECOGNIZERS)
+
+    def analyze_item(
+        self,
+        text: str,
+        language_code: str = DEFAULT_LANG,
+        entities: List[str] = None,
+        sanitize: bool = True,
+    ) -> Tuple[List[DetectionResultItem], str]:
+        """
+        Detects the structured identifiers of a text. Returns the list of detected items and the sanitized
+        string. Requested entities the analyzer doesn't detect are ignored.
+
+        @param text: str
+        @param language_code: str "en" is default
+        @param entities: List[MSFTPresidioPIIType.value] defaults to all supported entities
+        @param sanitize: bool - when False, detections are not sanitized and an empty string is returned in place
+        of the sanitized string
+        @return: Tuple[List[DetectionResultItem], str]
+        """
+        detection_items = []
+        for entity_type, patterns in PATTERN_RECOGNIZERS.items():
+            if entities and entity_type not in entities:
+                continue
+
+            for pattern, validator in patterns:
+                for match in pattern.finditer(text):
+                    score = validator(match.group())
+                    if score is None:
+                        continue
+
+                    detection_items.append(
+                        DetectionResultItem(
+                            entity_type=PII_MAPPER.convert_msft_presidio_pii_to_common_pii_type(
+                                entity_type
+                            ).name,
+                            score=score,
+                            start=match.start(),
+                            end=match.end(),
+                        )
+                    )
+
+        # Weaker detections within a stronger one (e.g. digit groups of an IBAN read as a phone number) are dropped
+        detection_items = [
+            detection
+            for detection in detection_items
+            if not any(
+                other.start <= detection.start
+                and detection.end <= other.end
+                and other.score > detection.score
+                for other in detection_items
+            )
+        ]
+        detection_items.sort(key=lambda detection: (detection.start, detection.end))
+
+        if not sanitize:
+            return detection_items, ""
+
+        return detection_items, self.sanitize_text(
+            text=text, analysis_items=detection_items
+        )
+
+    def sanitize_text(
+        self,
+        text: str,
+        analysis_items: List[DetectionResultItem],
+        pii_token_replacement_value: Optional[str] = None,
+    ) -> str:
+        """
+        Replaces every detected span with the replacement token. Overlapping spans are resolved as the Presidio
+        analyzer resolves them (see sanitizer_util.sanitize_text).
+        @param text: str
+        @param analysis_items: List[DetectionResultItem]
+        @param pii_token_replacement_value: str - (Optional) replacement token overriding the analyzer's own
+        @return: str
+        """
+        return sanitize_text(
+            text=text,
+            analysis_items=analysis_items,
+            pii_token_replacement_value=self.pii_token_replacement_value
+            if pii_token_replacement_value is None
+            else pii_token_replacement_value,
+        )
+
+    def analyze_items(
+        self,
+        texts: Iterable[str],
+        language_code: str = DEFAULT_LANG,
+        entities: List[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        sanitize: bool = True,
+    ) -> List[Tuple[List[DetectionResultItem], str]]:
+        """
+        Returns the detected items and sanitized string for each text, in order. See iter_analyze_items.
+
+        @param texts: Iterable[str]
+        @param language_code: str "en" is default
+        @param entities: List[MSFTPresidioPIIType.value] defaults to all supported entities
+        @param batch_size: int - unused, kept for parity with PresidioPIIAnalyzer
+        @param n_process: int - unused, kept for parity with PresidioPIIAnalyzer
+        @param sanitize: bool - when False, detections are not sanitized and an empty string is returned in place
+        of the sanitized string
+        @return: List[Tuple[List[DetectionResultItem], str]]
+        """
+        return list(
+            self.iter_analyze_items(
+                texts=texts,
+                language_code=language_code,
+                entities=entities,
+                sanitize=sanitize,
+            )
+        )
+
+    def iter_analyze_items(
+        self,
+        texts: Iterable[str],
+        language_code: str = DEFAULT_LANG,
+        entities: List[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        sanitize: bool = True,
+    ) -> Iterator[Tuple[List[DetectionResultItem], str]]:
+        """
+        Lazily yields the detected items and sanitized string of each text, in order
+
+        @param texts: Iterable[str]
+        @param language_code: str "en" is default
+        @param entities: List[MSFTPresidioPIIType.value] defaults to all supported entities
+        @param batch_size: int - unused, kept for parity with PresidioPIIAnalyzer
+        @param n_process: int - unused, kept for parity with PresidioPIIAnalyzer
+        @param sanitize: bool - when False, detections are not sanitized and an empty string is returned in place
+        of the sanitized string
+        @return: Iterator[Tuple[List[DetectionResultItem], str]]
+        """
+        for text in texts:
+            yield self.analyze_item(
+                text=text,
+                language_code=language_code,
+                entities=entities,
+                sanitize=sanitize,
+            )
@@ -1,55 +1,186 @@
-# pylint: disable=broad-except,unused-argument,import-outside-toplevel,unused-variable
-from typing import List, Tuple
-
-from presidio_anonymizer.entities.engine.recognizer_result import RecognizerResult
-
-from ...config import PII_MAPPER, DEFAULT_LANG, DEFAULT_TOKEN_REPLACEMENT_VALUE
+# pylint: disable=protected-access,broad-except,unused-argument,import-outside-toplevel,unused-variable,too-many-arguments,too-many-positional-arguments,too-many-locals,too-many-instance-attributes,too-many-statements
+import time
+from collections import deque
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ...config import (
+    PII_MAPPER,
+    DEFAULT_LANG,
+    DEFAULT_TOKEN_REPLACEMENT_VALUE,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_SPACY_MODEL,
+)
 from ...models.analysis import DetectionResultItem, DetectionResult
-from ...utils.package_installer_util import install_spacy_package
+from ...utils.cache_util import BaseDetectionCache
 from ...utils.pii_mapping_util import PIIMapper
+from ...utils.prefilter_util import TextPrefilter
+from ...utils.sanitizer_util import get_operators, sanitize_text
+from .analyzer_engine_registry import get_analyzer_engine, get_snapshot_analyzer_engine
 from ...utils.logging import logger
+from ...utils.nlp_pipe_util import (
+    get_disabled_pipe_names,
+    requires_lemmas,
+    requires_ner,
+)
+
+# Sample text touching the NER model and most pattern recognizers, analyzed to warm up an analyzer
+WARM_UP_TEXT = (
+    "John Smith from Seattle (john.smith@example.com, 212-555-5555, https://example.com) paid with card "
+    "4111-1111-1111-1111 on 01/02/2022 from 192.168.0.1, SSN 078-05-1121."
+)
 
 
 class PresidioPIIAnalyzer:
     """
-    Presidio PII Analyzer - a wrapper for the Microsoft Presidio Analyzer and Anonymization functions
+    Presidio PII Analyzer - a wrapper for the Microsoft Presidio Analyzer, sanitizing its detections natively
     """
 
     def __init__(
-        self, pii_token_replacement_value: str = DEFAULT_TOKEN_REPLACEMENT_VALUE
+        self,
+        pii_token_replacement_value: str = DEFAULT_TOKEN_REPLACEMENT_VALUE,
+        detection_cache: Optional[BaseDetectionCache] = None,
+        prefilter: Optional[TextPrefilter] = None,
+        combined_patterns: bool = False,
+        recognizer_names: Optional[Iterable[str]] = None,
+        model_name: str = DEFAULT_SPACY_MODEL,
+        install_missing_model: bool = True,
+        shared_vectors: bool = False,
+        snapshot_path: Optional[Union[str, Path]] = None,
     ):
         """
         Since installing Spacy, the en_core_web_lg model, and the MSFT Presidio package are optional installs
-        the imports are wrapped to prevent any failures
+        the imports are wrapped to prevent any failures. The Presidio analyzer engine (and its spaCy model) is
+        shared process-wide, only the replacement token operators belong to this analyzer.
         @param pii_token_replacement_value: str to replace detected pii token with (e.g. <REDACTED>)
+        @param detection_cache: DetectionCache or SQLiteDetectionCache - (Optional) cache to reuse the detections of
+        repeated texts
+        @param prefilter: TextPrefilter - (Optional) lexical triage skipping the analysis of PII-free texts
+        @param combined_patterns: bool - when True, pattern recognizers are gated by a single combined scan of
+        each text instead of every recognizer scanning the text on its own. Detections are unchanged.
+        @param recognizer_names: Iterable[str] - (Optional) names of the only predefined recognizers to load (see
+        EntityProfile.recognizer_names), defaults to all of them
+        @param model_name: str - spaCy model package (e.g. en_core_web_sm, en_core_web_trf) or path to a model
+        directory, default is en_core_web_lg
+        @param install_missing_model: bool - when False, a missing model package raises an exception instead of
+        being downloaded and installed
+        @param shared_vectors: bool - when True, the model's word vectors are memory-mapped read-only and shared
+        with every other process loading the model this way
+        @param snapshot_path: str or Path - (Optional) directory of an engine snapshot (see save_snapshot) to restore
+        the engine from. The snapshot's model and recognizers take the place of model_name, recognizer_names, and
+        combined_patterns.
         """
+        self.detection_cache = detection_cache
+        self.prefilter = prefilter
+        self._model_versions: Dict[str, str] = {}
+        # Seconds spent on each startup step (engine_load, then warm_up once warmup has run)
+        self.startup_times: Dict[str, float] = {}
 
         try:
-            import spacy
-            from presidio_analyzer import AnalyzerEngine
-            from presidio_anonymizer import AnonymizerEngine
-            from presidio_anonymizer.entities import OperatorConfig
-
-            if not spacy.util.is_package("en_core_web_lg"):
-                # Last resort. Will install the en_core_web_lg package if end-user hadn't already.
-                install_spacy_package("en_core_web_lg")
+            started_at = time.perf_counter()
+            if snapshot_path is not None:
+                self.analyzer = get_snapshot_analyzer_engine(
+                    snapshot_path, shared_vectors=shared_vectors
+                )
+            else:
+                self.analyzer = get_analyzer_engine(
+                    model_name=model_name,
+                    recognizer_names=recognizer_names,
+                    combined_patterns=combined_patterns,
+                    install_missing_model=install_missing_model,
+                    shared_vectors=shared_vectors,
+                )
+            self.startup_times["engine_load"] = time.perf_counter() - started_at
 
-            self.analyzer = AnalyzerEngine()
-            self.anonymizer = AnonymizerEngine()
             self.pii_mapper = PIIMapper()
 
-            self.operators = {
-                "DEFAULT": OperatorConfig(
-                    "replace", {"new_value": pii_token_replacement_value}
-                ),
-                "TITLE": OperatorConfig("redact", {}),
-            }
+            self.pii_token_replacement_value = pii_token_replacement_value
+            self.operators = self.get_operators(pii_token_replacement_value)
 
         except ImportError:
             raise Exception(
                 'Missing dependencies from extras. Install the PII-Codex extras: "detections"'
             )
 
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot_path: Union[str, Path],
+        shared_vectors: bool = False,
+        detection_cache: Optional[BaseDetectionCache] = None,
+        prefilter: Optional[TextPrefilter] = None,
+    ) -> "PresidioPIIAnalyzer":
+        """
+        Restores an analyzer saved with save_snapshot, replacement token (operators) included
+        @param snapshot_path: str or Path - snapshot directory
+        @param shared_vectors: bool - when True, the model's word vectors are memory-mapped read-only from the
+        snapshot
+        @param detection_cache: DetectionCache or SQLiteDetectionCache - (Optional) cache to reuse the detections of
+        repeated texts
+        @param prefilter: TextPrefilter - (Optional) lexical triage skipping the analysis of PII-free texts
+        @return: PresidioPIIAnalyzer
+        """
+        from .engine_snapshot import read_snapshot_metadata
+
+        return cls(
+            pii_token_replacement_value=read_snapshot_metadata(snapshot_path)[
+                "pii_token_replacement_value"
+            ],
+            detection_cache=detection_cache,
+            prefilter=prefilter,
+            shared_vectors=shared_vectors,
+            snapshot_path=snapshot_path,
+        )
+
+    def save_snapshot(
+        self, snapshot_path: Union[str, Path], language_code: str = DEFAULT_LANG
+    ) -> None:
+        """
+        Saves the configured engine (spaCy model and recognizer registry) and the replacement token of this
+        analyzer to a directory, so it can be restored with from_snapshot without rebuilding the engine
+        @param snapshot_path: str or Path - directory to save the snapshot to, created if missing
+        @param language_code: str - "en" is default
+        @return: None
+        """
+        from .engine_snapshot import save_engine_snapshot
+
+        save_engine_snapshot(
+            self.analyzer,
+            snapshot_path,
+            language_code=language_code,
+            pii_token_replacement_value=self.pii_token_replacement_value,
+        )
+
+    def warmup(
+        self, text: str = WARM_UP_TEXT, language_code: str = DEFAULT_LANG
+    ) -> Dict[str, float]:
+        """
+        Analyzes and sanitizes a sample text so the state the engine initializes lazily (e.g. the
+        regexes pattern recognizers compile on first use) is set up before the first real analysis. The detection
+        cache and prefilter are bypassed.
+        @param text: str - sample text, defaults to one touching the NER model and most pattern recognizers
+        @param language_code: str - "en" is default
+        @return: Dict[str, float] - seconds spent on each startup step (see startup_times)
+        """
+        started_at = time.perf_counter()
+        detections = self.analyzer.analyze(text=text, language=language_code)
+        self.sanitize_text(
+            text=text, analysis_items=self.convert_analyzed_item(detections)
+        )
+        self.startup_times["warm_up"] = time.perf_counter() - started_at
+
+        return dict(self.startup_times)
+
+    @staticmethod
+    def get_operators(pii_token_replacement_value: str) -> Dict[str, str]:
+        """
+        Builds the operators replacing detected PII tokens with the given replacement value
+        @param pii_token_replacement_value: str to replace detected pii token with (e.g. <REDACTED>)
+        @return: Dict[str, str] of replacement values by entity type
+        """
+        return get_operators(pii_token_replacement_value)
+
     def get_supported_entities(self, language_code=DEFAULT_LANG) -> List[str]:
         """
         Retrieves a list of supported entities, this will narrow down what is available for a given language
@@ -67,8 +198,33 @@ class PresidioPIIAnalyzer:
         """
         return self.analyzer.get_recognizers(language=language_code)
 
+    def get_model_version(self, language_code: str = DEFAULT_LANG) -> str:
+        """
+        Identifies the Presidio, spaCy, and spaCy model versions producing the detections of a language. Used
+        to keep cached detections from outliving the model that produced them.
+
+        @param language_code: str - defaults to "en"
+        @return: str
+        """
+        if language_code not in self._model_versions:
+            import spacy
+
+            nlp = getattr(self.analyzer.nlp_engine, "nlp", {}).get(language_code)
+            model_meta = nlp.meta if nlp is not None else {}
+            self._model_versions[language_code] = (
+                f"presidio-analyzer-{version('presidio-analyzer')}/spacy-{spacy.__version__}/"
+                f"{model_meta.get('lang', language_code)}_{model_meta.get('name', '')}-"
+                f"{model_meta.get('version', '')}"
+            )
+
+        return self._model_versions[language_code]
+
     def analyze_item(
-        self, text: str, language_code: str = DEFAULT_LANG, entities: List[str] = None
+        self,
+        text: str,
+        language_code: str = DEFAULT_LANG,
+        entities: List[str] = None,
+        sanitize: bool = True,
     ) -> Tuple[List[DetectionResultItem], str]:
         """
         Uses Microsoft Presidio (spaCy module) to analyze given a set of entities to analyze the provided text against.
@@ -78,6 +234,8 @@ class PresidioPIIAnalyzer:
         @param language_code: str "en" is default
         @param entities: str - List[MSFTPresidioPIIType.name]
         @param text: str
+        @param sanitize: bool - when False, detections are not sanitized and an empty string is returned in place
+        of the sanitized string
         @return: Tuple[List[DetectionResultItem], str]
         """
 
@@ -86,14 +244,33 @@ class PresidioPIIAnalyzer:
         if not entities:
             entities = self.get_supported_entities(language_code)
 
+        if self.prefilter is not None and not self.prefilter.needs_analysis(
+            text, entities
+        ):
+            return [], text if sanitize else ""
+
+        cache_key = self._get_cache_key(text, language_code, entities)
+        if cache_key is not None:
+            cached_detection_items = self.detection_cache.get(cache_key)  # type: ignore
+            if cached_detection_items is not None:
+                return cached_detection_items, (
+                    self.sanitize_text(text=text, analysis_items=cached_detection_items)
+                    if sanitize
+                    else ""
+                )
+
         try:
             # Engine Setup - spaCy model setup and PII recognizers
             detections = self.analyzer.analyze(
-                text=text, entities=entities, language=language_code
+                text=text,
+                entities=entities,
+                language=language_code,
+                nlp_artifacts=self._get_nlp_artifacts(text, language_code, entities),
             )
 
         except Exception as ex:
             logger.error(ex)
+            cache_key = None
 
         # Return analyzer results in formatted Analysis Result List object
         detection_items = [
@@ -107,53 +284,138 @@ class PresidioPIIAnalyzer:
             )
             for result in detections
         ]
+
+        if cache_key is not None:
+            self.detection_cache.set(cache_key, detection_items)  # type: ignore
+
+        if not sanitize:
+            return detection_items, ""
+
         return detection_items, self.sanitize_text(
             text=text, analysis_items=detection_items
         )
 
     def sanitize_text(
-        self, text: str, analysis_items: List[DetectionResultItem]
+        self,
+        text: str,
+        analysis_items: List[DetectionResultItem],
+        pii_token_replacement_value: Optional[str] = None,
     ) -> str:
         """
-        Sanitizes the text analyzed with MSFT Presidio's Anonymizer
+        Sanitizes the analyzed text in a single pass, resolving overlapping detections as Presidio's anonymizer
+        does (see sanitizer_util.sanitize_text)
         @param text:
         @param analysis_items:
+        @param pii_token_replacement_value: str - (Optional) replacement token overriding the analyzer's own
         @return:
         """
-        try:
-            # Convert DetectionResultItem back to RecognizerResult for Presidio anonymizer
-
-            recognizer_results = [
-                RecognizerResult(
-                    entity_type=item.entity_type,
-                    start=item.start,
-                    end=item.end,
-                    score=item.score,
-                )
-                for item in analysis_items
-            ]
+        if pii_token_replacement_value is None:
+            return sanitize_text(
+                text=text,
+                analysis_items=analysis_items,
+                pii_token_replacement_value=self.pii_token_replacement_value,
+                operators=self.operators,
+            )
+
+        return sanitize_text(
+            text=text,
+            analysis_items=analysis_items,
+            pii_token_replacement_value=pii_token_replacement_value,
+        )
 
-            anonymization_result = self.anonymizer.anonymize(
-                text=text, analyzer_results=recognizer_results, operators=self.operators
+    def analyze_items(
+        self,
+        texts: Iterable[str],
+        language_code: str = DEFAULT_LANG,
+        entities: List[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        sanitize: bool = True,
+    ) -> List[Tuple[List[DetectionResultItem], str]]:
+        """
+        Batched counterpart of analyze_item. Returns the detected items and sanitized string for each text,
+        in order. See iter_analyze_items.
+
+        @param texts: Iterable[str]
+        @param language_code: str "en" is default
+        @param entities: List[MSFTPresidioPIIType.name] defaults to all possible entities for selected language
+        @param batch_size: int - number of texts spaCy processes per batch
+        @param n_process: int - number of processes spaCy uses for the pipe (default is 1)
+        @param sanitize: bool - when False, detections are not sanitized and an empty string is returned in place
+        of the sanitized string
+        @return: List[Tuple[List[DetectionResultItem], str]]
+        """
+        return list(
+            self.iter_analyze_items(
+                texts=texts,
+                language_code=language_code,
+                entities=entities,
+                batch_size=batch_size,
+                n_process=n_process,
+                sanitize=sanitize,
             )
+        )
 
-            return anonymization_result.text or ""
+    def iter_analyze_items(
+        self,
+        texts: Iterable[str],
+        language_code: str = DEFAULT_LANG,
+        entities: List[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
+        sanitize: bool = True,
+    ) -> Iterator[Tuple[List[DetectionResultItem], str]]:
+        """
+        Lazily streams texts through spaCy's nlp.pipe (as Presidio's BatchAnalyzerEngine does) and yields the
+        detected items and sanitized string of each text, in order. Texts are only pulled from the iterable
+        one batch at a time.
 
-        except Exception as ex:
-            logger.error("An error occurred sanitizing the string")
-            return ""
+        @param texts: Iterable[str]
+        @param language_code: str "en" is default
+        @param entities: List[MSFTPresidioPIIType.name] defaults to all possible entities for selected language
+        @param batch_size: int - number of texts spaCy processes per batch
+        @param n_process: int - number of processes spaCy uses for the pipe (default is 1)
+        @param sanitize: bool - when False, detections are not sanitized and an empty string is returned in place
+        of the sanitized string
+        @return: Iterator[Tuple[List[DetectionResultItem], str]]
+        """
+
+        if not entities:
+            entities = self.get_supported_entities(language_code)
+
+        for text, detection_items in self._iter_detections(
+            texts=texts,
+            language_code=language_code,
+            entities=entities,
+            batch_size=batch_size,
+            n_process=n_process,
+        ):
+            if not sanitize:
+                yield detection_items, ""
+                continue
+
+            yield detection_items, self.sanitize_text(
+                text=text, analysis_items=detection_items
+            )
 
     def analyze_collection(
-        self, texts: List[str], language_code: str = "en", entities: List[str] = None
+        self,
+        texts: List[str],
+        language_code: str = "en",
+        entities: List[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        n_process: int = 1,
     ) -> List[DetectionResult]:
         """
         Uses Microsoft Presidio (spaCy module) to analyze given a set of entities to analyze the provided text against.
         Will log an error if the identifier or entity recognizer is not added to Presidio's base recognizers or
-        a custom recognizer created.
+        a custom recognizer created. Texts are processed in batches with spaCy's nlp.pipe.
 
         @param language_code: str "en" is default
         @param entities: List[MSFTPresidioPIIType.name] defaults to all possible entities for selected language
         @param texts: List[str]
+        @param batch_size: int - number of texts spaCy processes per batch
+        @param n_process: int - number of processes spaCy uses for the pipe (default is 1)
         @return: List[DetectionResult]
         """
 
@@ -162,35 +424,289 @@ class PresidioPIIAnalyzer:
             if not entities:
                 entities = self.get_supported_entities(language_code)
 
-            # Engine Setup - spaCy model setup and PII recognizers
-            for i, text in enumerate(texts):
-                text_analysis = self.analyzer.analyze(
-                    text=text, entities=entities, language=language_code
-                )
-
-                # Every analysis by the analyzer will have a set of detections within
-                detections = [
-                    DetectionResultItem(
-                        entity_type=PII_MAPPER.convert_msft_presidio_pii_to_common_pii_type(
-                            result.entity_type
-                        ).name,
-                        score=result.score,
-                        start=result.start,
-                        end=result.end,
+            # Every analysis by the analyzer will have a set of detections within
+            detection_results = [
+                DetectionResult(index=i, detections=detections)
+                for i, (_, detections) in enumerate(
+                    self._iter_detections(
+                        texts=texts,
+                        language_code=language_code,
+                        entities=entities,
+                        batch_size=batch_size,
+                        n_process=n_process,
                     )
-                    for result in text_analysis
-                ]
-                detection_results.append(
-                    DetectionResult(index=i, detections=detections)
                 )
-
-            # Return analyzer results in formatted Analysis Result List object
+            ]
 
         except Exception as ex:
             logger.error(ex)
 
         return detection_results
 
+    def _iter_detections(
+        self,
+        texts: Iterable[str],
+        language_code: str,
+        entities: List[str],
+        batch_size: int,
+        n_process: int,
+    ) -> Iterator[Tuple[str, List[DetectionResultItem]]]:
+        """
+        Runs the NLP engine over the texts in batches and yields each text with its converted Presidio results.
+        With a detection cache, cached texts skip the NLP engine and repeated texts are only analyzed once.
+        With a prefilter, texts it deems PII-free skip the NLP engine without detections. At most batch_size
+        skipped texts are held at once, so streams of repeated or PII-free texts stay lazy.
+
+        @param texts: Iterable[str]
+        @param language_code: str
+        @param entities: List[MSFTPresidioPIIType.name]
+        @param batch_size: int
+        @param n_process: int
+        @return: Iterator[Tuple[str, List[DetectionResultItem]]]
+        """
+        if self.detection_cache is None and self.prefilter is None:
+            for text, detection_items in self._iter_nlp_detections(
+                texts=texts,
+                language_code=language_code,
+                entities=entities,
+                batch_size=batch_size,
+                n_process=n_process,
+            ):
+                yield text, detection_items or []
+            return
+
+        detection_cache = self.detection_cache
+        prefilter = self.prefilter
+        model_version = self.get_model_version(language_code)
+
+        # Every text gets a [text, detections, skipped] slot, yielded in input order once its detections are known
+        pending_slots: Deque[List] = deque()
+        # Slots awaiting each text sent to the NLP engine (a text and its in-flight duplicates), in send order
+        analyzed_slots: Deque[List[List]] = deque()
+        # Slots awaiting the detections of an in-flight text, by cache key
+        in_flight: Dict[str, List[List]] = {}
+        input_texts = map(str, texts)
+        # Pending slots whose text was not sent to the NLP engine (prefiltered, cached, or duplicate)
+        skipped_count = 0
+        input_exhausted = False
+
+        def iter_texts_to_analyze() -> Iterator[str]:
+            nonlocal skipped_count, input_exhausted
+
+            # Stops reading input once batch_size skipped texts are pending, so they're yielded (once the
+            # texts before them are analyzed) rather than buffered until the NLP engine gets another text
+            while skipped_count < batch_size:
+                text = next(input_texts, None)
+                if text is None:
+                    input_exhausted = True
+                    return
+
+                slot: List[Any] = [text, None, False]
+                pending_slots.append(slot)
+
+                if prefilter is not None and not prefilter.needs_analysis(
+                    text, entities
+                ):
+                    slot[1:] = [[], True]
+                    skipped_count += 1
+                    continue
+
+                if detection_cache is None:
+                    analyzed_slots.append([slot])
+                    yield text
+                    continue
+
+                cache_key = detection_cache.get_key(
+                    text, language_code, entities, model_version
+                )
+                if cache_key in in_flight:
+                    in_flight[cache_key].append(slot)
+                    slot[2] = True
+                    skipped_count += 1
+                    continue
+
+                slot[1] = detection_cache.get(cache_key)
+                if slot[1] is None:
+                    in_flight[cache_key] = [slot]
+                    analyzed_slots.append(in_flight[cache_key])
+                    yield text
+                    continue
+
+                slot[2] = True
+                skipped_count += 1
+
+        def iter_resolved_slots() -> Iterator[Tuple[str, List[DetectionResultItem]]]:
+            nonlocal skipped_count
+
+            while pending_slots and pending_slots[0][1] is not None:
+                text, detection_items, skipped = pending_slots.popleft()
+                skipped_count -= skipped
+                yield text, detection_items
+
+        # The NLP engine is restarted over the rest of the input whenever reading stopped on skipped texts
+        while not input_exhausted:
+            for text, detection_items in self._iter_nlp_detections(
+                texts=iter_texts_to_analyze(),
+                language_code=language_code,
+                entities=entities,
+                batch_size=batch_size,
+                n_process=n_process,
+            ):
+                if detection_cache is not None:
+                    cache_key = detection_cache.get_key(
+                        text, language_code, entities, model_version
+                    )
+                    in_flight.pop(cache_key, None)
+                    if detection_items is not None:
+                        detection_cache.set(cache_key, detection_items)
+
+                for slot in analyzed_slots.popleft():
+                    slot[1] = list(detection_items or [])
+
+                yield from iter_resolved_slots()
+
+            yield from iter_resolved_slots()
+
+    def _iter_nlp_detections(
+        self,
+        texts: Iterable[str],
+        language_code: str,
+        entities: List[str],
+        batch_size: int,
+        n_process: int,
+    ) -> Iterator[Tuple[str, Optional[List[DetectionResultItem]]]]:
+        """
+        Runs the NLP engine over the texts in batches and yields each text with its converted Presidio results.
+        A text failing analysis is logged and yielded with None detections so the stream stays aligned.
+
+        @param texts: Iterable[str]
+        @param language_code: str
+        @param entities: List[MSFTPresidioPIIType.name]
+        @param batch_size: int
+        @param n_process: int
+        @return: Iterator[Tuple[str, Optional[List[DetectionResultItem]]]]
+        """
+        for text, nlp_artifacts in self._iter_nlp_artifacts(
+            texts=texts,
+            language_code=language_code,
+            entities=entities,
+            batch_size=batch_size,
+            n_process=n_process,
+        ):
+            detection_items = None
+            try:
+                detection_items = self.convert_analyzed_item(
+                    self.analyzer.analyze(
+                        text=text,
+                        entities=entities,
+                        language=language_code,
+                        nlp_artifacts=nlp_artifacts,
+                    )
+                )
+            except Exception as ex:
+                logger.error(ex)
+
+            yield text, detection_items
+
+    def _get_nlp_artifacts(self, text: str, language_code: str, entities: List[str]):
+        """
+        Runs the spaCy pipeline over a single text, skipping the components the requested entities don't need
+        (see get_disabled_pipe_names)
+        @param text: str
+        @param language_code: str
+        @param entities: List[MSFTPresidioPIIType.name]
+        @return: NlpArtifacts
+        """
+        nlp = getattr(self.analyzer.nlp_engine, "nlp", {}).get(language_code)
+        if nlp is None:
+            return self.analyzer.nlp_engine.process_text(text, language_code)
+
+        return self.analyzer.nlp_engine._doc_to_nlp_artifact(
+            nlp(
+                text,
+                disable=self._get_disabled_pipe_names(nlp, language_code, entities),
+            ),
+            language_code,
+        )
+
+    def _iter_nlp_artifacts(
+        self,
+        texts: Iterable[str],
+        language_code: str,
+        entities: List[str],
+        batch_size: int,
+        n_process: int,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Streams the texts through spaCy's nlp.pipe, skipping the components the requested entities don't need
+        (see get_disabled_pipe_names), and yields each text with its NLP artifacts
+        @param texts: Iterable[str]
+        @param language_code: str
+        @param entities: List[MSFTPresidioPIIType.name]
+        @param batch_size: int
+        @param n_process: int
+        @return: Iterator[Tuple[str, NlpArtifacts]]
+        """
+        nlp = getattr(self.analyzer.nlp_engine, "nlp", {}).get(language_code)
+        if nlp is None:
+            yield from self.analyzer.nlp_engine.process_batch(
+                texts=texts,
+                language=language_code,
+                batch_size=batch_size,
+                n_process=n_process,
+            )
+            return
+
+        for doc in nlp.pipe(
+            (str(text) for text in texts),
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=self._get_disabled_pipe_names(nlp, language_code, entities),
+        ):
+            yield doc.text, self.analyzer.nlp_engine._doc_to_nlp_artifact(
+                doc, language_code
+            )
+
+    def _get_disabled_pipe_names(
+        self, nlp, language_code: str, entities: List[str]
+    ) -> Tuple[str, ...]:
+        """
+        Lists the spaCy components the requested entities don't need (see get_disabled_pipe_names). The
+        components lemmas depend on are kept when any of their recognizers has context words, so context
+        enhancement scores are the same as with the full pipeline.
+        @param nlp: spacy.Language
+        @param language_code: str
+        @param entities: List[MSFTPresidioPIIType.name]
+        @return: Tuple[str, ...] of component names
+        """
+        return get_disabled_pipe_names(
+            nlp,
+            ner=requires_ner(entities),
+            lemmas=requires_lemmas(
+                self.analyzer.registry.recognizers, language_code, entities
+            ),
+        )
+
+    def _get_cache_key(
+        self, text: str, language_code: str, entities: List[str]
+    ) -> Optional[str]:
+        """
+        Builds the detection cache key of a text, if a detection cache is in use
+        @param text: str
+        @param language_code: str
+        @param entities: List[MSFTPresidioPIIType.name]
+        @return: str or None without a detection cache
+        """
+        if self.detection_cache is None:
+            return None
+
+        return self.detection_cache.get_key(
+            text=text,
+            language_code=language_code,
+            entities=entities,
+            model_version=self.get_model_version(language_code),
+        )
+
     @classmethod
     def convert_analyzed_item(cls, pii_detection) -> List[DetectionResultItem]:
         """
@@ -0,0 +1,43 @@
+from pathlib import Path
+from typing import Any
+
+import numpy
+import spacy
+from presidio_analyzer.nlp_engine import SpacyNlpEngine
+
+
+class SharedVectorsSpacyNlpEngine(SpacyNlpEngine):
+    """
+    Presidio spaCy NLP engine whose models read their word vectors from a read-only memory map of the model's
+    own vectors file instead of a private copy. Every process loading a model this way (e.g. the workers of a
+    collection analysis) shares one physical copy of the vectors through the OS page cache.
+    """
+
+    def load(self) -> None:
+        """
+        Loads the spaCy model of every language with memory-mapped word vectors
+        @return: None
+        """
+        self.nlp = {  # type: ignore
+            model["lang_code"]: load_shared_vectors_model(model["model_name"])
+            for model in self.models
+        }
+
+
+def load_shared_vectors_model(model_name: str) -> Any:
+    """
+    Loads a spaCy model without reading its vectors table into memory, then maps the table from the model's
+    vectors file (a .npy array) read-only. Models without a vectors file are loaded as they are.
+    @param model_name: str - spaCy model package or path to a model directory
+    @return: spacy.Language
+    """
+    nlp = spacy.load(model_name, exclude=["vectors"])
+    vocab_path = Path(nlp.path) / "vocab"
+
+    if (vocab_path / "vectors").exists():
+        vectors = nlp.vocab.vectors
+        # The table is set before the keys, so rows are known to be in use when the keys are read
+        vectors.data = numpy.load(vocab_path / "vectors", mmap_mode="r")
+        vectors.from_disk(vocab_path, exclude=("strings", "vectors"))
+
+    return nlp
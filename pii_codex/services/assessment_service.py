@@ -29,12 +29,7 @@ class PIIAssessmentService:
         enum (e.g. ["PHONE_NUMBER", "US_SOCIAL_SECURITY_NUMBER"])
         @return: List[RiskAssessment]
         """
-        ranked_pii: List[RiskAssessment] = []
-
-        for pii_type in detected_pii_types:
-            ranked_pii.append(PII_MAPPER.map_pii_type(pii_type))
-
-        return ranked_pii
+        return PII_MAPPER.map_pii_types(detected_pii_types)
 
     @staticmethod
     def calculate_risk_assessment_score_average(
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+
+from ..models.analysis import DetectionResultItem
+
+
+class BaseDetectionCache:
+    """
+    Cache of text detections. Entries are keyed on a content hash of the text along with the language,
+    entity set, and model version the detections were produced with.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        raise Exception("Not implemented yet")
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def get_key(
+        text: str,
+        language_code: str,
+        entities: Iterable[str],
+        model_version: str = "",
+    ) -> str:
+        """
+        Builds the cache key of a text. The entity set is order independent.
+
+        @param text: str - analyzed text
+        @param language_code: str
+        @param entities: Iterable[str] - entities the text is analyzed for
+        @param model_version: str - version of the analyzer and model producing the detections
+        @return: str
+        """
+        text_hash = hashlib.blake2b(digest_size=16)
+        for part in (text, language_code, ",".join(sorted(entities)), model_version):
+            encoded_part = part.encode("utf-8")
+            # Length prefixes keep the parts from bleeding into one another
+            text_hash.update(len(encoded_part).to_bytes(8, "little"))
+            text_hash.update(encoded_part)
+
+        return text_hash.hexdigest()
+
+    def get(self, key: str) -> Optional[List[DetectionResultItem]]:
+        """
+        Retrieves the detections cached under a key
+        @param key: str
+        @return: List[DetectionResultItem] or None when the key is not cached
+        """
+        raise Exception("Not implemented yet")
+
+    def set(self, key: str, detections: List[DetectionResultItem]) -> None:
+        """
+        Caches the detections of a key
+        @param key: str
+        @param detections: List[DetectionResultItem]
+        @return: None
+        """
+        raise Exception("Not implemented yet")
+
+    def clear(self) -> None:
+        """
+        Drops every cached entry and resets the hit and miss counters
+        @return: None
+        """
+        raise Exception("Not implemented yet")
+
+
+class DetectionCache(BaseDetectionCache):
+    """
+    Bounded, in-process cache of text detections. The least recently used entry is evicted once the
+    cache is full.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        DetectionCache constructor.
+        @param max_size: int - max number of texts to hold detections for
+        """
+        if not isinstance(max_size, int) or max_size < 1:
+            raise Exception("'max_size' param must be a positive integer.")
+
+        super().__init__()
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[DetectionResultItem, ...]]" = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        # Only the configuration is pickled, so spawned worker processes start with their own empty cache
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)  # type: ignore
+
+    def get(self, key: str) -> Optional[List[DetectionResultItem]]:
+        """
+        Retrieves the detections cached under a key, marking the entry as recently used
+        @param key: str
+        @return: List[DetectionResultItem] or None when the key is not cached
+        """
+        with self._lock:
+            detections = self._entries.get(key)
+            if detections is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(detections)
+
+    def set(self, key: str, detections: List[DetectionResultItem]) -> None:
+        """
+        Caches the detections of a key, evicting the least recently used entry when full
+        @param key: str
+        @param detections: List[DetectionResultItem]
+        @return: None
+        """
+        with self._lock:
+            self._entries[key] = tuple(detections)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops every cached entry and resets the hit and miss counters
+        @return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class SQLiteDetectionCache(BaseDetectionCache):
+    """
+    Persistent cache of text detections stored in a local SQLite file, so reruns over the same corpus can
+    reuse the detections of earlier runs. The database runs in WAL mode, letting several worker processes
+    read it while another one writes. As the Presidio, spaCy, and spaCy model versions are part of every
+    key, detections are never reused across upgrades.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        SQLiteDetectionCache constructor. The database file and table are created when first used.
+        @param path: str - path of the SQLite database file
+        @param timeout: float - seconds to wait on a database locked by another writer
+        """
+        super().__init__()
+        self.path = path
+        self.timeout = timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                self._get_connection()
+                .execute("SELECT COUNT(*) FROM detections")
+                .fetchone()[0]
+            )
+
+    def __getstate__(self) -> dict:
+        # Connections cannot be shared across processes, every worker process opens its own
+        return {"path": self.path, "timeout": self.timeout}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)  # type: ignore
+
+    def get(self, key: str) -> Optional[List[DetectionResultItem]]:
+        """
+        Retrieves the detections cached under a key
+        @param key: str
+        @return: List[DetectionResultItem] or None when the key is not cached
+        """
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute("SELECT detections FROM detections WHERE key = ?", (key,))
+                .fetchone()
+            )
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return [DetectionResultItem(**detection) for detection in json.loads(row[0])]
+
+    def set(self, key: str, detections: List[DetectionResultItem]) -> None:
+        """
+        Caches the detections of a key
+        @param key: str
+        @param detections: List[DetectionResultItem]
+        @return: None
+        """
+        serialized_detections = json.dumps(
+            [detection.__dict__ for detection in detections]
+        )
+
+        with self._lock:
+            self._get_connection().execute(
+                "INSERT OR REPLACE INTO detections (key, detections) VALUES (?, ?)",
+                (key, serialized_detections),
+            )
+
+    def clear(self) -> None:
+        """
+        Drops every cached entry and resets the hit and miss counters
+        @return: None
+        """
+        with self._lock:
+            self._get_connection().execute("DELETE FROM detections")
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """
+        Closes the database connection of the current process. It is reopened when the cache is next used.
+        @return: None
+        """
+        with self._lock:
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+
+            self._connection = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Opens the database connection of the current process. A connection inherited from a parent process
+        (e.g. by a forked worker) is never reused.
+        @return: sqlite3.Connection
+        """
+        if self._connection is None or self._connection_pid != os.getpid():
+            # Autocommit mode keeps every write transaction, and therefore the write lock, short
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS detections (key TEXT PRIMARY KEY, detections TEXT NOT NULL)"
+            )
+
+            self._connection = connection
+            self._connection_pid = os.getpid()
+
+        return self._connection
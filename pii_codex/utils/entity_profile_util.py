@@ -0,0 +1,167 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Tuple, Union
+
+from ..models.microsoft_presidio_pii import MSFTPresidioPIIType
+
+# Every entity the Presidio analyzer is asked for when no profile is given (aliases of the enum removed)
+ALL_PRESIDIO_ENTITIES: Tuple[str, ...] = tuple(
+    dict.fromkeys(pii_type.value for pii_type in MSFTPresidioPIIType)
+)
+
+# Name of the recognizer Presidio builds around the NLP engine (spaCy NER)
+NLP_RECOGNIZER_NAME = "SpacyRecognizer"
+
+# Predefined Presidio recognizers detecting each entity
+PRESIDIO_ENTITY_RECOGNIZERS: Dict[str, Tuple[str, ...]] = {
+    "PHONE_NUMBER": ("PhoneRecognizer",),
+    "EMAIL_ADDRESS": ("EmailRecognizer",),
+    "ABA_ROUTING_NUMBER": ("AbaRoutingRecognizer",),
+    "IP_ADDRESS": ("IpRecognizer",),
+    "DATE_TIME": ("DateRecognizer", NLP_RECOGNIZER_NAME),
+    "LOCATION": (NLP_RECOGNIZER_NAME,),
+    "AGE": (),
+    "PERSON": (NLP_RECOGNIZER_NAME,),
+    "CREDIT_CARD": ("CreditCardRecognizer",),
+    "CRYPTO": ("CryptoRecognizer",),
+    "URL": ("UrlRecognizer",),
+    "NRP": (NLP_RECOGNIZER_NAME,),
+    "MEDICAL_LICENSE": ("MedicalLicenseRecognizer",),
+    "US_SSN": ("UsSsnRecognizer",),
+    "US_BANK_NUMBER": ("UsBankRecognizer",),
+    "US_DRIVER_LICENSE": ("UsLicenseRecognizer",),
+    "US_PASSPORT": ("UsPassportRecognizer",),
+    "US_ITIN": ("UsItinRecognizer",),
+    "IBAN_CODE": ("IbanRecognizer",),
+    "AU_ABN": ("AuAbnRecognizer",),
+    "AU_ACN": ("AuAcnRecognizer",),
+    "AU_MEDICARE": ("AuMedicareRecognizer",),
+    "AU_TFN": ("AuTfnRecognizer",),
+    "MAC_ADDRESS": ("MacAddressRecognizer",),
+    "US_MBI": ("UsMbiRecognizer",),
+    "UK_NHS": ("NhsRecognizer",),
+    "UK_NINO": ("UkNinoRecognizer",),
+    "ES_NIF": ("EsNifRecognizer",),
+    "ES_NIE": ("EsNieRecognizer",),
+    "IT_FISCAL_CODE": ("ItFiscalCodeRecognizer",),
+    "IT_DRIVER_LICENSE": ("ItDriverLicenseRecognizer",),
+    "IT_VAT_CODE": ("ItVatCodeRecognizer",),
+    "IT_PASSPORT": ("ItPassportRecognizer",),
+    "IT_IDENTITY_CARD": ("ItIdentityCardRecognizer",),
+    "PL_PESEL": ("PlPeselRecognizer",),
+    "SG_NRIC_FIN": ("SgFinRecognizer",),
+    "SG_UEN": ("SgUenRecognizer",),
+    "IN_PAN": ("InPanRecognizer",),
+    "IN_AADHAAR": ("InAadhaarRecognizer",),
+    "IN_VEHICLE_REGISTRATION": ("InVehicleRegistrationRecognizer",),
+    "IN_VOTER": ("InVoterRecognizer",),
+    "IN_PASSPORT": ("InPassportRecognizer",),
+    "IN_GSTIN": ("InGstinRecognizer",),
+    "FI_PERSONAL_IDENTITY_CODE": ("FiPersonalIdentityCodeRecognizer",),
+    "KR_DRIVER_LICENSE": ("KrDriverLicenseRecognizer",),
+    "KR_FRN": ("KrFrnRecognizer",),
+    "KR_PASSPORT": ("KrPassportRecognizer",),
+    "KR_BRN": ("KrBrnRecognizer",),
+    "KR_RRN": ("KrRrnRecognizer",),
+    "TH_TNIN": ("ThTninRecognizer",),
+}
+
+
+def get_recognizer_names(entities: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Lists the predefined Presidio recognizers needed to detect a set of entities
+    @param entities: Iterable[str] - MSFTPresidioPIIType values
+    @return: Tuple[str, ...] of recognizer names
+    """
+    return tuple(
+        sorted(
+            {
+                recognizer_name
+                for entity in entities
+                for recognizer_name in PRESIDIO_ENTITY_RECOGNIZERS.get(entity, ())
+            }
+        )
+    )
+
+
+@dataclass(frozen=True)
+class EntityProfile:
+    """
+    Named set of entities to detect. Only the Presidio recognizers of those entities are loaded and run.
+    """
+
+    name: str
+    entities: Tuple[str, ...]
+    recognizer_names: Tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "recognizer_names", get_recognizer_names(self.entities)
+        )
+
+
+_NER_ENTITIES = ("PERSON", "LOCATION", "NRP", "DATE_TIME")
+_CONTACT_ENTITIES = ("EMAIL_ADDRESS", "PHONE_NUMBER", "URL")
+
+ENTITY_PROFILES: Dict[str, EntityProfile] = {
+    profile.name: profile
+    for profile in [
+        EntityProfile(
+            name="us-core",
+            entities=_NER_ENTITIES
+            + _CONTACT_ENTITIES
+            + (
+                "IP_ADDRESS",
+                "CREDIT_CARD",
+                "ABA_ROUTING_NUMBER",
+                "MEDICAL_LICENSE",
+                "US_SSN",
+                "US_BANK_NUMBER",
+                "US_DRIVER_LICENSE",
+                "US_PASSPORT",
+                "US_ITIN",
+            ),
+        ),
+        EntityProfile(
+            name="eu-gdpr",
+            entities=_NER_ENTITIES
+            + _CONTACT_ENTITIES
+            + (
+                "IP_ADDRESS",
+                "MAC_ADDRESS",
+                "CREDIT_CARD",
+                "IBAN_CODE",
+                "CRYPTO",
+                "UK_NHS",
+                "UK_NINO",
+                "ES_NIF",
+                "ES_NIE",
+                "IT_FISCAL_CODE",
+                "IT_DRIVER_LICENSE",
+                "IT_VAT_CODE",
+                "IT_PASSPORT",
+                "IT_IDENTITY_CARD",
+                "PL_PESEL",
+                "FI_PERSONAL_IDENTITY_CODE",
+            ),
+        ),
+        EntityProfile(name="contact-only", entities=_CONTACT_ENTITIES),
+    ]
+}
+
+
+def get_entity_profile(entity_profile: Union[str, EntityProfile]) -> EntityProfile:
+    """
+    Retrieves a precomputed entity profile by name. EntityProfile instances are returned as they are, so custom
+    profiles can be used anywhere a profile name is accepted.
+    @param entity_profile: str name of a profile in ENTITY_PROFILES or an EntityProfile
+    @return: EntityProfile
+    """
+    if isinstance(entity_profile, EntityProfile):
+        return entity_profile
+
+    if entity_profile not in ENTITY_PROFILES:
+        raise Exception(
+            f"Unknown entity profile '{entity_profile}'. Supported profiles: {', '.join(ENTITY_PROFILES)}."
+        )
+
+    return ENTITY_PROFILES[entity_profile]
@@ -0,0 +1,82 @@
+from typing import Any, Iterable, List, Optional, Tuple
+
+from .prefilter_util import NER_ENTITIES
+
+# spaCy components Presidio's NER recognizer never reads
+NER_UNUSED_PIPES = frozenset(
+    ["parser", "senter", "tagger", "morphologizer", "attribute_ruler", "lemmatizer"]
+)
+
+# spaCy components the lemmas matched against Presidio's context words depend on (rule-based lemmatizers read
+# the part-of-speech tags mapped by the attribute ruler)
+LEMMA_PIPES = frozenset(["tagger", "morphologizer", "attribute_ruler", "lemmatizer"])
+
+
+def requires_ner(entities: Optional[Iterable[str]]) -> bool:
+    """
+    Checks whether any of the requested entities comes from spaCy's NER model
+    @param entities: Iterable[str] - MSFTPresidioPIIType values, None or empty for all entities
+    @return: bool
+    """
+    if not entities:
+        return True
+
+    return any(entity in NER_ENTITIES for entity in entities)
+
+
+def requires_lemmas(
+    recognizers: Iterable[Any], language_code: str, entities: Optional[Iterable[str]]
+) -> bool:
+    """
+    Checks whether any recognizer of the requested entities has context words, which Presidio's context
+    enhancement matches against lemmas
+    @param recognizers: Iterable[EntityRecognizer] - Presidio recognizers loaded by the analyzer
+    @param language_code: str
+    @param entities: Iterable[str] - MSFTPresidioPIIType values, None or empty for all entities
+    @return: bool
+    """
+    requested_entities = set(entities or [])
+
+    return any(
+        getattr(recognizer, "context", None)
+        for recognizer in recognizers
+        if recognizer.supported_language == language_code
+        and (
+            not requested_entities
+            or requested_entities.intersection(recognizer.supported_entities)
+        )
+    )
+
+
+def get_disabled_pipe_names(
+    nlp: Any, ner: bool, lemmas: bool = False
+) -> Tuple[str, ...]:
+    """
+    Lists the pipeline components to skip when running a spaCy model for Presidio. Without NER, only the
+    tokenizer runs. With NER, the components it doesn't depend on are skipped. When lemmas are needed, the
+    components they depend on are kept either way. Shared embedding layers (tok2vec, transformer) are skipped
+    once every component listening to them is skipped.
+    @param nlp: spacy.Language
+    @param ner: bool - whether named entities are needed
+    @param lemmas: bool - whether lemmas are needed (see requires_lemmas)
+    @return: Tuple[str, ...] of component names
+    """
+    unused_pipes = NER_UNUSED_PIPES if ner else frozenset(nlp.pipe_names)
+    kept_pipes = LEMMA_PIPES if lemmas else frozenset()
+
+    disabled: List[str] = [
+        name
+        for name in nlp.pipe_names
+        if name in unused_pipes and name not in kept_pipes
+    ]
+    for name, component in nlp.pipeline:
+        listeners = getattr(component, "listening_components", None)
+        if listeners is None:
+            continue
+
+        if not set(listeners).issubset(disabled):
+            disabled = [pipe_name for pipe_name in disabled if pipe_name != name]
+        elif name not in disabled:
+            disabled.append(name)
+
+    return tuple(disabled)
@@ -3,10 +3,16 @@ import sys
 
 # Wheel URL for fallback when "spacy download" fails (e.g. uv venv without pip)
 SPACY_MODEL_URLS = {
-    "en_core_web_lg": (
+    model_name: (
         "https://github.com/explosion/spacy-models/releases/download/"
-        "en_core_web_lg-3.8.0/en_core_web_lg-3.8.0-py3-none-any.whl"
-    ),
+        f"{model_name}-3.8.0/{model_name}-3.8.0-py3-none-any.whl"
+    )
+    for model_name in [
+        "en_core_web_sm",
+        "en_core_web_md",
+        "en_core_web_lg",
+        "en_core_web_trf",
+    ]
 }
 
 
@@ -1,5 +1,6 @@
 # pylint: disable=broad-except, unused-variable, no-else-return
-from typing import Optional
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional
 
 from pii_codex.models.aws_pii import AWSComprehendPIIType
 from pii_codex.models.azure_pii import AzureDetectionType
@@ -12,7 +13,43 @@ from pii_codex.models.common import (
 from pii_codex.models.analysis import RiskAssessment
 from pii_codex.models.microsoft_presidio_pii import MSFTPresidioPIIType
 
-from pii_codex.services.pii_type_mappings import get_pii_mapping
+from pii_codex.services.pii_type_mappings import (
+    PII_TYPE_MAPPINGS,
+    PIIMapping,
+)
+
+RISK_LEVEL_DEFINITIONS: Mapping[RiskLevel, str] = {
+    RiskLevel.LEVEL_ONE: RiskLevelDefinition.LEVEL_ONE.value,
+    RiskLevel.LEVEL_TWO: RiskLevelDefinition.LEVEL_TWO.value,
+    RiskLevel.LEVEL_THREE: RiskLevelDefinition.LEVEL_THREE.value,
+}
+
+
+def _build_risk_assessment(pii_type: str, mapping: PIIMapping) -> RiskAssessment:
+    """
+    Builds the RiskAssessment of a PII type mapping
+    @param pii_type: str
+    @param mapping: PIIMapping
+    @return: RiskAssessment
+    """
+    return RiskAssessment(
+        pii_type_detected=pii_type,
+        risk_level=mapping.risk_level.value,
+        risk_level_definition=RISK_LEVEL_DEFINITIONS[mapping.risk_level],
+        cluster_membership_type=mapping.cluster_membership_type.value,
+        hipaa_category=mapping.hipaa_category.value,
+        dhs_category=mapping.dhs_category.value,
+        nist_category=mapping.nist_category.value,
+    )
+
+
+# One immutable RiskAssessment per PII type, built once at load time and shared by every assessment of that type
+RISK_ASSESSMENTS: Mapping[str, RiskAssessment] = MappingProxyType(
+    {
+        pii_type: _build_risk_assessment(pii_type, mapping)
+        for pii_type, mapping in PII_TYPE_MAPPINGS.items()
+    }
+)
 
 
 class PIIMapper:
@@ -29,35 +66,40 @@ class PIIMapper:
         Maps the PII Type to a full RiskAssessment including categories it belongs to, risk level, and
         its location in the text. This cross-references some of the types listed by Milne et al. (2016)
 
+        The precomputed RiskAssessment of the type is returned, which is shared by every assessment of that
+        type. Assessments are frozen, so derive a modified one with dataclasses.replace.
+
         @param pii_type:
         @return:
         """
 
         try:
-            mapping = get_pii_mapping(pii_type)
-
-            # Get the risk level definition string based on the risk level
-            risk_level_to_definition = {
-                RiskLevel.LEVEL_ONE: RiskLevelDefinition.LEVEL_ONE.value,
-                RiskLevel.LEVEL_TWO: RiskLevelDefinition.LEVEL_TWO.value,
-                RiskLevel.LEVEL_THREE: RiskLevelDefinition.LEVEL_THREE.value,
-            }
-            risk_level_definition = risk_level_to_definition[mapping.risk_level]
-
-            return RiskAssessment(
-                pii_type_detected=pii_type,
-                risk_level=mapping.risk_level.value,
-                risk_level_definition=risk_level_definition,
-                cluster_membership_type=mapping.cluster_membership_type.value,
-                hipaa_category=mapping.hipaa_category.value,
-                dhs_category=mapping.dhs_category.value,
-                nist_category=mapping.nist_category.value,
-            )
+            return RISK_ASSESSMENTS[pii_type]
         except KeyError:
             raise Exception(
                 f"An error occurred while processing the detected entity {pii_type}"
             )
 
+    def map_pii_types(self, pii_types: Iterable[str]) -> List[RiskAssessment]:
+        """
+        Bulk counterpart of map_pii_type. Maps every PII Type (e.g. a list or array of detected entity
+        types) to its shared, precomputed RiskAssessment.
+
+        @param pii_types: Iterable[str]
+        @return: List[RiskAssessment]
+        """
+        pii_types = list(pii_types)
+
+        try:
+            return [RISK_ASSESSMENTS[pii_type] for pii_type in pii_types]
+        except KeyError:
+            unknown_pii_type = next(
+                pii_type for pii_type in pii_types if pii_type not in RISK_ASSESSMENTS
+            )
+            raise Exception(
+                f"An error occurred while processing the detected entity {unknown_pii_type}"
+            )
+
     @classmethod
     def convert_common_pii_to_msft_presidio_type(
         cls, pii_type: PIIType
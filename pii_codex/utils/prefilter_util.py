@@ -0,0 +1,90 @@
+import re
+from threading import Lock
+from typing import Iterable
+
+# Entities detected by the spaCy NER model rather than by pattern recognizers
+NER_ENTITIES = frozenset(["PERSON", "LOCATION", "NRP", "DATE_TIME", "ORGANIZATION"])
+
+# Digits, emails, and URL/domain markers. Every pattern based recognizer needs one of these to match
+_PATTERN_MARKERS = re.compile(r"[0-9@]|://|www\.|\w\.[A-Za-z]{2,}|::")
+
+# Any uppercase or non-ASCII letter, either of which can start a named entity
+_RECALL_SAFE_NAME_MARKERS = re.compile(r"[A-Z]|[^\x00-\x7F]")
+
+# Relative and named dates and times spaCy tags in lowercase text (e.g. "see you tomorrow", "last week")
+_DATE_MARKERS = re.compile(
+    r"\b(?:today|tonight|tomorrow|yesterday|now|ago|morning|afternoon|evening|night|noon|midnight|"
+    r"(?:week|weekend|month|year|day|hour|minute|decade|centur(?:y|ie)|season)s?|"
+    r"(?:mon|tues|wednes|thurs|fri|satur|sun)day|"
+    r"january|february|march|april|may|june|july|august|september|october|november|december|"
+    r"spring|summer|fall|autumn|winter|christmas|easter|thanksgiving)\b",
+    re.IGNORECASE,
+)
+
+# Capitalized tokens within a sentence (sentence-initial words and the pronoun "I" are left out)
+_NAME_MARKERS = re.compile(r"[a-z,;:]\s+(?!I\b)[A-Z]|[^\x00-\x7F]")
+
+
+class TextPrefilter:
+    """
+    Cheap lexical triage that decides whether a text needs the full analysis (spaCy NER and every pattern
+    recognizer). Texts without digits, '@', URL markers, capitalized tokens, or (when DATE_TIME is requested) date
+    keywords are skipped as PII-free.
+    """
+
+    def __init__(self, recall_safe: bool = True):
+        """
+        TextPrefilter constructor.
+        @param recall_safe: bool - when True (default), any uppercase letter sends the text through the full
+        analysis. When False, sentence-initial capitalization is ignored, skipping more texts at the cost of
+        named entities that only show up at the start of a sentence.
+        """
+        self.recall_safe = recall_safe
+        self.checked_count = 0
+        self.skipped_count = 0
+        self._name_markers = _RECALL_SAFE_NAME_MARKERS if recall_safe else _NAME_MARKERS
+        self._lock = Lock()
+
+    def __getstate__(self) -> dict:
+        # Counters stay with the process they were counted in
+        return {"recall_safe": self.recall_safe}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)  # type: ignore
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped_count / self.checked_count if self.checked_count else 0.0
+
+    def needs_analysis(self, text: str, entities: Iterable[str]) -> bool:
+        """
+        Checks whether a text may contain any of the requested entities
+        @param text: str
+        @param entities: Iterable[str] - entities the text is analyzed for
+        @return: bool
+        """
+        entities = set(entities)
+        needs_analysis = (
+            bool(_PATTERN_MARKERS.search(text))
+            or (
+                not NER_ENTITIES.isdisjoint(entities)
+                and bool(self._name_markers.search(text))
+            )
+            or ("DATE_TIME" in entities and bool(_DATE_MARKERS.search(text)))
+        )
+
+        with self._lock:
+            self.checked_count += 1
+            if not needs_analysis:
+                self.skipped_count += 1
+
+        return needs_analysis
+
+    def reset_counts(self) -> None:
+        """
+        Resets the checked and skipped text counters
+        @return: None
+        """
+        with self._lock:
+            self.checked_count = 0
+            self.skipped_count = 0
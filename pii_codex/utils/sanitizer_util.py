@@ -0,0 +1,150 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+from ..models.analysis import DetectionResultItem
+
+# Operator applied to entity types without an operator of their own
+DEFAULT_OPERATOR = "DEFAULT"
+
+# Gap between two detections of the same entity type that are sanitized as one (e.g. "John" and "Smith")
+_SPACES = re.compile(r"^( )+$")
+
+
+def get_operators(pii_token_replacement_value: str) -> Dict[str, str]:
+    """
+    Builds the replacement value of each entity type: detections are replaced by the replacement token
+    (DEFAULT) except for titles, which are removed (TITLE)
+    @param pii_token_replacement_value: str to replace detected pii token with (e.g. <REDACTED>)
+    @return: Dict[str, str] of replacement values by entity type
+    """
+    return {DEFAULT_OPERATOR: pii_token_replacement_value, "TITLE": ""}
+
+
+def sanitize_text(
+    text: str,
+    analysis_items: Iterable[DetectionResultItem],
+    pii_token_replacement_value: str,
+    operators: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Replaces the detected spans of a text in a single left-to-right pass. Conflicts are resolved as Presidio's
+    anonymizer (AnonymizerEngine) resolves them: overlapping detections of the same type are merged, detections
+    contained in another or sharing its span with a lower or equal score are dropped, detections of the same type
+    only separated by spaces are merged, and a detection partially overlapped by one of another type ends where
+    the other starts. Detections without a span (e.g. of metadata) are ignored.
+    @param text: str
+    @param analysis_items: Iterable[DetectionResultItem] - detections of the text, in any order. As in Presidio,
+    ties between detections sharing a span and score go to the last one.
+    @param pii_token_replacement_value: str to replace detected pii token with (e.g. <REDACTED>)
+    @param operators: Dict[str, str] - (Optional) replacement values by entity type, see get_operators
+    @return: str
+    """
+    if operators is None:
+        operators = get_operators(pii_token_replacement_value)
+    default_value = operators.get(DEFAULT_OPERATOR, pii_token_replacement_value)
+
+    sanitized_parts: List[str] = []
+    position = 0
+
+    for start, end, entity_type, _ in _resolve_conflicts(text, analysis_items):
+        # A span partially overlapped by the next one was cut where the next one starts
+        sanitized_parts.extend(
+            [
+                text[min(position, start) : start],
+                operators.get(entity_type, default_value),
+            ]
+        )
+        position = end
+
+    if not sanitized_parts:
+        return text
+
+    sanitized_parts.append(text[position:])
+
+    return "".join(sanitized_parts)
+
+
+def _resolve_conflicts(
+    text: str, analysis_items: Iterable[DetectionResultItem]
+) -> List[List]:
+    """
+    Resolves the conflicting detections of a text in the same steps as Presidio's AnonymizerEngine
+    @param text: str
+    @param analysis_items: Iterable[DetectionResultItem]
+    @return: List of [start, end, entity_type, score] spans, in the order they are replaced
+    """
+    spans: List[List] = sorted(
+        (
+            [item.start, item.end, item.entity_type, item.score]
+            for item in analysis_items
+            if item.end > item.start
+        ),
+        key=lambda span: (span[0], span[1]),
+    )
+
+    # Overlapping detections of the same type are merged into the first one overlapping them after (or else
+    # before) them
+    merged_spans: List[List] = []
+    other_spans = spans.copy()
+    for span in spans:
+        other_spans.remove(span)
+        other_span = next(
+            (
+                other_span
+                for other_span in other_spans
+                if other_span[2] == span[2]
+                and span[0] < other_span[1]
+                and other_span[0] < span[1]
+            ),
+            None,
+        )
+        if other_span is None:
+            other_spans.append(span)
+            merged_spans.append(span)
+            continue
+
+        other_span[0] = min(span[0], other_span[0])
+        other_span[1] = max(span[1], other_span[1])
+        other_span[3] = max(span[3], other_span[3])
+
+    # Detections contained in another, or sharing its span with a lower or equal score, are dropped
+    resolved_spans: List[List] = []
+    other_spans = merged_spans.copy()
+    for span in merged_spans:
+        other_spans.remove(span)
+        if any(_is_conflicted(span, other_span) for other_span in other_spans):
+            continue
+
+        other_spans.append(span)
+        resolved_spans.append(span)
+
+    # Detections of the same type only separated by spaces are merged
+    spaced_spans: List[List] = []
+    for span in resolved_spans:
+        if spaced_spans:
+            previous_span = spaced_spans[-1]
+            if (
+                previous_span[2] == span[2]
+                and _SPACES.search(text[previous_span[1] : span[0]]) is not None
+            ):
+                spaced_spans.remove(previous_span)
+                span[0] = previous_span[0]
+        spaced_spans.append(span)
+
+    # Presidio replaces the spans from last to first, so ties between equal spans go the other way round
+    spaced_spans.sort(key=lambda span: (span[0], span[1]), reverse=True)
+
+    return spaced_spans[::-1]
+
+
+def _is_conflicted(span: List, other_span: List) -> bool:
+    """
+    Whether a span loses to another: it shares the other's span with a lower or equal score, or is contained in it
+    @param span: List - [start, end, entity_type, score]
+    @param other_span: List - [start, end, entity_type, score]
+    @return: bool
+    """
+    if span[0] == other_span[0] and span[1] == other_span[1]:
+        return span[3] <= other_span[3]
+
+    return other_span[0] <= span[0] and span[1] <= other_span[1]
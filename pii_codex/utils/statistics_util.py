@@ -1,4 +1,10 @@
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import math
 import statistics
+from bisect import bisect_left
+from typing import List
 
 import numpy as np
 
@@ -11,10 +17,14 @@ def get_population_variance(values) -> float:
     return statistics.pvariance(values)
 
 
-def get_standard_deviation(values, collection_type: str) -> float:
+def validate_collection_type(collection_type: str) -> None:
     if collection_type.lower() != "sample" and collection_type.lower() != "population":
         raise Exception("Invalid collection type. Must be 'SAMPLE' or 'POPULATION'.")
 
+
+def get_standard_deviation(values, collection_type: str) -> float:
+    validate_collection_type(collection_type)
+
     return (
         statistics.stdev(values)
         if collection_type.lower() == "sample"
@@ -23,8 +33,7 @@ def get_standard_deviation(values, collection_type: str) -> float:
 
 
 def get_variance(values, collection_type: str) -> float:
-    if collection_type.lower() != "sample" and collection_type.lower() != "population":
-        raise Exception("Invalid collection type. Must be 'SAMPLE' or 'POPULATION'.")
+    validate_collection_type(collection_type)
 
     return (
         statistics.variance(values)
@@ -47,3 +56,179 @@ def get_mode(values):
 
 def get_sum(values):
     return np.sum(values)
+
+
+class RunningStatistics:
+    """
+    Online mean and variance of a stream of values (Welford's algorithm). Uses constant memory and
+    can be merged with the statistics of another stream (Chan et al.'s parallel update).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._sum_of_squared_deviations = 0.0
+
+    @classmethod
+    def from_values(cls, values) -> RunningStatistics:
+        """
+        Running statistics of an array of values, computed in a single vectorized pass
+        @param values: array-like of floats
+        @return: RunningStatistics
+        """
+        values = np.asarray(values, dtype=np.float64)
+        running_statistics = cls()
+        running_statistics.count = len(values)
+
+        if running_statistics.count:
+            running_statistics.mean = float(values.mean())
+            running_statistics._sum_of_squared_deviations = float(
+                np.square(values - running_statistics.mean).sum()
+            )
+
+        return running_statistics
+
+    def update(self, value: float) -> None:
+        """
+        Adds a single value to the running statistics
+        @param value:
+        @return:
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._sum_of_squared_deviations += delta * (value - self.mean)
+
+    def merge(self, other: RunningStatistics) -> RunningStatistics:
+        """
+        Merges the running statistics of another stream into this one
+        @param other:
+        @return: RunningStatistics (self)
+        """
+        if other.count == 0:
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._sum_of_squared_deviations += (
+            other._sum_of_squared_deviations
+            + delta * delta * self.count * other.count / count
+        )
+        self.mean += delta * other.count / count
+        self.count = count
+
+        return self
+
+    def get_mean(self) -> float:
+        if self.count < 1:
+            raise statistics.StatisticsError("mean requires at least one data point")
+
+        return self.mean
+
+    def get_variance(self, collection_type: str) -> float:
+        validate_collection_type(collection_type)
+
+        if collection_type.lower() == "sample":
+            if self.count < 2:
+                raise statistics.StatisticsError(
+                    "variance requires at least two data points"
+                )
+
+            return self._sum_of_squared_deviations / (self.count - 1)
+
+        if self.count < 1:
+            raise statistics.StatisticsError(
+                "pvariance requires at least one data point"
+            )
+
+        return self._sum_of_squared_deviations / self.count
+
+    def get_standard_deviation(self, collection_type: str) -> float:
+        return math.sqrt(self.get_variance(collection_type))
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming histogram (Ben-Haim and Tom-Tov, 2010) holding at most max_bins centroids.
+    Quantiles are exact while the stream has no more than max_bins distinct values (always the case for
+    risk scores of short texts) and are approximated from the closest centroids beyond that.
+    """
+
+    def __init__(self, max_bins: int = 256):
+        self.max_bins = max_bins
+        self.count = 0
+        self._values: List[float] = []
+        self._counts: List[int] = []
+
+    @property
+    def bin_count(self) -> int:
+        return len(self._values)
+
+    def update(self, value: float, count: int = 1) -> None:
+        """
+        Adds a value (with an optional weight) to the sketch
+        @param value:
+        @param count:
+        @return:
+        """
+        self.count += count
+        position = bisect_left(self._values, value)
+
+        if position < len(self._values) and self._values[position] == value:
+            self._counts[position] += count
+            return
+
+        self._values.insert(position, value)
+        self._counts.insert(position, count)
+
+        if len(self._values) > self.max_bins:
+            self._merge_closest_bins()
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """
+        Merges the centroids of another sketch into this one
+        @param other:
+        @return: QuantileSketch (self)
+        """
+        for value, count in zip(other._values, other._counts):
+            self.update(value, count)
+
+        return self
+
+    def get_median(self) -> float:
+        """
+        Median of the sketched values. Mirrors statistics.median, averaging the two middle values of
+        an even count.
+        @return: float
+        """
+        if self.count < 1:
+            raise statistics.StatisticsError("no median for empty data")
+
+        lower = self._get_value_at_rank((self.count - 1) // 2)
+        if self.count % 2 == 1:
+            return lower
+
+        return (lower + self._get_value_at_rank(self.count // 2)) / 2
+
+    def _get_value_at_rank(self, rank: int) -> float:
+        cumulative_count = 0
+        for value, count in zip(self._values, self._counts):
+            cumulative_count += count
+            if rank < cumulative_count:
+                return value
+
+        return self._values[-1]
+
+    def _merge_closest_bins(self) -> None:
+        gaps = [upper - lower for lower, upper in zip(self._values, self._values[1:])]
+        position = gaps.index(min(gaps))
+
+        merged_count = self._counts[position] + self._counts[position + 1]
+        self._values[position] = (
+            self._values[position] * self._counts[position]
+            + self._values[position + 1] * self._counts[position + 1]
+        ) / merged_count
+        self._counts[position] = merged_count
+
+        del self._values[position + 1]
+        del self._counts[position + 1]
@@ -0,0 +1,205 @@
+import statistics
+
+import pytest
+from assertpy import assert_that
+
+from pii_codex.models.analysis import (
+    AnalysisResult,
+    AnalysisResultItem,
+    ColumnarAnalysisResults,
+    CompactAnalysisResult,
+    DetectionResult,
+    DetectionResultItem,
+    RiskAssessment,
+)
+from pii_codex.models.common import PIIType
+from pii_codex.services.analysis_aggregator import PIIAnalysisAggregator
+from pii_codex.services.analysis_service import PIIAnalysisService
+
+DETECTION_COLLECTION = [
+    DetectionResult(
+        index=0,
+        detections=[
+            DetectionResultItem(entity_type=PIIType.EMAIL_ADDRESS.name, score=0.99),
+            DetectionResultItem(entity_type=PIIType.URL.name, score=0.5),
+        ],
+    ),
+    DetectionResult(
+        index=1,
+        detections=[
+            DetectionResultItem(entity_type=PIIType.PHONE_NUMBER.name, score=0.75)
+        ],
+    ),
+    DetectionResult(
+        index=2,
+        detections=[DetectionResultItem(entity_type=PIIType.LOCATION.name)],
+    ),
+    DetectionResult(
+        index=3,
+        detections=[
+            DetectionResultItem(entity_type=PIIType.PHONE_NUMBER.name, score=0.75),
+            DetectionResultItem(entity_type=PIIType.PERSON.name, score=0.85),
+        ],
+    ),
+]
+
+
+def get_analyses():
+    pii_analysis_service = PIIAnalysisService(analysis_provider="AWS")
+    analyses = [
+        pii_analysis_service.analyze_detection_result(detection_result, index=i)
+        for i, detection_result in enumerate(DETECTION_COLLECTION)
+    ]
+    analyses.append(
+        AnalysisResult(
+            index=len(analyses),
+            analysis=[
+                AnalysisResultItem(detection=None, risk_assessment=RiskAssessment())
+            ],
+            risk_score_mean=1.0,
+        )
+    )
+
+    return analyses
+
+
+@pytest.mark.parametrize("collection_type", ["SAMPLE", "POPULATION"])
+def test_aggregator_matches_collection_statistics(collection_type):
+    analyses = get_analyses()
+    risk_scores = [analysis.risk_score_mean for analysis in analyses]
+
+    result_set = (
+        PIIAnalysisAggregator()
+        .update_all(analyses)
+        .to_analysis_result_set(
+            collection_name="Aggregated", collection_type=collection_type
+        )
+    )
+
+    assert_that(result_set.analyses).is_empty()
+    assert_that(result_set.collection_name).is_equal_to("Aggregated")
+    assert_that(result_set.risk_score_mean).is_close_to(
+        statistics.mean(risk_scores), 1e-12
+    )
+    assert_that(result_set.risk_score_median).is_equal_to(
+        statistics.median(risk_scores)
+    )
+    assert_that(result_set.risk_score_mode).is_equal_to(statistics.mode(risk_scores))
+    assert_that(result_set.risk_score_variance).is_close_to(
+        statistics.variance(risk_scores)
+        if collection_type == "SAMPLE"
+        else statistics.pvariance(risk_scores),
+        1e-12,
+    )
+    assert_that(result_set.detection_count).is_equal_to(6)
+    assert_that(result_set.detected_pii_types).is_equal_to(
+        {"EMAIL_ADDRESS", "URL", "PHONE_NUMBER", "LOCATION", "PERSON"}
+    )
+    assert_that(result_set.detected_pii_type_frequencies["PHONE_NUMBER"]).is_equal_to(2)
+
+
+def test_aggregator_merge_across_shards():
+    analyses = get_analyses()
+
+    merged_set = (
+        PIIAnalysisAggregator()
+        .update_all(analyses[:2])
+        .merge(PIIAnalysisAggregator().update_all(analyses[2:]))
+        .to_analysis_result_set(collection_type="SAMPLE")
+    )
+    full_set = PIIAnalysisService.summarize_analysis_results(
+        analyses, collection_type="SAMPLE"
+    )
+
+    assert_that(merged_set.risk_score_mean).is_close_to(full_set.risk_score_mean, 1e-12)
+    assert_that(merged_set.risk_score_variance).is_close_to(
+        full_set.risk_score_variance, 1e-12
+    )
+    assert_that(merged_set.risk_score_median).is_equal_to(full_set.risk_score_median)
+    assert_that(merged_set.risk_score_mode).is_equal_to(full_set.risk_score_mode)
+    assert_that(merged_set.detection_count).is_equal_to(full_set.detection_count)
+    assert_that(merged_set.detected_pii_type_frequencies).is_equal_to(
+        full_set.detected_pii_type_frequencies
+    )
+
+
+@pytest.mark.parametrize("collection_type", ["SAMPLE", "POPULATION"])
+def test_aggregator_from_columns(collection_type):
+    analyses = get_analyses()
+    columns = ColumnarAnalysisResults.from_analysis_results(analyses)
+
+    assert_that(columns.offsets.tolist()).is_equal_to([0, 2, 3, 4, 6, 6])
+    assert_that(columns.document_indices.tolist()).is_equal_to([0, 0, 1, 2, 3, 3])
+    assert_that(list(columns)).is_equal_to(analyses)
+
+    columnar_set = PIIAnalysisAggregator.from_columns(columns).to_analysis_result_set(
+        collection_type=collection_type, columns=columns
+    )
+    full_set = PIIAnalysisService.summarize_analysis_results(
+        analyses, collection_type=collection_type
+    )
+
+    assert_that(columnar_set.columns).is_same_as(columns)
+    assert_that(columnar_set.risk_scores).is_equal_to(
+        [analysis.risk_score_mean for analysis in analyses]
+    )
+    assert_that(columnar_set.risk_score_mean).is_close_to(
+        full_set.risk_score_mean, 1e-12
+    )
+    assert_that(columnar_set.risk_score_variance).is_close_to(
+        full_set.risk_score_variance, 1e-12
+    )
+    assert_that(columnar_set.risk_score_median).is_equal_to(full_set.risk_score_median)
+    assert_that(columnar_set.risk_score_mode).is_equal_to(full_set.risk_score_mode)
+    assert_that(columnar_set.detection_count).is_equal_to(full_set.detection_count)
+    assert_that(columnar_set.detected_pii_type_frequencies).is_equal_to(
+        full_set.detected_pii_type_frequencies
+    )
+
+
+def test_aggregator_median_of_retained_analyses():
+    # More distinct risk scores than the sketch holds exactly
+    analyses = [
+        AnalysisResult(index=i, analysis=[], risk_score_mean=1 + (i * 7 % 300) / 100)
+        for i in range(300)
+    ]
+    risk_scores = [analysis.risk_score_mean for analysis in analyses]
+    aggregator = PIIAnalysisAggregator(max_median_bins=8).update_all(analyses)
+
+    full_set = aggregator.to_analysis_result_set(analyses=analyses)
+    compact_set = aggregator.to_analysis_result_set(
+        compact_analyses=[
+            CompactAnalysisResult.from_analysis_result(analysis)
+            for analysis in analyses
+        ],
+        detail="compact",
+    )
+
+    assert_that(full_set.risk_score_median).is_equal_to(statistics.median(risk_scores))
+    assert_that(compact_set.risk_score_median).is_equal_to(
+        statistics.median(risk_scores)
+    )
+
+
+def test_aggregator_columnar_median_and_mode():
+    # More distinct risk scores than the sketch holds exactly, with a two-way tie for the mode
+    risk_scores = [2.5] + [1 + (i * 7 % 300) / 100 for i in range(300)] + [1.5]
+    analyses = [
+        AnalysisResult(index=i, analysis=[], risk_score_mean=risk_score)
+        for i, risk_score in enumerate(risk_scores)
+    ]
+    columns = ColumnarAnalysisResults.from_analysis_results(analyses)
+
+    columnar_set = PIIAnalysisAggregator.from_columns(
+        columns, max_median_bins=8
+    ).to_analysis_result_set(columns=columns, detail="columnar")
+
+    assert_that(columnar_set.risk_score_median).is_equal_to(
+        statistics.median(risk_scores)
+    )
+    assert_that(columnar_set.risk_score_mode).is_equal_to(statistics.mode(risk_scores))
+
+
+def test_aggregator_without_analyses():
+    with pytest.raises(statistics.StatisticsError):
+        PIIAnalysisAggregator().to_analysis_result_set()
@@ -1,3 +1,10 @@
+# pylint: disable=too-many-public-methods,too-many-lines
+import asyncio
+import dataclasses
+import gc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pandas as pd
 import pytest
 from assertpy import assert_that
@@ -15,7 +22,12 @@ from pii_codex.models.analysis import (
     DetectionResult,
     DetectionResultItem,
 )
+from pii_codex.services.adapters.detection_adapters.aws_detection_adapter import (
+    AWSComprehendPIIDetectionAdapter,
+)
 from pii_codex.services.analysis_service import PIIAnalysisService
+from pii_codex.utils.cache_util import DetectionCache, SQLiteDetectionCache
+from pii_codex.utils.prefilter_util import TextPrefilter
 
 
 class TestPIIAnalysisService:
@@ -227,6 +239,413 @@ class TestPIIAnalysisService:
         assert_that(results.risk_score_variance).is_greater_than(0.02)
         assert_that(results.to_dict()).is_not_none()
 
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_collection_analysis_with_indexed_data(self, workers):
+        texts_to_analyze = [
+            "See you there!",
+            "example@example.com",
+            "My phone number is 555-555-5555",
+        ]
+        test_df = pd.DataFrame(
+            {
+                "text": texts_to_analyze,
+                "metadata": [{"location": True}, None, {"url": False}],
+            },
+            index=[30, 10, 20],
+        )
+
+        results = self.pii_analysis_service.analyze_collection(
+            data=test_df, workers=workers
+        )
+        text_results = self.pii_analysis_service.analyze_collection(
+            texts=texts_to_analyze
+        )
+
+        # Results follow the frame's row order and are indexed by row position
+        assert_that([analysis.index for analysis in results.analyses]).is_equal_to(
+            [0, 1, 2]
+        )
+        assert_that(
+            [analysis.sanitized_text for analysis in results.analyses]
+        ).is_equal_to([analysis.sanitized_text for analysis in text_results.analyses])
+        assert_that(results.analyses[0].get_detected_types()).is_equal_to(["LOCATION"])
+        assert_that(results.analyses[1].get_detected_types()).contains("EMAIL_ADDRESS")
+
+    def test_collection_analysis_with_text_only_data(self):
+        results = self.pii_analysis_service.analyze_collection(
+            data=pd.DataFrame({"text": ["See you there!", "example@example.com"]}),
+        )
+
+        assert_that(results.analyses).is_length(2)
+        assert_that(results.analyses[1].sanitized_text).is_equal_to("<REDACTED>")
+
+    def test_collection_analysis_with_workers(self):
+        texts_to_analyze = [
+            "Hi, my name is Donnie",
+            "See you there!",
+            "example@example.com",
+            "My phone number is 555-555-5555",
+            "Oh his work phone number is 777-777-7777",
+            "My phone number is 305-555-5555 and email is example@example.com",
+        ]
+
+        serial_results = self.pii_analysis_service.analyze_collection(
+            texts=texts_to_analyze,
+        )
+        pooled_results = self.pii_analysis_service.analyze_collection(
+            texts=texts_to_analyze,
+            workers=2,
+        )
+
+        assert_that(len(pooled_results.analyses)).is_equal_to(len(texts_to_analyze))
+        assert_that(
+            [analysis.index for analysis in pooled_results.analyses]
+        ).is_equal_to(list(range(len(texts_to_analyze))))
+        assert_that(
+            [analysis.sanitized_text for analysis in pooled_results.analyses]
+        ).is_equal_to([analysis.sanitized_text for analysis in serial_results.analyses])
+        assert_that(pooled_results.risk_scores).is_equal_to(serial_results.risk_scores)
+        assert_that(pooled_results.detection_count).is_equal_to(
+            serial_results.detection_count
+        )
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_collection_analysis_with_detection_cache(self, workers):
+        texts_to_analyze = [
+            "example@example.com",
+            "See you there!",
+            "example@example.com",
+            "My phone number is 555-555-5555",
+            "example@example.com",
+        ]
+        detection_cache = DetectionCache(max_size=10)
+
+        cached_results = PIIAnalysisService(
+            detection_cache=detection_cache
+        ).analyze_collection(texts=texts_to_analyze, workers=workers)
+        results = self.pii_analysis_service.analyze_collection(texts=texts_to_analyze)
+
+        assert_that(
+            [analysis.sanitized_text for analysis in cached_results.analyses]
+        ).is_equal_to([analysis.sanitized_text for analysis in results.analyses])
+        assert_that(cached_results.risk_scores).is_equal_to(results.risk_scores)
+        assert_that(cached_results.detection_count).is_equal_to(results.detection_count)
+        if workers == 1:
+            assert_that(detection_cache).is_length(3)
+
+    def test_iter_analyze_with_detection_cache_stays_lazy(self):
+        pulled_texts = []
+
+        def text_source():
+            for _ in range(1000):
+                pulled_texts.append("example@example.com")
+                yield "example@example.com"
+
+        results = PIIAnalysisService(
+            detection_cache=DetectionCache(max_size=10)
+        ).iter_analyze(text_source(), batch_size=10)
+
+        assert_that([next(results).sanitized_text for _ in range(2)]).is_equal_to(
+            ["<REDACTED>", "<REDACTED>"]
+        )
+        # Repeated texts are yielded before the rest of the source is read
+        assert_that(len(pulled_texts)).is_less_than_or_equal_to(30)
+        assert_that(list(results)).is_length(998)
+
+    def test_iter_analyze_with_prefilter_stays_lazy(self):
+        pulled_texts = []
+
+        def text_source():
+            for _ in range(1000):
+                pulled_texts.append("see you there!")
+                yield "see you there!"
+
+        results = PIIAnalysisService(prefilter=TextPrefilter()).iter_analyze(
+            text_source(), batch_size=10
+        )
+
+        assert_that(next(results).sanitized_text).is_equal_to("see you there!")
+        # Skipped texts are yielded before the rest of the source is read
+        assert_that(len(pulled_texts)).is_less_than_or_equal_to(30)
+        assert_that(list(results)).is_length(999)
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="Forked workers need the fork start method",
+    )
+    def test_collection_analysis_with_forked_workers(self):
+        texts_to_analyze = [
+            "Hi, my name is Donnie",
+            "See you there!",
+            "example@example.com",
+            "My phone number is 305-555-5555 and email is example@example.com",
+        ]
+
+        serial_results = self.pii_analysis_service.analyze_collection(
+            texts=texts_to_analyze,
+        )
+        forked_results = PIIAnalysisService(fork_workers=True).analyze_collection(
+            texts=texts_to_analyze,
+            workers=2,
+        )
+
+        assert_that(
+            [analysis.sanitized_text for analysis in forked_results.analyses]
+        ).is_equal_to([analysis.sanitized_text for analysis in serial_results.analyses])
+        assert_that(forked_results.risk_scores).is_equal_to(serial_results.risk_scores)
+        # The parent's objects are only frozen while the pool is open
+        assert_that(gc.get_freeze_count()).is_equal_to(0)
+
+    def test_collection_analysis_with_sqlite_detection_cache(self, tmp_path):
+        texts_to_analyze = [
+            "example@example.com",
+            "See you there!",
+            "My phone number is 555-555-5555",
+        ]
+        cache_path = str(tmp_path / "detections.db")
+
+        first_run = PIIAnalysisService(
+            detection_cache=SQLiteDetectionCache(path=cache_path)
+        ).analyze_collection(texts=texts_to_analyze, workers=2)
+
+        # A later run reuses the detections stored by the worker processes of the first
+        detection_cache = SQLiteDetectionCache(path=cache_path)
+        second_run = PIIAnalysisService(
+            detection_cache=detection_cache
+        ).analyze_collection(texts=texts_to_analyze)
+
+        assert_that(detection_cache.hits).is_equal_to(len(texts_to_analyze))
+        assert_that(detection_cache.misses).is_equal_to(0)
+        assert_that(
+            [analysis.sanitized_text for analysis in second_run.analyses]
+        ).is_equal_to([analysis.sanitized_text for analysis in first_run.analyses])
+        assert_that(second_run.risk_scores).is_equal_to(first_run.risk_scores)
+        detection_cache.close()
+
+    def test_collection_analysis_with_executor(self):
+        texts_to_analyze = [
+            "Hi, my name is Donnie",
+            "See you there!",
+            "example@example.com",
+            "My phone number is 555-555-5555",
+            "My phone number is 305-555-5555 and email is example@example.com",
+        ]
+        serial_results = self.pii_analysis_service.analyze_collection(
+            texts=texts_to_analyze
+        )
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            threaded_results = self.pii_analysis_service.analyze_collection(
+                texts=texts_to_analyze, executor=executor, batch_size=2
+            )
+
+            # Concurrent calls on the shared service don't interfere with one another
+            concurrent_results = list(
+                executor.map(
+                    lambda text: self.pii_analysis_service.analyze_collection(
+                        texts=[text]
+                    ),
+                    texts_to_analyze,
+                )
+            )
+
+        assert_that(
+            [analysis.index for analysis in threaded_results.analyses]
+        ).is_equal_to(list(range(len(texts_to_analyze))))
+        assert_that(
+            [analysis.sanitized_text for analysis in threaded_results.analyses]
+        ).is_equal_to([analysis.sanitized_text for analysis in serial_results.analyses])
+        assert_that(threaded_results.risk_scores).is_equal_to(
+            serial_results.risk_scores
+        )
+        assert_that(
+            [results.analyses[0].sanitized_text for results in concurrent_results]
+        ).is_equal_to([analysis.sanitized_text for analysis in serial_results.analyses])
+
+    def test_collection_analysis_with_executor_and_workers(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with pytest.raises(Exception) as execinfo:
+                self.pii_analysis_service.analyze_collection(
+                    texts=["See you there!"], executor=executor, workers=2
+                )
+
+        assert_that(execinfo.value.args[0]).is_equal_to(
+            "Cannot supply both 'workers' and 'executor' params."
+        )
+
+    def test_collection_analysis_with_process_pool_executor(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(Exception) as execinfo:
+                self.pii_analysis_service.analyze_collection(
+                    texts=["See you there!"], executor=executor
+                )
+
+        assert_that(execinfo.value.args[0]).is_equal_to(
+            "'executor' param must be a thread pool (e.g. ThreadPoolExecutor). Use the 'workers' param to "
+            "analyze on worker processes."
+        )
+
+    def test_analyze_item_async(self):
+        pii_analysis_service = PIIAnalysisService(max_async_concurrency=2)
+        texts_to_analyze = [
+            "example@example.com",
+            "See you there!",
+            "My phone number is 555-555-5555",
+        ]
+
+        async def analyze_texts():
+            return await asyncio.gather(
+                *[
+                    pii_analysis_service.analyze_item_async(text=text)
+                    for text in texts_to_analyze
+                ]
+            )
+
+        results = asyncio.run(analyze_texts())
+        pii_analysis_service.shutdown()
+
+        assert_that([result.sanitized_text for result in results]).is_equal_to(
+            [
+                self.pii_analysis_service.analyze_item(text=text).sanitized_text
+                for text in texts_to_analyze
+            ]
+        )
+
+    def test_analyze_collection_async(self):
+        pii_analysis_service = PIIAnalysisService(max_async_concurrency=2)
+        test_df = pd.DataFrame(
+            {
+                "text": [
+                    "Hi, my name is Donnie",
+                    "See you there!",
+                    "example@example.com",
+                    "My phone number is 555-555-5555",
+                    "My phone number is 305-555-5555 and email is example@example.com",
+                ],
+                "metadata": [None, {"location": True}, None, None, None],
+            }
+        )
+
+        results = asyncio.run(
+            pii_analysis_service.analyze_collection_async(data=test_df, batch_size=2)
+        )
+        # The managed thread pool and semaphores can be reused by later event loops
+        second_results = asyncio.run(
+            pii_analysis_service.analyze_collection_async(data=test_df, batch_size=2)
+        )
+        compact_results = asyncio.run(
+            pii_analysis_service.analyze_collection_async(
+                data=test_df,
+                batch_size=2,
+                entity_profile="contact-only",
+                detail="compact",
+                drop_texts=True,
+            )
+        )
+        pii_analysis_service.shutdown()
+        serial_results = self.pii_analysis_service.analyze_collection(data=test_df)
+
+        assert_that([analysis.index for analysis in results.analyses]).is_equal_to(
+            [0, 1, 2, 3, 4]
+        )
+        assert_that(
+            [analysis.sanitized_text for analysis in results.analyses]
+        ).is_equal_to([analysis.sanitized_text for analysis in serial_results.analyses])
+        assert_that(results.risk_scores).is_equal_to(serial_results.risk_scores)
+        assert_that(second_results.risk_scores).is_equal_to(results.risk_scores)
+
+        # Same options as the sync collection analysis
+        serial_compact_results = self.pii_analysis_service.analyze_collection(
+            data=test_df, entity_profile="contact-only", detail="compact"
+        )
+        assert_that(compact_results.analyses).is_empty()
+        assert_that(compact_results.compact_analyses).is_equal_to(
+            serial_compact_results.compact_analyses
+        )
+        assert_that(compact_results.detected_pii_types).does_not_contain("PERSON")
+
+    @pytest.mark.parametrize("max_async_concurrency", [0, -1, 1.5])
+    def test_invalid_max_async_concurrency(self, max_async_concurrency):
+        with pytest.raises(Exception) as execinfo:
+            PIIAnalysisService(max_async_concurrency=max_async_concurrency)
+
+        assert_that(execinfo.value.args[0]).is_equal_to(
+            "'max_async_concurrency' param must be a positive integer."
+        )
+
+    def test_iter_analyze(self):
+        texts_to_analyze = [
+            "Hi, my name is Donnie",
+            "See you there!",
+            "example@example.com",
+            "My phone number is 555-555-5555",
+            "My phone number is 305-555-5555 and email is example@example.com",
+        ]
+        pulled_texts = []
+
+        def text_source():
+            for text in texts_to_analyze:
+                pulled_texts.append(text)
+                yield text
+
+        results = self.pii_analysis_service.iter_analyze(text_source(), batch_size=2)
+
+        # Nothing is analyzed (or pulled from the source) until the first result is requested
+        assert_that(pulled_texts).is_empty()
+
+        first_result = next(results)
+        assert_that(isinstance(first_result, AnalysisResult)).is_true()
+        assert_that(first_result.index).is_equal_to(0)
+        # At most one batch is pulled from the source ahead of the results
+        assert_that(len(pulled_texts)).is_between(1, 2)
+
+        remaining_results = list(results)
+        assert_that([result.index for result in remaining_results]).is_equal_to(
+            [1, 2, 3, 4]
+        )
+        assert_that(remaining_results[-1].sanitized_text).is_equal_to(
+            "My phone number is <REDACTED> and email is <REDACTED>"
+        )
+
+    def test_iter_analyze_with_metadata(self):
+        results = list(
+            self.pii_analysis_service.iter_analyze(
+                iter(
+                    [
+                        {"text": "See you there!", "metadata": {"location": True}},
+                        {"text": "example@example.com"},
+                    ]
+                ),
+                workers=2,
+                batch_size=1,
+            )
+        )
+
+        assert_that(results).is_length(2)
+        assert_that(results[0].get_detected_types()).is_equal_to(["LOCATION"])
+        assert_that(results[1].index).is_equal_to(1)
+        assert_that(results[1].get_detected_types()).contains("EMAIL_ADDRESS")
+
+    def test_iter_analyze_with_invalid_item(self):
+        with pytest.raises(Exception) as execinfo:
+            list(self.pii_analysis_service.iter_analyze(["See you there!", 1234]))
+
+        assert_that(execinfo.value.args[0]).is_equal_to(
+            "Streamed items must be strings or dicts with a 'text' entry."
+        )
+
+    @pytest.mark.parametrize("workers", [0, -1, 1.5])
+    def test_collection_analysis_with_invalid_workers(self, workers):
+        with pytest.raises(Exception) as execinfo:
+            self.pii_analysis_service.analyze_collection(
+                texts=["My phone number is 305-555-5555"],
+                workers=workers,
+            )
+
+        assert_that(execinfo.value.args[0]).is_equal_to(
+            "'workers' param must be a positive integer."
+        )
+
     @pytest.mark.parametrize(
         "analysis_provider",
         [AnalysisProviderType.AZURE.name, AnalysisProviderType.AWS.name],
@@ -363,6 +782,199 @@ class TestPIIAnalysisService:
             )
         ).is_true()
 
+    def test_analyze_detection_collection_with_texts(self):
+        detection_collection = (
+            AWSComprehendPIIDetectionAdapter().convert_analyzed_collection(
+                pii_detections=[
+                    {
+                        "Entities": [
+                            {
+                                "Score": 0.99,
+                                "Type": "EMAIL",
+                                "BeginOffset": 6,
+                                "EndOffset": 25,
+                            },
+                            {
+                                "Score": 0.98,
+                                "Type": "NAME",
+                                "BeginOffset": 30,
+                                "EndOffset": 34,
+                            },
+                        ]
+                    },
+                    {
+                        "Entities": [
+                            {
+                                "Score": 0.97,
+                                "Type": "PHONE",
+                                "BeginOffset": 5,
+                                "EndOffset": 17,
+                            }
+                        ]
+                    },
+                ]
+            )
+        )
+
+        analysis_result_set = self.pii_analysis_service.analyze_detection_collection(
+            detection_collection=detection_collection,
+            texts=["Email example@example.com and Jane", "Call 212-555-5555"],
+        )
+
+        assert_that(
+            [analysis.sanitized_text for analysis in analysis_result_set.analyses]
+        ).is_equal_to(["Email <REDACTED> and <REDACTED>", "Call <REDACTED>"])
+        assert_that(self.pii_analysis_service.analyze_detection_collection).raises(
+            Exception
+        ).when_called_with(
+            detection_collection=detection_collection, texts=["Call 212-555-5555"]
+        ).is_equal_to(
+            "'texts' param must have one string per detection result."
+        )
+
+    def test_detect_only_and_sanitize_only_modes(self):
+        texts = ["Email example@example.com", "Call 212-555-5555 now"]
+        detect_only_service = PIIAnalysisService(detect_only=True)
+
+        item_result = detect_only_service.analyze_item(text=texts[0])
+        collection_result = detect_only_service.analyze_collection(texts=texts)
+
+        assert_that(item_result.sanitized_text).is_empty()
+        assert_that(item_result.get_detected_types()).contains(
+            PIIType.EMAIL_ADDRESS.name
+        )
+        assert_that(
+            [analysis.sanitized_text for analysis in collection_result.analyses]
+        ).is_equal_to(["", ""])
+
+        detection_collection = [
+            DetectionResult(
+                index=analysis.index,
+                detections=[
+                    item.detection for item in analysis.analysis if item.detection
+                ],
+            )
+            for analysis in collection_result.analyses
+        ]
+        assert_that(
+            self.pii_analysis_service.sanitize_collection(
+                texts=texts, detection_collection=detection_collection
+            )
+        ).is_equal_to(
+            [
+                analysis.sanitized_text
+                for analysis in self.pii_analysis_service.analyze_collection(
+                    texts=texts
+                ).analyses
+            ]
+        )
+
+    def test_sanitized_text_is_built_lazily(self):
+        texts = ["Email example@example.com", "Call 212-555-5555 now"]
+        uncached_service = PIIAnalysisService(cache_sanitized_text=False)
+
+        analysis_result = uncached_service.analyze_item(text=texts[0])
+        # pylint: disable=protected-access
+        assert_that(analysis_result._sanitized_text).is_none()
+        assert_that(analysis_result.sanitized_text).is_equal_to("Email <REDACTED>")
+        assert_that(analysis_result._sanitized_text).is_none()
+
+        analysis_result_set = self.pii_analysis_service.analyze_collection(
+            texts=texts, drop_texts=True
+        )
+        assert_that(
+            [analysis.text for analysis in analysis_result_set.analyses]
+        ).is_equal_to([None, None])
+        assert_that(
+            [analysis.sanitized_text for analysis in analysis_result_set.analyses]
+        ).is_equal_to(["Email <REDACTED>", "Call <REDACTED> now"])
+
+        # Results differing only by their sanitized string are not equal
+        assert_that(analysis_result).is_equal_to(
+            uncached_service.analyze_item(text=texts[0])
+        )
+        assert_that(analysis_result).is_not_equal_to(
+            PIIAnalysisService(pii_token_replacement_value="<PII>").analyze_item(
+                text=texts[0]
+            )
+        )
+        assert_that(repr(analysis_result)).contains("sanitized_text='Email <REDACTED>'")
+
+        # The sanitized string is a dataclass field, so replace() and asdict() keep it
+        assert_that(
+            dataclasses.replace(analysis_result, index=5).sanitized_text
+        ).is_equal_to("Email <REDACTED>")
+        assert_that(dataclasses.asdict(analysis_result)).contains_entry(
+            {"sanitized_text": "Email <REDACTED>"}
+        )
+
+        analysis_result.drop_text(keep_sanitized_text=False)
+        assert_that(analysis_result.sanitized_text).is_empty()
+
+    def test_collection_analysis_detail_levels(self):
+        texts = ["Email example@example.com", "Call 212-555-5555 now"]
+        full_result_set = self.pii_analysis_service.analyze_collection(texts=texts)
+
+        compact_result_set = self.pii_analysis_service.analyze_collection(
+            texts=texts, detail="compact"
+        )
+        assert_that(compact_result_set.analyses).is_empty()
+        assert_that(compact_result_set.compact_analyses).is_length(2)
+        assert_that(compact_result_set.compact_analyses[0].detections[0]).is_equal_to(
+            ("EMAIL_ADDRESS", 6, 25, 1.0)
+        )
+        assert_that(
+            compact_result_set.compact_analyses[1].get_detected_types()
+        ).is_equal_to(["PHONE_NUMBER"])
+        assert_that(compact_result_set.to_dict()["analyses"]).is_length(2)
+
+        aggregates_result_set = self.pii_analysis_service.analyze_collection(
+            texts=texts, detail="aggregates"
+        )
+        assert_that(aggregates_result_set.analyses).is_empty()
+        assert_that(aggregates_result_set.compact_analyses).is_empty()
+
+        for result_set in [compact_result_set, aggregates_result_set]:
+            assert_that(result_set.risk_score_mean).is_equal_to(
+                full_result_set.risk_score_mean
+            )
+            assert_that(result_set.detected_pii_type_frequencies).is_equal_to(
+                full_result_set.detected_pii_type_frequencies
+            )
+
+        with pytest.raises(Exception) as ex_info:
+            self.pii_analysis_service.analyze_collection(texts=texts, detail="none")
+
+        assert_that(ex_info.value.args[0]).is_equal_to(
+            "'detail' param must be one of: full, compact, aggregates, columnar."
+        )
+
+    def test_columnar_collection_analysis(self):
+        texts = ["Email example@example.com", "Nothing here", "Call 212-555-5555 now"]
+        full_result_set = self.pii_analysis_service.analyze_collection(texts=texts)
+
+        columnar_result_set = self.pii_analysis_service.analyze_collection(
+            texts=texts, detail="columnar"
+        )
+        columns = columnar_result_set.columns
+        assert_that(columnar_result_set.analyses).is_empty()
+        assert_that(columns.entity_types).is_equal_to(
+            ["EMAIL_ADDRESS", "URL", "PHONE_NUMBER"]
+        )
+        assert_that(columns.offsets.tolist()).is_equal_to([0, 2, 2, 3])
+        assert_that(columns.risk_levels.tolist()).is_equal_to([3, 2, 3])
+        assert_that(columns[2]).is_equal_to(full_result_set.analyses[2])
+        assert_that(columns[2].sanitized_text).is_equal_to("Call <REDACTED> now")
+        assert_that(columnar_result_set.detected_pii_type_frequencies).is_equal_to(
+            full_result_set.detected_pii_type_frequencies
+        )
+
+        columnar_result_set.drop_texts()
+        assert_that(columns.texts).is_none()
+        assert_that([analysis.sanitized_text for analysis in columns]).is_equal_to(
+            ["Email <REDACTED>", "Nothing here", "Call <REDACTED> now"]
+        )
+
     def test_summarize_analysis_result_items(self):
         result_items = self.pii_analysis_service.analyze_metadata(
             metadata={
@@ -0,0 +1,222 @@
+import json
+import numpy
+import pytest
+import spacy
+from assertpy import assert_that
+
+from pii_codex.services.analyzers import analyzer_engine_registry
+
+from pii_codex.models.analysis import DetectionResultItem
+from pii_codex.services.analysis_service import PIIAnalysisService
+from pii_codex.services.analyzers.analyzer_engine_registry import (
+    get_analyzer_engine,
+    get_loaded_analyzer_engine_keys,
+    get_snapshot_analyzer_engine,
+)
+from pii_codex.services.analyzers.presidio_analysis import PresidioPIIAnalyzer
+from pii_codex.utils.entity_profile_util import (
+    ENTITY_PROFILES,
+    PRESIDIO_ENTITY_RECOGNIZERS,
+)
+
+
+def test_analyzers_share_analyzer_engine():
+    redacting_analyzer = PresidioPIIAnalyzer()
+    tokenizing_analyzer = PresidioPIIAnalyzer(pii_token_replacement_value="<PII>")
+
+    assert_that(redacting_analyzer.analyzer).is_same_as(tokenizing_analyzer.analyzer)
+    assert_that(redacting_analyzer.analyzer).is_same_as(get_analyzer_engine())
+    pii_analysis_service = PIIAnalysisService(pii_token_replacement_value="<PII>")
+    # pylint: disable=protected-access
+    assert_that(pii_analysis_service._analyzer.analyzer).is_same_as(
+        redacting_analyzer.analyzer
+    )
+
+    # Replacement tokens stay with each analyzer
+    detections = [DetectionResultItem(entity_type="EMAIL_ADDRESS", start=0, end=19)]
+    assert_that(
+        redacting_analyzer.sanitize_text("example@example.com", detections)
+    ).is_equal_to("<REDACTED>")
+    assert_that(
+        tokenizing_analyzer.sanitize_text("example@example.com", detections)
+    ).is_equal_to("<PII>")
+    assert_that(
+        redacting_analyzer.sanitize_text(
+            "example@example.com", detections, pii_token_replacement_value="<EMAIL>"
+        )
+    ).is_equal_to("<EMAIL>")
+
+
+def test_analyzer_engine_with_recognizer_names():
+    analyzer_engine = get_analyzer_engine(
+        recognizer_names=["EmailRecognizer", "PhoneRecognizer"]
+    )
+
+    assert_that(analyzer_engine).is_not_same_as(get_analyzer_engine())
+    assert_that(analyzer_engine.get_supported_entities(language="en")).contains_only(
+        "EMAIL_ADDRESS", "PHONE_NUMBER"
+    )
+    assert_that(
+        get_analyzer_engine(recognizer_names=["PhoneRecognizer", "EmailRecognizer"])
+    ).is_same_as(analyzer_engine)
+    assert_that(get_loaded_analyzer_engine_keys()).contains(
+        ("en", "en_core_web_lg", ("EmailRecognizer", "PhoneRecognizer"), False, False)
+    )
+
+
+@pytest.mark.parametrize(
+    "entity,recognizer_names",
+    [
+        (entity, recognizer_names)
+        for entity, recognizer_names in PRESIDIO_ENTITY_RECOGNIZERS.items()
+        if recognizer_names
+    ],
+)
+def test_analyzer_engine_for_every_entity_recognizer(entity, recognizer_names):
+    analyzer_engine = get_analyzer_engine(recognizer_names=recognizer_names)
+
+    assert_that(
+        [recognizer.name for recognizer in analyzer_engine.registry.recognizers]
+    ).contains_only(*recognizer_names)
+    assert_that(analyzer_engine.get_supported_entities(language="en")).contains(entity)
+
+
+@pytest.mark.parametrize("profile_name", list(ENTITY_PROFILES))
+def test_analyzer_engine_detects_every_profile_entity(profile_name):
+    entity_profile = ENTITY_PROFILES[profile_name]
+    analyzer_engine = get_analyzer_engine(
+        recognizer_names=entity_profile.recognizer_names
+    )
+
+    assert_that(analyzer_engine.get_supported_entities(language="en")).contains(
+        *entity_profile.entities
+    )
+
+
+def test_analyzer_engine_with_unknown_recognizer():
+    with pytest.raises(Exception) as execinfo:
+        get_analyzer_engine(recognizer_names=["UnknownRecognizer"])
+
+    assert_that(execinfo.value.args[0]).is_equal_to(
+        "Unknown Presidio recognizer 'UnknownRecognizer'."
+    )
+
+
+def test_analysis_service_with_entity_profile():
+    pii_analysis_service = PIIAnalysisService(entity_profile="contact-only")
+    # pylint: disable=protected-access
+    analyzer_engine = pii_analysis_service._analyzer.analyzer
+
+    assert_that(
+        [recognizer.name for recognizer in analyzer_engine.registry.recognizers]
+    ).contains_only("EmailRecognizer", "PhoneRecognizer", "UrlRecognizer")
+    assert_that(
+        pii_analysis_service.analyze_item(
+            text="My SSN is 123-45-6789, email example@example.com"
+        ).sanitized_text
+    ).is_equal_to("My SSN is 123-45-6789, email <REDACTED>")
+
+
+def test_analyze_collection_with_entity_profile():
+    analysis_results = PIIAnalysisService().analyze_collection(
+        texts=["My SSN is 123-45-6789, email example@example.com"],
+        entity_profile="contact-only",
+    )
+
+    assert_that(analysis_results.detected_pii_types).contains(
+        "EMAIL_ADDRESS"
+    ).does_not_contain("US_SOCIAL_SECURITY_NUMBER")
+
+
+def test_analyzer_engine_without_model_install(monkeypatch):
+    install_attempts = []
+    monkeypatch.setattr(
+        analyzer_engine_registry, "install_spacy_package", install_attempts.append
+    )
+
+    assert_that(get_analyzer_engine).raises(Exception).when_called_with(
+        model_name="xx_missing_model", install_missing_model=False
+    ).starts_with("spaCy model 'xx_missing_model' is not installed")
+    assert_that(install_attempts).is_empty()
+
+
+def test_analysis_service_with_model_directory(tmp_path):
+    spacy.blank("en").to_disk(tmp_path)
+    pii_analysis_service = PIIAnalysisService(
+        model_name=str(tmp_path), install_missing_model=False
+    )
+
+    # pylint: disable=protected-access
+    assert_that(pii_analysis_service._analyzer.analyzer).is_same_as(
+        get_analyzer_engine(model_name=str(tmp_path))
+    )
+    assert_that(
+        pii_analysis_service.analyze_item(
+            text="Email example@example.com"
+        ).sanitized_text
+    ).is_equal_to("Email <REDACTED>")
+
+
+@pytest.fixture(name="vectors_model_path")
+def fixture_vectors_model_path(tmp_path):
+    nlp = spacy.blank("en")
+    nlp.vocab.set_vector("example", numpy.arange(300, dtype="float32"))
+    nlp.to_disk(tmp_path)
+
+    return str(tmp_path)
+
+
+def test_analyzer_engine_with_shared_vectors(vectors_model_path):
+    analyzer_engine = get_analyzer_engine(
+        model_name=vectors_model_path, shared_vectors=True, install_missing_model=False
+    )
+    vocab = analyzer_engine.nlp_engine.nlp["en"].vocab
+
+    assert_that(analyzer_engine).is_not_same_as(
+        get_analyzer_engine(model_name=vectors_model_path)
+    )
+    assert_that(vocab.vectors.data).is_instance_of(numpy.memmap)
+    assert_that(vocab["example"].vector.tolist()).is_equal_to(list(range(300)))
+
+
+def test_analyze_collection_with_shared_vectors(vectors_model_path):
+    analysis_results = PIIAnalysisService(
+        model_name=vectors_model_path, shared_vectors=True
+    ).analyze_collection(
+        texts=["Email example@example.com", "Nothing to see here"], workers=2
+    )
+
+    assert_that(analysis_results.analyses[0].sanitized_text).is_equal_to(
+        "Email <REDACTED>"
+    )
+
+
+def test_analyzer_snapshot_round_trip(tmp_path):
+    text = "Call 212-555-5555 or email example@example.com"
+    analyzer = PresidioPIIAnalyzer(
+        pii_token_replacement_value="<PII>", combined_patterns=True
+    )
+    analyzer.save_snapshot(tmp_path)
+
+    restored_analyzer = PresidioPIIAnalyzer.from_snapshot(tmp_path)
+
+    assert_that(restored_analyzer.analyzer).is_same_as(
+        get_snapshot_analyzer_engine(tmp_path)
+    )
+    assert_that(restored_analyzer.pii_token_replacement_value).is_equal_to("<PII>")
+    assert_that(restored_analyzer.analyze_item(text)).is_equal_to(
+        analyzer.analyze_item(text)
+    )
+    assert_that(restored_analyzer.warmup()).contains_key("engine_load", "warm_up")
+    assert_that(restored_analyzer.startup_times["warm_up"]).is_greater_than(0)
+
+
+def test_analyzer_snapshot_version_mismatch(tmp_path):
+    PresidioPIIAnalyzer().save_snapshot(tmp_path)
+    metadata = json.loads((tmp_path / "snapshot.json").read_text())
+    metadata["spacy_version"] = "0.0.0"
+    (tmp_path / "snapshot.json").write_text(json.dumps(metadata))
+
+    assert_that(get_snapshot_analyzer_engine).raises(Exception).when_called_with(
+        tmp_path
+    ).contains("was saved with spacy_version 0.0.0")
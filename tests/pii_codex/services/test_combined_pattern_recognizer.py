@@ -0,0 +1,85 @@
+import pytest
+from assertpy import assert_that
+
+from pii_codex.services.analysis_service import PIIAnalysisService
+from pii_codex.services.analyzers.analyzer_engine_registry import get_analyzer_engine
+from pii_codex.services.analyzers.combined_pattern_recognizer import (
+    DIGIT_REQUIREMENT,
+    GatedPatternRecognizer,
+    get_pattern_requirements,
+)
+
+TEXTS = [
+    "My email is example@example.com and my phone number is 212-555-5555",
+    "SSN 123-45-6789, card 4111111111111111, ip 192.168.0.1 and fe80::1",
+    "Visit https://www.google.com on 2021-01-02 or 01/02/2022",
+    "IBAN GB82WEST12345698765432 and bitcoin 16Yeky6GMjeNkAiNcBY7ZhrLoMSgg1BoyZ",
+    "Mac 00:1B:44:11:3A:B7, passport 912803456, and medical license BB1388568",
+    "Just had the best coffee of my life, can't wait to go back tomorrow!",
+]
+
+
+def _get_detections(analyzer_engine, text):
+    return sorted(
+        (result.entity_type, result.start, result.end, result.score)
+        for result in analyzer_engine.analyze(text=text, language="en")
+    )
+
+
+@pytest.mark.parametrize(
+    "pattern,requirements",
+    [
+        (r"\b[0-9]{3}-[0-9]{2}-[0-9]{4}\b", {DIGIT_REQUIREMENT, "-"}),
+        (r"\b\S+@\S+\.\w+\b", {"@", "."}),
+        (r"(\d{3}|abc)", set()),
+        (r"(?:https?://)?www\.\w+", {"."}),
+        (r"[a-z]*\d?", set()),
+    ],
+)
+def test_get_pattern_requirements(pattern, requirements):
+    assert_that(set(get_pattern_requirements(pattern))).is_equal_to(requirements)
+
+
+def test_combined_patterns_engine_gates_pattern_recognizers():
+    analyzer_engine = get_analyzer_engine(combined_patterns=True)
+    recognizers = {
+        recognizer.name: recognizer
+        for recognizer in analyzer_engine.registry.recognizers
+    }
+
+    assert_that(analyzer_engine).is_not_same_as(get_analyzer_engine())
+    assert_that(recognizers["EmailRecognizer"]).is_instance_of(GatedPatternRecognizer)
+    # Recognizers with their own analysis logic are kept as they are
+    assert_that(
+        isinstance(recognizers["IbanRecognizer"], GatedPatternRecognizer)
+    ).is_false()
+    assert_that(
+        recognizers["EmailRecognizer"].analyze(
+            "No address here", ["EMAIL_ADDRESS"], None
+        )
+    ).is_empty()
+
+
+def test_combined_patterns_detections_match_recognizer_loop():
+    for text in TEXTS:
+        assert_that(
+            _get_detections(get_analyzer_engine(combined_patterns=True), text)
+        ).is_equal_to(_get_detections(get_analyzer_engine(), text))
+
+
+def test_analyze_collection_with_combined_patterns():
+    analysis_results = PIIAnalysisService().analyze_collection(texts=TEXTS)
+    combined_analysis_results = PIIAnalysisService(
+        combined_patterns=True
+    ).analyze_collection(texts=TEXTS)
+
+    # Presidio may order results of equal score differently, so detections are compared as sorted lists
+    for analysis, combined_analysis in zip(
+        analysis_results.analyses, combined_analysis_results.analyses
+    ):
+        assert_that(combined_analysis.sanitized_text).is_equal_to(
+            analysis.sanitized_text
+        )
+        assert_that(sorted(map(repr, combined_analysis.analysis))).is_equal_to(
+            sorted(map(repr, analysis.analysis))
+        )
@@ -11,6 +11,8 @@ from pii_codex.models.microsoft_presidio_pii import (
 from pii_codex.services.analyzers.presidio_analysis import (
     PresidioPIIAnalyzer,
 )
+from pii_codex.utils.cache_util import DetectionCache
+from pii_codex.utils.prefilter_util import TextPrefilter
 
 
 class TestDetectionService:
@@ -80,6 +82,103 @@ class TestDetectionService:
             isinstance(presidio_results[0].detections[0], DetectionResultItem)
         ).is_true()
 
+    @pytest.mark.parametrize("batch_size", [1, 2, 50])
+    def test_msft_presidio_analysis_items_match_single_item_analysis(self, batch_size):
+        texts = [
+            "My email is example@example.eu.edu",
+            "Nothing to see here",
+            "My phone number is 305-555-5555 and email is example@example.com",
+        ]
+        entities = [
+            MSFTPresidioPIIType.PHONE_NUMBER.value,
+            MSFTPresidioPIIType.EMAIL_ADDRESS.value,
+        ]
+
+        batched_results = self.presidio_analyzer.analyze_items(
+            texts=texts, entities=entities, batch_size=batch_size
+        )
+
+        assert_that(batched_results).is_length(len(texts))
+        for text, batched_result in zip(texts, batched_results):
+            assert_that(batched_result).is_equal_to(
+                self.presidio_analyzer.analyze_item(text=text, entities=entities)
+            )
+
+    @pytest.mark.parametrize("batch_size", [1, 2, 50])
+    def test_msft_presidio_analysis_items_with_detection_cache(self, batch_size):
+        texts = [
+            "My email is example@example.eu.edu",
+            "Nothing to see here",
+            "My email is example@example.eu.edu",
+            "My phone number is 305-555-5555",
+            "Nothing to see here",
+            "My email is example@example.eu.edu",
+        ]
+        entities = [
+            MSFTPresidioPIIType.PHONE_NUMBER.value,
+            MSFTPresidioPIIType.EMAIL_ADDRESS.value,
+        ]
+        detection_cache = DetectionCache()
+        self.presidio_analyzer.detection_cache = detection_cache
+
+        try:
+            cached_results = self.presidio_analyzer.analyze_items(
+                texts=texts, entities=entities, batch_size=batch_size
+            )
+
+            # Duplicates are collapsed before detection, so only the three distinct texts miss
+            assert_that(detection_cache).is_length(3)
+            assert_that(detection_cache.misses).is_equal_to(3)
+
+            batch_hits = detection_cache.hits
+            self.presidio_analyzer.analyze_item(text=texts[0], entities=entities)
+            assert_that(detection_cache.hits).is_equal_to(batch_hits + 1)
+        finally:
+            self.presidio_analyzer.detection_cache = None
+
+        assert_that(cached_results).is_equal_to(
+            self.presidio_analyzer.analyze_items(
+                texts=texts, entities=entities, batch_size=batch_size
+            )
+        )
+
+    @pytest.mark.parametrize("use_detection_cache", [False, True])
+    def test_msft_presidio_analysis_items_with_prefilter(self, use_detection_cache):
+        texts = [
+            "nothing to see here",
+            "My email is example@example.eu.edu",
+            "this is cool...",
+            "My phone number is 305-555-5555",
+            "nothing to see here",
+        ]
+        entities = [
+            MSFTPresidioPIIType.PHONE_NUMBER.value,
+            MSFTPresidioPIIType.EMAIL_ADDRESS.value,
+        ]
+        prefilter = TextPrefilter()
+        self.presidio_analyzer.prefilter = prefilter
+        self.presidio_analyzer.detection_cache = (
+            DetectionCache() if use_detection_cache else None
+        )
+
+        try:
+            prefiltered_results = self.presidio_analyzer.analyze_items(
+                texts=texts, entities=entities, batch_size=2
+            )
+            prefiltered_item_result = self.presidio_analyzer.analyze_item(
+                text=texts[0], entities=entities
+            )
+        finally:
+            self.presidio_analyzer.prefilter = None
+            self.presidio_analyzer.detection_cache = None
+
+        assert_that(prefilter.checked_count).is_equal_to(len(texts) + 1)
+        assert_that(prefilter.skipped_count).is_equal_to(4)
+        assert_that(prefiltered_item_result).is_equal_to(([], texts[0]))
+        assert_that(prefiltered_results).is_equal_to(
+            self.presidio_analyzer.analyze_items(texts=texts, entities=entities)
+        )
+
     def test_presidio_analysis_collection_conversion(self):
         conversion_results: List[
             DetectionResult
@@ -0,0 +1,119 @@
+import subprocess
+import sys
+
+import pytest
+from assertpy import assert_that
+
+from pii_codex.models.common import AnalysisProviderType, RiskLevel
+from pii_codex.services.analysis_service import PIIAnalysisService
+from pii_codex.services.analyzers.pattern_analysis import PatternPIIAnalyzer
+
+pattern_analyzer = PatternPIIAnalyzer()
+
+
+@pytest.mark.parametrize(
+    "text,expected_entity_type",
+    [
+        ("Reach me at example@example.com today", "EMAIL_ADDRESS"),
+        ("Call me at 212-555-5555 later", "PHONE_NUMBER"),
+        ("Call +44 20 7946 0958 later", "PHONE_NUMBER"),
+        ("Call (212) 5555555 later", "PHONE_NUMBER"),
+        ("Call +12125555555 later", "PHONE_NUMBER"),
+        ("Call 212.555.5555 at 12:30", "PHONE_NUMBER"),
+        ("My SSN is 078-05-1121", "US_SOCIAL_SECURITY_NUMBER"),
+        ("Card number 4111-1111-1111-1111", "CREDIT_CARD_NUMBER"),
+        ("IBAN GB82 WEST 1234 5698 7654 32", "INTERNATIONAL_BANKING_ACCOUNT_NUMBER"),
+        ("Server at 192.168.0.1 is down", "IP_ADDRESS"),
+        ("Server at fe80::1ff:fe23:4567:890a is down", "IP_ADDRESS"),
+    ],
+)
+def test_analyze_item(text, expected_entity_type):
+    detections, sanitized_text = pattern_analyzer.analyze_item(text=text)
+
+    assert_that([detection.entity_type for detection in detections]).is_equal_to(
+        [expected_entity_type]
+    )
+    assert_that(sanitized_text).contains("<REDACTED>")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Card number 4111-1111-1111-1112",  # fails the Luhn checksum
+        "IBAN GB82WEST12345698765433",  # fails the mod 97 checksum
+        "My SSN is 666-05-1121",  # never issued
+        "Meet at 10:30:45 on 2021-01-02",
+        "Order 20220102123045 shipped",  # digits without phone number formatting
+        "Order 2125555555 shipped",
+        "Posted at 2022-01-02 12:30:45",  # timestamps
+        "Posted at 2023.10.17 08.15",
+        "Meet at 12:30 01/02/2022",
+        "Just had the best coffee of my life",
+    ],
+)
+def test_analyze_item_without_detections(text):
+    detections, sanitized_text = pattern_analyzer.analyze_item(text=text)
+
+    assert_that(detections).is_empty()
+    assert_that(sanitized_text).is_equal_to(text)
+
+
+def test_analyze_item_with_entities():
+    detections, sanitized_text = pattern_analyzer.analyze_item(
+        text="example@example.com or 212-555-5555",
+        entities=["PHONE_NUMBER", "PERSON"],
+    )
+
+    assert_that([detection.entity_type for detection in detections]).is_equal_to(
+        ["PHONE_NUMBER"]
+    )
+    assert_that(sanitized_text).is_equal_to("example@example.com or <REDACTED>")
+
+
+def test_sanitize_text_merges_overlapping_detections():
+    detections, _ = pattern_analyzer.analyze_item(text="a@b.com 192.168.0.1")
+
+    assert_that(
+        pattern_analyzer.sanitize_text(
+            "a@b.com 192.168.0.1",
+            detections + detections[:1],
+            pii_token_replacement_value="<PII>",
+        )
+    ).is_equal_to("<PII> <PII>")
+
+
+def test_analysis_service_with_pattern_provider():
+    pii_analysis_service = PIIAnalysisService(
+        analysis_provider=AnalysisProviderType.PATTERN.name
+    )
+
+    analysis_result = pii_analysis_service.analyze_item(
+        text="Email example@example.com, SSN 078-05-1121"
+    )
+    assert_that(analysis_result.sanitized_text).is_equal_to(
+        "Email <REDACTED>, SSN <REDACTED>"
+    )
+    assert_that(analysis_result.risk_score_mean).is_equal_to(
+        RiskLevel.LEVEL_THREE.value
+    )
+
+    analysis_results = pii_analysis_service.analyze_collection(
+        texts=["Email example@example.com", "Nothing to see here"]
+    )
+    assert_that(analysis_results.analyses).is_length(2)
+    assert_that(analysis_results.analyses[1].sanitized_text).is_equal_to(
+        "Nothing to see here"
+    )
+
+
+def test_pattern_provider_does_not_import_nlp_packages():
+    script = (
+        "import sys\n"
+        "from pii_codex.services.analysis_service import PIIAnalysisService\n"
+        "PIIAnalysisService(analysis_provider='PATTERN').analyze_item(text='a@b.com')\n"
+        "assert 'spacy' not in sys.modules and 'presidio_analyzer' not in sys.modules\n"
+    )
+
+    assert_that(
+        subprocess.run([sys.executable, "-c", script], check=False).returncode
+    ).is_equal_to(0)
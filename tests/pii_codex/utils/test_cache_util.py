@@ -0,0 +1,127 @@
+import pickle
+import sqlite3
+
+import pytest
+from assertpy import assert_that
+
+from pii_codex.models.analysis import DetectionResultItem
+from pii_codex.utils.cache_util import DetectionCache, SQLiteDetectionCache
+
+EMAIL_DETECTION = DetectionResultItem(
+    entity_type="EMAIL_ADDRESS", score=1.0, start=0, end=19
+)
+
+
+def test_detection_cache_key():
+    key = DetectionCache.get_key(
+        "example@example.com", "en", ["PHONE_NUMBER", "EMAIL_ADDRESS"], "v1"
+    )
+
+    assert_that(key).is_equal_to(
+        DetectionCache.get_key(
+            "example@example.com", "en", ["EMAIL_ADDRESS", "PHONE_NUMBER"], "v1"
+        )
+    )
+    assert_that(key).is_not_equal_to(
+        DetectionCache.get_key("example@example.com", "en", ["EMAIL_ADDRESS"], "v1")
+    )
+    assert_that(key).is_not_equal_to(
+        DetectionCache.get_key(
+            "example@example.com", "en", ["PHONE_NUMBER", "EMAIL_ADDRESS"], "v2"
+        )
+    )
+
+
+def test_detection_cache_hits_and_misses():
+    detection_cache = DetectionCache()
+
+    assert_that(detection_cache.get("key")).is_none()
+    detection_cache.set("key", [EMAIL_DETECTION])
+    assert_that(detection_cache.get("key")).is_equal_to([EMAIL_DETECTION])
+
+    assert_that(detection_cache.hits).is_equal_to(1)
+    assert_that(detection_cache.misses).is_equal_to(1)
+    assert_that(detection_cache.hit_rate).is_equal_to(0.5)
+
+    detection_cache.clear()
+    assert_that(detection_cache).is_length(0)
+    assert_that(detection_cache.hit_rate).is_equal_to(0)
+
+
+def test_detection_cache_lru_eviction():
+    detection_cache = DetectionCache(max_size=2)
+    detection_cache.set("first", [])
+    detection_cache.set("second", [EMAIL_DETECTION])
+
+    # Reading the first entry makes the second the least recently used
+    detection_cache.get("first")
+    detection_cache.set("third", [])
+
+    assert_that(detection_cache).is_length(2)
+    assert_that(detection_cache.get("second")).is_none()
+    assert_that(detection_cache.get("first")).is_empty()
+
+
+def test_detection_cache_pickles_without_entries():
+    detection_cache = DetectionCache(max_size=5)
+    detection_cache.set("key", [EMAIL_DETECTION])
+
+    unpickled_cache = pickle.loads(pickle.dumps(detection_cache))
+
+    assert_that(unpickled_cache.max_size).is_equal_to(5)
+    assert_that(unpickled_cache).is_length(0)
+
+
+@pytest.mark.parametrize("max_size", [0, -1, 1.5])
+def test_detection_cache_with_invalid_max_size(max_size):
+    with pytest.raises(Exception) as execinfo:
+        DetectionCache(max_size=max_size)
+
+    assert_that(execinfo.value.args[0]).is_equal_to(
+        "'max_size' param must be a positive integer."
+    )
+
+
+def test_sqlite_detection_cache_persists_across_instances(tmp_path):
+    cache_path = str(tmp_path / "detections.db")
+    detection_cache = SQLiteDetectionCache(path=cache_path)
+
+    assert_that(detection_cache.get("key")).is_none()
+    detection_cache.set("key", [EMAIL_DETECTION])
+    detection_cache.set("empty", [])
+    detection_cache.close()
+
+    reopened_cache = SQLiteDetectionCache(path=cache_path)
+    assert_that(reopened_cache.get("key")).is_equal_to([EMAIL_DETECTION])
+    assert_that(reopened_cache.get("empty")).is_empty()
+    assert_that(reopened_cache).is_length(2)
+    assert_that(reopened_cache.hits).is_equal_to(2)
+    assert_that(detection_cache.misses).is_equal_to(1)
+
+    reopened_cache.clear()
+    assert_that(reopened_cache).is_length(0)
+    reopened_cache.close()
+
+
+def test_sqlite_detection_cache_uses_wal_mode(tmp_path):
+    cache_path = str(tmp_path / "detections.db")
+    detection_cache = SQLiteDetectionCache(path=cache_path)
+    detection_cache.set("key", [EMAIL_DETECTION])
+
+    connection = sqlite3.connect(cache_path)
+    assert_that(connection.execute("PRAGMA journal_mode").fetchone()[0]).is_equal_to(
+        "wal"
+    )
+    connection.close()
+    detection_cache.close()
+
+
+def test_sqlite_detection_cache_pickles_without_connection(tmp_path):
+    detection_cache = SQLiteDetectionCache(path=str(tmp_path / "detections.db"))
+    detection_cache.set("key", [EMAIL_DETECTION])
+
+    unpickled_cache = pickle.loads(pickle.dumps(detection_cache))
+
+    assert_that(unpickled_cache.get("key")).is_equal_to([EMAIL_DETECTION])
+    unpickled_cache.close()
+    detection_cache.close()
@@ -0,0 +1,45 @@
+import pytest
+from assertpy import assert_that
+
+from pii_codex.utils.entity_profile_util import (
+    ALL_PRESIDIO_ENTITIES,
+    ENTITY_PROFILES,
+    NLP_RECOGNIZER_NAME,
+    EntityProfile,
+    get_entity_profile,
+)
+
+
+@pytest.mark.parametrize("profile_name", ["us-core", "eu-gdpr", "contact-only"])
+def test_entity_profiles(profile_name):
+    entity_profile = get_entity_profile(profile_name)
+
+    assert_that(entity_profile.name).is_equal_to(profile_name)
+    assert_that(ALL_PRESIDIO_ENTITIES).contains(*entity_profile.entities)
+    assert_that(entity_profile.recognizer_names).is_not_empty()
+
+
+def test_contact_only_profile_recognizers():
+    assert_that(ENTITY_PROFILES["contact-only"].recognizer_names).is_equal_to(
+        ("EmailRecognizer", "PhoneRecognizer", "UrlRecognizer")
+    )
+    assert_that(ENTITY_PROFILES["us-core"].recognizer_names).contains(
+        NLP_RECOGNIZER_NAME, "UsSsnRecognizer"
+    )
+
+
+def test_custom_entity_profile():
+    entity_profile = EntityProfile(name="ids", entities=("US_SSN", "IBAN_CODE"))
+
+    assert_that(get_entity_profile(entity_profile)).is_same_as(entity_profile)
+    assert_that(entity_profile.recognizer_names).is_equal_to(
+        ("IbanRecognizer", "UsSsnRecognizer")
+    )
+
+
+def test_unknown_entity_profile():
+    assert_that(get_entity_profile).raises(Exception).when_called_with(
+        "apac"
+    ).is_equal_to(
+        "Unknown entity profile 'apac'. Supported profiles: us-core, eu-gdpr, contact-only."
+    )
@@ -0,0 +1,115 @@
+import pytest
+import spacy
+from assertpy import assert_that
+
+from pii_codex.services.analyzers.presidio_analysis import PresidioPIIAnalyzer
+
+from pii_codex.utils.nlp_pipe_util import (
+    get_disabled_pipe_names,
+    requires_lemmas,
+    requires_ner,
+)
+
+
+@pytest.fixture(name="nlp")
+def fixture_nlp():
+    nlp = spacy.blank("en")
+    for pipe_name in ["tok2vec", "tagger", "parser", "attribute_ruler", "ner"]:
+        nlp.add_pipe(pipe_name)
+    nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+
+    return nlp
+
+
+@pytest.mark.parametrize(
+    "entities,expected_result",
+    [
+        (["EMAIL_ADDRESS", "US_SSN"], False),
+        (["EMAIL_ADDRESS", "PERSON"], True),
+        (["DATE_TIME"], True),
+        (None, True),
+    ],
+)
+def test_requires_ner(entities, expected_result):
+    assert_that(requires_ner(entities)).is_equal_to(expected_result)
+
+
+def test_get_disabled_pipe_names(nlp):
+    assert_that(get_disabled_pipe_names(nlp, ner=False)).is_equal_to(
+        tuple(nlp.pipe_names)
+    )
+    assert_that(get_disabled_pipe_names(nlp, ner=True)).contains_only(
+        "tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"
+    )
+    assert_that(get_disabled_pipe_names(nlp, ner=False, lemmas=True)).contains_only(
+        "tok2vec", "parser", "ner"
+    )
+    assert_that(get_disabled_pipe_names(nlp, ner=True, lemmas=True)).contains_only(
+        "tok2vec", "parser"
+    )
+
+
+def test_requires_lemmas():
+    recognizers = PresidioPIIAnalyzer().analyzer.registry.recognizers
+
+    assert_that(requires_lemmas(recognizers, "en", ["PHONE_NUMBER"])).is_true()
+    assert_that(requires_lemmas(recognizers, "en", None)).is_true()
+    assert_that(requires_lemmas(recognizers, "en", ["PERSON"])).is_false()
+    assert_that(requires_lemmas(recognizers, "es", ["PHONE_NUMBER"])).is_false()
+
+
+@pytest.mark.parametrize(
+    "text,entities",
+    [
+        ("Call me at 212-555-5555", ["PHONE_NUMBER"]),
+        ("Please called 212-555-5555 or mail example@example.com", None),
+    ],
+)
+def test_analyzer_keeps_context_enhancement_scores(text, entities):
+    presidio_analyzer = PresidioPIIAnalyzer()
+    detections, _ = presidio_analyzer.analyze_item(text=text, entities=entities)
+    batch_detections, _ = presidio_analyzer.analyze_items(
+        texts=[text], entities=entities
+    )[0]
+    presidio_scores = sorted(
+        (result.start, result.score)
+        for result in presidio_analyzer.analyzer.analyze(
+            text=text, entities=entities, language="en"
+        )
+    )
+
+    assert_that(
+        sorted((detection.start, detection.score) for detection in detections)
+    ).is_equal_to(presidio_scores)
+    assert_that(
+        sorted((detection.start, detection.score) for detection in batch_detections)
+    ).is_equal_to(presidio_scores)
+
+
+def test_analyzer_skips_pipes_without_ner_entities():
+    processed_texts = []
+
+    @spacy.Language.component("pii_codex_probe")
+    def probe(doc):
+        processed_texts.append(doc.text)
+        return doc
+
+    presidio_analyzer = PresidioPIIAnalyzer()
+    nlp = presidio_analyzer.analyzer.nlp_engine.nlp["en"]
+    nlp.add_pipe("pii_codex_probe")
+    try:
+        detections, _ = presidio_analyzer.analyze_item(
+            text="Email example@example.com", entities=["EMAIL_ADDRESS"]
+        )
+        presidio_analyzer.analyze_items(
+            texts=["Email example@example.com"], entities=["EMAIL_ADDRESS"]
+        )
+        assert_that(processed_texts).is_empty()
+        assert_that(detections).is_length(1)
+
+        presidio_analyzer.analyze_items(
+            texts=["Email example@example.com"], entities=["EMAIL_ADDRESS", "PERSON"]
+        )
+        assert_that(processed_texts).is_length(1)
+    finally:
+        nlp.remove_pipe("pii_codex_probe")
@@ -1,4 +1,6 @@
 # pylint: disable=broad-except, line-too-long
+import dataclasses
+
 from assertpy import assert_that
 import pytest
 
@@ -14,6 +16,7 @@ from pii_codex.models.common import (
     RiskLevel,
     RiskLevelDefinition,
 )
+from pii_codex.models.analysis import AnalysisResultItem, DetectionResultItem
 from pii_codex.models.microsoft_presidio_pii import MSFTPresidioPIIType
 from pii_codex.services.pii_type_mappings import PII_TYPE_MAPPINGS
 import pii_codex.utils.pii_mapping_util as util_module
@@ -48,6 +51,51 @@ class TestPIIMappingUtil:
                 isinstance(HIPAACategory(mapped_pii.hipaa_category), HIPAACategory)
             ).is_true()
 
+    def test_map_pii_types(self):
+        pii_types = ["EMAIL_ADDRESS", "PHONE_NUMBER", "EMAIL_ADDRESS"]
+
+        mapped_pii_types = PII_MAPPER.map_pii_types(pii_types)
+
+        assert_that(mapped_pii_types).is_equal_to(
+            [PII_MAPPER.map_pii_type(pii_type) for pii_type in pii_types]
+        )
+        # Assessments of the same type are the same precomputed instance
+        assert_that(mapped_pii_types[0]).is_same_as(mapped_pii_types[2])
+        assert_that(mapped_pii_types[0]).is_same_as(
+            PII_MAPPER.map_pii_type("EMAIL_ADDRESS")
+        )
+
+    def test_shared_risk_assessments_are_immutable(self):
+        risk_assessment = PII_MAPPER.map_pii_type("EMAIL_ADDRESS")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            risk_assessment.risk_level = RiskLevel.LEVEL_ONE.value
+        with pytest.raises(TypeError):
+            util_module.RISK_ASSESSMENTS["EMAIL_ADDRESS"] = None
+
+        assert_that(
+            dataclasses.replace(
+                risk_assessment, risk_level=RiskLevel.LEVEL_ONE.value
+            ).risk_level
+        ).is_equal_to(RiskLevel.LEVEL_ONE.value)
+
+        # Result dicts hold copies, so editing one leaves the shared assessment as is
+        result_dict = AnalysisResultItem(
+            detection=DetectionResultItem(entity_type="EMAIL_ADDRESS"),
+            risk_assessment=risk_assessment,
+        ).to_dict()
+        result_dict["riskAssessment"]["risk_level"] = RiskLevel.LEVEL_ONE.value
+
+        assert_that(risk_assessment.risk_level).is_equal_to(RiskLevel.LEVEL_THREE.value)
+
+    def test_map_pii_types_with_unknown_type(self):
+        with pytest.raises(Exception) as execinfo:
+            PII_MAPPER.map_pii_types(["EMAIL_ADDRESS", "NOT_A_PII_TYPE"])
+
+        assert_that(execinfo.value.args[0]).is_equal_to(
+            "An error occurred while processing the detected entity NOT_A_PII_TYPE"
+        )
+
     @pytest.mark.parametrize(
         "pii_type",
         PIIType,
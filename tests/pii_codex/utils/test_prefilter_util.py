@@ -0,0 +1,51 @@
+import pickle
+
+import pytest
+from assertpy import assert_that
+
+from pii_codex.utils.prefilter_util import TextPrefilter
+
+ALL_ENTITIES = ["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "URL"]
+PATTERN_ENTITIES = ["EMAIL_ADDRESS", "PHONE_NUMBER", "URL"]
+
+
+@pytest.mark.parametrize(
+    "text,entities,recall_safe,expected_result",
+    [
+        ("see you there!", ALL_ENTITIES, True, False),
+        ("call me at 555-555-5555", ALL_ENTITIES, True, True),
+        ("reach me at someone@", ALL_ENTITIES, True, True),
+        ("check out example.com", ALL_ENTITIES, True, True),
+        ("go to https://", ALL_ENTITIES, True, True),
+        ("See you there!", ALL_ENTITIES, True, True),
+        ("See you there!", PATTERN_ENTITIES, True, False),
+        ("See you there!", ALL_ENTITIES, False, False),
+        ("See you there, Donnie!", ALL_ENTITIES, False, True),
+        ("see you there and I will wave", ALL_ENTITIES, False, False),
+        ("see you in São Paulo", ALL_ENTITIES, False, True),
+        ("see you tomorrow", ALL_ENTITIES, True, False),
+        ("see you tomorrow", ALL_ENTITIES + ["DATE_TIME"], True, True),
+        ("it was fun last week", ALL_ENTITIES + ["DATE_TIME"], False, True),
+        ("see you there!", ALL_ENTITIES + ["DATE_TIME"], True, False),
+    ],
+)
+def test_needs_analysis(text, entities, recall_safe, expected_result):
+    assert_that(
+        TextPrefilter(recall_safe=recall_safe).needs_analysis(text, entities)
+    ).is_equal_to(expected_result)
+
+
+def test_prefilter_counts():
+    prefilter = TextPrefilter()
+    for text in ["see you there!", "this is cool...", "My phone is 555-555-5555"]:
+        prefilter.needs_analysis(text, ALL_ENTITIES)
+
+    assert_that(prefilter.checked_count).is_equal_to(3)
+    assert_that(prefilter.skipped_count).is_equal_to(2)
+    assert_that(prefilter.skip_rate).is_close_to(2 / 3, 1e-12)
+
+    unpickled_prefilter = pickle.loads(pickle.dumps(prefilter))
+    assert_that(unpickled_prefilter.checked_count).is_equal_to(0)
+
+    prefilter.reset_counts()
+    assert_that(prefilter.skip_rate).is_equal_to(0)
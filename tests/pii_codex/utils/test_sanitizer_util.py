@@ -0,0 +1,121 @@
+import random
+
+import pytest
+from assertpy import assert_that
+from presidio_anonymizer import AnonymizerEngine
+from presidio_anonymizer.entities import OperatorConfig, RecognizerResult
+
+from pii_codex.models.analysis import DetectionResultItem
+from pii_codex.utils.sanitizer_util import get_operators, sanitize_text
+
+
+def anonymize_text(text, detections):
+    return (
+        AnonymizerEngine()
+        .anonymize(
+            text=text,
+            analyzer_results=[
+                RecognizerResult(entity_type, start, end, score)
+                for entity_type, start, end, score in detections
+            ],
+            operators={
+                "DEFAULT": OperatorConfig("replace", {"new_value": "<R>"}),
+                "TITLE": OperatorConfig("redact", {}),
+            },
+        )
+        .text
+    )
+
+
+@pytest.mark.parametrize(
+    "text,detections,expected_result",
+    [
+        ("Nothing to see here", [], "Nothing to see here"),
+        (
+            "Email a@b.com now",
+            [("EMAIL_ADDRESS", 6, 13, 1.0), ("URL", 8, 13, 0.5)],
+            "Email <R> now",
+        ),
+        (
+            "John Smith called",
+            [("PERSON", 0, 4, 0.85), ("PERSON", 5, 10, 0.85)],
+            "<R> called",
+        ),
+        ("John,Smith", [("PERSON", 0, 4, 0.85), ("PERSON", 5, 10, 0.85)], "<R>,<R>"),
+        ("Dr. Smith", [("TITLE", 0, 3, 0.6), ("PERSON", 4, 9, 0.85)], " <R>"),
+        (
+            "0123456789",
+            [("PHONE_NUMBER", 0, 6, 0.4), ("PHONE_NUMBER", 4, 10, 0.4)],
+            "<R>",
+        ),
+        ("0123456789", [("PHONE_NUMBER", 0, 6, 0.4), ("US_SSN", 4, 10, 0.4)], "<R><R>"),
+        ("0123456789", [("PHONE_NUMBER", 0, 10, 0.4), ("US_SSN", 0, 10, 0.8)], "<R>"),
+        ("Dr Smith", [("PERSON", 0, 2, 0.6), ("TITLE", 0, 2, 0.6)], " Smith"),
+        ("Dr Smith", [("TITLE", 0, 2, 0.6), ("PERSON", 0, 2, 0.6)], "<R> Smith"),
+        (
+            "b bab b",
+            [
+                ("PERSON", 6, 7, 0.85),
+                ("LOCATION", 0, 4, 0.5),
+                ("LOCATION", 3, 4, 0.85),
+                ("PERSON", 1, 5, 0.5),
+            ],
+            "<R><R> <R>",
+        ),
+    ],
+)
+def test_sanitize_text_matches_presidio_anonymizer(text, detections, expected_result):
+    detection_items = [
+        DetectionResultItem(entity_type=entity_type, start=start, end=end, score=score)
+        for entity_type, start, end, score in detections
+    ]
+
+    assert_that(sanitize_text(text, detection_items, "<R>")).is_equal_to(
+        expected_result
+    )
+    assert_that(anonymize_text(text, detections)).is_equal_to(expected_result)
+
+
+def test_sanitize_text_matches_presidio_anonymizer_on_random_detections():
+    rng = random.Random(0)
+
+    for _ in range(2000):
+        text = "".join(rng.choice("ab  \n") for _ in range(rng.randint(1, 20)))
+        detections = []
+        for _ in range(rng.randint(0, 6)):
+            start = rng.randrange(len(text))
+            detections.append(
+                (
+                    rng.choice(["PERSON", "TITLE", "PHONE_NUMBER"]),
+                    start,
+                    rng.randint(start + 1, len(text)),
+                    rng.choice([0.5, 0.85, 1.0]),
+                )
+            )
+        detection_items = [
+            DetectionResultItem(
+                entity_type=entity_type, start=start, end=end, score=score
+            )
+            for entity_type, start, end, score in detections
+        ]
+
+        assert_that(sanitize_text(text, detection_items, "<R>")).described_as(
+            f"{text!r} {detections}"
+        ).is_equal_to(anonymize_text(text, detections))
+
+
+def test_sanitize_text_with_operators():
+    detection_items = [
+        DetectionResultItem(entity_type="EMAIL_ADDRESS", start=0, end=7),
+        DetectionResultItem(entity_type="LOCATION", start=0, end=0),
+    ]
+
+    assert_that(
+        sanitize_text(
+            "a@b.com",
+            detection_items,
+            "<R>",
+            operators={**get_operators("<R>"), "EMAIL_ADDRESS": "<EMAIL>"},
+        )
+    ).is_equal_to("<EMAIL>")
+    assert_that(get_operators("<R>")).is_equal_to({"DEFAULT": "<R>", "TITLE": ""})
@@ -0,0 +1,92 @@
+import statistics
+
+import pytest
+from assertpy import assert_that
+
+from pii_codex.utils.statistics_util import RunningStatistics, QuantileSketch
+
+RISK_SCORES = [3, 2.6666666666666665, 1, 2, 1, 1, 2.5, 3, 1.5]
+
+
+@pytest.mark.parametrize("collection_type", ["SAMPLE", "POPULATION"])
+def test_running_statistics(collection_type):
+    running_statistics = RunningStatistics()
+    for risk_score in RISK_SCORES:
+        running_statistics.update(risk_score)
+
+    expected_variance = (
+        statistics.variance(RISK_SCORES)
+        if collection_type == "SAMPLE"
+        else statistics.pvariance(RISK_SCORES)
+    )
+
+    assert_that(running_statistics.get_mean()).is_close_to(
+        statistics.mean(RISK_SCORES), 1e-12
+    )
+    assert_that(running_statistics.get_variance(collection_type)).is_close_to(
+        expected_variance, 1e-12
+    )
+    assert_that(running_statistics.get_standard_deviation(collection_type)).is_close_to(
+        expected_variance**0.5, 1e-12
+    )
+
+
+def test_running_statistics_merge():
+    merged_statistics = RunningStatistics()
+    shard_statistics = RunningStatistics()
+    for risk_score in RISK_SCORES[:4]:
+        merged_statistics.update(risk_score)
+    for risk_score in RISK_SCORES[4:]:
+        shard_statistics.update(risk_score)
+
+    merged_statistics.merge(shard_statistics).merge(RunningStatistics())
+
+    assert_that(merged_statistics.count).is_equal_to(len(RISK_SCORES))
+    assert_that(merged_statistics.get_mean()).is_close_to(
+        statistics.mean(RISK_SCORES), 1e-12
+    )
+    assert_that(merged_statistics.get_variance("SAMPLE")).is_close_to(
+        statistics.variance(RISK_SCORES), 1e-12
+    )
+
+
+def test_running_statistics_without_enough_data_points():
+    running_statistics = RunningStatistics()
+    running_statistics.update(2)
+
+    assert_that(running_statistics.get_variance("POPULATION")).is_equal_to(0)
+    with pytest.raises(statistics.StatisticsError):
+        running_statistics.get_variance("SAMPLE")
+    with pytest.raises(Exception) as execinfo:
+        running_statistics.get_variance("OTHER")
+
+    assert_that(execinfo.value.args[0]).is_equal_to(
+        "Invalid collection type. Must be 'SAMPLE' or 'POPULATION'."
+    )
+
+
+@pytest.mark.parametrize(
+    "risk_scores", [RISK_SCORES, RISK_SCORES[:-1], [1], [2, 1, 3, 1]]
+)
+def test_quantile_sketch_median(risk_scores):
+    quantile_sketch = QuantileSketch()
+    for risk_score in risk_scores:
+        quantile_sketch.update(risk_score)
+
+    assert_that(quantile_sketch.get_median()).is_equal_to(
+        statistics.median(risk_scores)
+    )
+
+
+def test_quantile_sketch_merge_and_compression():
+    quantile_sketch = QuantileSketch(max_bins=8)
+    shard_sketch = QuantileSketch(max_bins=8)
+    for value in range(50):
+        quantile_sketch.update(value / 10)
+        shard_sketch.update(5 + value / 10)
+
+    quantile_sketch.merge(shard_sketch)
+
+    assert_that(quantile_sketch.count).is_equal_to(100)
+    assert_that(quantile_sketch.bin_count).is_less_than_or_equal_to(8)
+    assert_that(quantile_sketch.get_median()).is_close_to(4.95, 0.75)